@@ -1,18 +1,43 @@
-class Node(object):
-    """
-    Representa um nó na árvore de busca
-
-    Atributos:
-        pai (Node): O nó pai na árvore de busca
-        estado (any): O estado que o nó representa no espaço de estados do problema
-        v1 (float): O custo acumulado desde o nó inicial até este nó (g(n))
-        anterior (Node): Ponteiro para o nó anterior (não utilizado nesta implementação)
-        proximo (Node): Ponteiro para o próximo nó (não utilizado nesta implementação)
-    """
-    def __init__(self, pai=None, estado=None, v1=None,
-                 anterior=None,  proximo=None):
-        self.pai       = pai
-        self.estado    = estado
-        self.v1        = v1
-        self.anterior  = anterior
-        self.proximo   = proximo
\ No newline at end of file
+class Node(object):
+    """
+    Representa um nó na árvore de busca. Usa __slots__, sem __dict__ por instância, pois
+    as buscas criam um nó por estado inserido na fronteira.
+
+    Atributos:
+        pai (Node): O nó pai na árvore de busca
+        estado (any): O estado que o nó representa no espaço de estados do problema
+        v1 (float): O custo acumulado desde o nó inicial até este nó (g(n))
+    """
+    __slots__ = ("pai", "estado", "v1")
+
+    def __init__(self, pai=None, estado=None, v1=None):
+        self.pai       = pai
+        self.estado    = estado
+        self.v1        = v1
+
+
+class SMANode(Node):
+    """
+    Nó da Busca SMA* (A* com memória limitada), que mantém a árvore de busca na memória
+    e guarda no pai o f dos filhos esquecidos.
+
+    Atributos:
+        f (float): Estimativa f(n), elevada para o menor f dos filhos (nunca diminui)
+        profundidade (int): Número de ações desde o nó inicial
+        ordem (int): Ordem de criação, usada nos desempates
+        indice (int): Posição do estado entre os sucessores do pai
+        filhos (list): Filhos presentes na memória; None enquanto o nó não foi expandido
+        esquecidos (int): Máscara de bits, pelo índice, dos sucessores esquecidos a regerar
+        esquecido (float): Menor f entre os sucessores esquecidos; inf se nenhum
+    """
+    __slots__ = ("f", "profundidade", "ordem", "indice", "filhos", "esquecidos", "esquecido")
+
+    def __init__(self, pai, estado, v1, f, profundidade, ordem, indice):
+        super().__init__(pai, estado, v1)
+        self.f            = f
+        self.profundidade = profundidade
+        self.ordem        = ordem
+        self.indice       = indice
+        self.filhos       = None
+        self.esquecidos   = None
+        self.esquecido    = float('inf')
@@ -0,0 +1,217 @@
+import argparse
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from hierarchical_search import HierarchicalPlanner
+from landmarks import LandmarkHeuristic
+from problem_model import ProblemModel
+
+# Cabeçalho dos artefatos: assinatura, versão, reservado, tipo, checksum do grid, largura, altura,
+# tamanho dos parâmetros (JSON) e número de seções
+FORMATO_CABECALHO = struct.Struct("<4sHH8s16sIIII")
+# Cada seção: nome, typecode do array e posição e número de itens dos dados no arquivo
+FORMATO_SECAO = struct.Struct("<16sc7xQQ")
+ASSINATURA = b"PART"
+VERSAO_FORMATO = 1
+# Os dados de cada seção começam num múltiplo deste alinhamento, para serem lidos direto do mmap
+ALINHAMENTO = 8
+
+
+def grid_checksum(grid):
+    """Resumo (BLAKE2b de 16 bytes) das dimensões, da codificação e das células do grid."""
+    size = (grid.width * grid.height + 7) // 8 if grid.bitmap else grid.width * grid.height
+    digest = hashlib.blake2b(struct.pack("<IIB", grid.width, grid.height, grid.bitmap), digest_size=16)
+    with memoryview(grid.data) as view:
+        digest.update(view[:size])
+    return digest.digest()
+
+
+def save_artifact(path, kind, grid, params, sections):
+    """
+    Grava um artefato: o cabeçalho com o checksum de `grid`, os parâmetros de construção e
+    cada array de `sections` (nome -> array ou memoryview tipada) como bytes crus. O arquivo
+    é escrito ao lado e renomeado no fim, para que um leitor nunca veja um artefato pela metade.
+    """
+    if len(kind) > 8:
+        raise ValueError(f"Tipo de artefato longo demais: {kind}")
+    params_bytes = json.dumps(params, sort_keys=True).encode("utf-8")
+    offset = FORMATO_CABECALHO.size + len(params_bytes) + FORMATO_SECAO.size * len(sections)
+    table, blocks = [], []
+    for name, values in sections.items():
+        offset += -offset % ALINHAMENTO
+        if len(name) > 16:
+            raise ValueError(f"Nome de seção longo demais: {name}")
+        typecode = values.typecode if isinstance(values, array) else values.format
+        table.append(FORMATO_SECAO.pack(name.encode("ascii"), typecode.encode("ascii"), offset, len(values)))
+        blocks.append((offset, values))
+        offset += values.itemsize * len(values)
+
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "wb") as file:
+        file.write(FORMATO_CABECALHO.pack(ASSINATURA, VERSAO_FORMATO, 0, kind.encode("ascii"), grid_checksum(grid),
+                                          grid.width, grid.height, len(params_bytes), len(sections)))
+        file.write(params_bytes)
+        file.write(b"".join(table))
+        for offset, values in blocks:
+            file.write(b"\0" * (offset - file.tell()))
+            file.write(memoryview(values).cast("B"))
+    os.replace(temporary, path)
+
+
+class Artifact:
+    """
+    Artefato carregado por load_artifact. As seções são memoryviews tipadas sobre um
+    mapeamento copy-on-write do arquivo: ler não copia nada, e alterações (como o reparo
+    incremental da tabela de sucessores) ficam só na memória do processo.
+
+    Atributos:
+        kind (str): Tipo do artefato ("sucessor", "marcos", "hpa", ...)
+        params (dict): Parâmetros gravados com o artefato
+        sections (dict): Nome -> memoryview com os dados da seção
+    """
+    def __init__(self, kind, params, sections, mapped):
+        self.kind = kind
+        self.params = params
+        self.sections = sections
+        self._mmap = mapped
+
+    def __getitem__(self, name):
+        return self.sections[name]
+
+
+def load_artifact(path, kind, grid, params):
+    """
+    Mapeia um artefato em memória. Retorna None se o arquivo não existir, for de outra versão
+    do formato ou de outro tipo, ou estiver desatualizado: checksum do grid ou parâmetros
+    diferentes dos informados.
+    """
+    try:
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    except (FileNotFoundError, ValueError):
+        # ValueError: arquivo vazio, que não pode ser mapeado
+        return None
+    try:
+        magic, version, _, stored_kind, checksum, width, height, params_size, num_sections = \
+            FORMATO_CABECALHO.unpack_from(mapped)
+        if magic != ASSINATURA or version != VERSAO_FORMATO or stored_kind.rstrip(b"\0") != kind.encode("ascii"):
+            raise ValueError(f"{path} não é um artefato {kind} desta versão")
+        if (width, height) != (grid.width, grid.height) or checksum != grid_checksum(grid):
+            raise ValueError(f"{path} foi gerado para outro grid")
+        start = FORMATO_CABECALHO.size
+        stored_params = json.loads(mapped[start:start + params_size].decode("utf-8"))
+        if stored_params != json.loads(json.dumps(params, sort_keys=True)):
+            raise ValueError(f"{path} foi gerado com outros parâmetros")
+        entries = []
+        position = start + params_size
+        for _ in range(num_sections):
+            name, typecode, offset, count = FORMATO_SECAO.unpack_from(mapped, position)
+            position += FORMATO_SECAO.size
+            typecode = typecode.decode("ascii")
+            end = offset + array(typecode).itemsize * count
+            if end > len(mapped):
+                raise ValueError(f"{path} está truncado")
+            entries.append((name.rstrip(b"\0").decode("ascii"), typecode, offset, end))
+    except (ValueError, struct.error):
+        mapped.close()
+        return None
+
+    view = memoryview(mapped)
+    sections = {name: view[offset:end].cast(typecode) for name, typecode, offset, end in entries}
+    return Artifact(kind, stored_params, sections, mapped)
+
+
+class PlanningArtifacts:
+    """
+    Pré-processamentos de um ProblemModel persistidos ao lado do mapa, em arquivos
+    `<mapa>.<tipo>.art`: tabela de sucessores do modo compacto, tabelas de marcos (ALT) e a
+    abstração do HPA*. Cada método carrega o artefato por mmap se ele corresponder ao grid e
+    aos parâmetros atuais; caso contrário, reconstrói e grava o arquivo de novo.
+
+    Atributos:
+        base_path (str): Caminho base dos arquivos (por padrão, o arquivo do mapa)
+        loaded (list): Tipos carregados do disco
+        rebuilt (list): Tipos reconstruídos por estarem ausentes ou desatualizados
+    """
+    def __init__(self, problem_model: ProblemModel, base_path=None):
+        base_path = base_path or problem_model.grid.path
+        if base_path is None:
+            raise ValueError("O grid não veio de um arquivo: informe base_path")
+        self.problem_model = problem_model
+        self.base_path = base_path
+        self.loaded = []
+        self.rebuilt = []
+
+    def path(self, kind):
+        return f"{self.base_path}.{kind}.art"
+
+    def _load(self, kind, params):
+        artifact = load_artifact(self.path(kind), kind, self.problem_model.grid, params)
+        (self.loaded if artifact is not None else self.rebuilt).append(kind)
+        return artifact
+
+    def successor_table(self):
+        """Instala no modelo a tabela de sucessores do modo compacto, carregada ou reconstruída."""
+        model = self.problem_model
+        params = {"prioridade": list(model.expansion_priority)}
+        artifact = self._load("sucessor", params)
+        if artifact is not None:
+            model.use_successor_table(artifact["ids"], artifact["acoes"])
+            return
+        model.build_successor_table()
+        save_artifact(self.path("sucessor"), "sucessor", model.grid, params,
+                      {"ids": model._successor_ids, "acoes": model._successor_actions})
+
+    def landmarks(self, num_landmarks=4, selection="farthest", seed=0):
+        """Retorna uma LandmarkHeuristic com as tabelas carregadas ou recalculadas."""
+        params = {"marcos": num_landmarks, "selecao": selection, "seed": seed}
+        artifact = self._load("marcos", params)
+        if artifact is not None:
+            count = len(artifact["marcos"])
+            return LandmarkHeuristic.from_tables(self.problem_model, artifact["marcos"],
+                                                 [artifact[f"de{i}"] for i in range(count)],
+                                                 [artifact[f"ate{i}"] for i in range(count)])
+        heuristic = LandmarkHeuristic(self.problem_model, num_landmarks, selection, seed=seed)
+        sections = {"marcos": array("i", heuristic.landmarks)}
+        for i, (distances_from, distances_to) in enumerate(zip(heuristic.distances_from, heuristic.distances_to)):
+            sections[f"de{i}"] = distances_from
+            sections[f"ate{i}"] = distances_to
+        save_artifact(self.path("marcos"), "marcos", self.problem_model.grid, params, sections)
+        return heuristic
+
+    def hierarchical_planner(self, cluster_size=16):
+        """Retorna um HierarchicalPlanner com a abstração carregada ou reconstruída."""
+        params = {"cluster": cluster_size}
+        artifact = self._load("hpa", params)
+        if artifact is not None:
+            planner = HierarchicalPlanner(self.problem_model, cluster_size, construir=False)
+            planner.carregar_tabelas(**artifact.sections)
+            return planner
+        planner = HierarchicalPlanner(self.problem_model, cluster_size)
+        save_artifact(self.path("hpa"), "hpa", self.problem_model.grid, params, planner.tabelas())
+        return planner
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera (ou confere) os artefatos de planejamento de um mapa.")
+    parser.add_argument("mapa")
+    parser.add_argument("--marcos", type=int, default=0, help="número de marcos do ALT (0: não gera)")
+    parser.add_argument("--cluster", type=int, default=0, help="tamanho dos clusters do HPA* (0: não gera)")
+    args = parser.parse_args(argv)
+
+    artifacts = PlanningArtifacts(ProblemModel.from_file(args.mapa))
+    artifacts.successor_table()
+    if args.marcos:
+        artifacts.landmarks(args.marcos)
+    if args.cluster:
+        artifacts.hierarchical_planner(args.cluster)
+    print(f"carregados: {', '.join(artifacts.loaded) or '-'}; reconstruídos: {', '.join(artifacts.rebuilt) or '-'}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
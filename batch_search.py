@@ -0,0 +1,84 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from problem_model import ProblemModel
+from search_algorithms import ALGORITMOS, SearchAlgorithms
+
+# Estado de cada processo trabalhador, criado uma única vez por _inicializar_trabalhador
+_buscas_trabalhador = None
+
+def _inicializar_trabalhador(grid, prioridade, compact):
+    """Monta o modelo do problema no processo trabalhador a partir do grid enviado na criação do pool."""
+    global _buscas_trabalhador
+    problem_model = ProblemModel(grid)
+    problem_model.set_expansion_priority(prioridade)
+    _buscas_trabalhador = SearchAlgorithms(problem_model, compact=compact)
+
+def _resolver_consulta(tarefa):
+    """Resolve uma consulta (algoritmo, prioridade, inicio, fim, limite) no processo trabalhador."""
+    algoritmo, prioridade, inicio, fim, limite = tarefa
+    problem_model = _buscas_trabalhador.problem_model
+    if list(problem_model.expansion_priority) != prioridade:
+        problem_model.set_expansion_priority(prioridade)
+    return _buscas_trabalhador.buscar(algoritmo, inicio, fim, limite)
+
+
+class BatchSearch:
+    """
+    Resolve listas de consultas (inicio, fim) em paralelo com um pool de processos.
+    O grid é enviado a cada trabalhador uma única vez, na criação do pool, e o pool
+    é reaproveitado entre chamadas enquanto o grid não for alterado.
+    """
+    def __init__(self, problem_model: ProblemModel, max_workers=None, compact=False):
+        self.problem_model = problem_model
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.compact = compact
+        self._pool = None
+        self._versao_grid = None
+
+    def _obter_pool(self):
+        """Cria o pool na primeira chamada e o recria se o grid mudou desde então."""
+        grid = self.problem_model.grid
+        if self._pool is not None and self._versao_grid != (id(grid), grid.version):
+            self.close()
+        if self._pool is None:
+            prioridade = list(self.problem_model.expansion_priority)
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_inicializar_trabalhador,
+                                             initargs=(grid, prioridade, self.compact))
+            self._versao_grid = (id(grid), grid.version)
+        return self._pool
+
+    def buscar_lote(self, consultas, algoritmo, limite=None, chunksize=None):
+        """
+        Executa `algoritmo` para cada par (inicio, fim) de `consultas` e retorna a lista de
+        resultados (caminho, custo) na mesma ordem. Sem `chunksize`, as consultas são divididas
+        em cerca de quatro blocos por trabalhador.
+        """
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo de busca desconhecido: {algoritmo}")
+        consultas = list(consultas)
+        if not consultas:
+            return []
+        if chunksize is None:
+            chunksize = max(1, math.ceil(len(consultas) / (self.max_workers * 4)))
+        prioridade = list(self.problem_model.expansion_priority)
+        tarefas = [(algoritmo, prioridade, inicio, fim, limite) for inicio, fim in consultas]
+        return list(self._obter_pool().map(_resolver_consulta, tarefas, chunksize=chunksize))
+
+    def close(self):
+        """Encerra os processos trabalhadores."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def buscar_em_lote(problem_model, consultas, algoritmo, limite=None, max_workers=None, chunksize=None, compact=False):
+    """Atalho para resolver um único lote de consultas com um pool temporário."""
+    with BatchSearch(problem_model, max_workers=max_workers, compact=compact) as lote:
+        return lote.buscar_lote(consultas, algoritmo, limite=limite, chunksize=chunksize)
@@ -0,0 +1,231 @@
+import argparse
+import csv
+import json
+import random
+import sys
+import time
+import tracemalloc
+from collections import deque
+from occupancy_grid import OccupancyGrid
+from problem_model import ProblemModel
+from search_algorithms import ALGORITMOS, ALGORITMOS_COM_LIMITE, SearchAlgorithms
+from search_stats import SearchStats
+
+TIPOS_DE_MAPA = ("open", "random", "maze", "warehouse")
+# Algoritmos que devem sempre encontrar o custo ótimo; seus custos são comparados entre si
+ALGORITMOS_OTIMOS = ("bidirecional", "custo_uniforme", "a_estrela", "a_estrela_bidirecional", "aia_estrela", "jps")
+# Métricas comparadas com a linha de base (maior é pior)
+METRICAS_COMPARADAS = ("tempo_s", "expansoes", "fronteira_max", "memoria_pico_bytes")
+
+
+def gerar_grid(tipo, largura, altura, rng, densidade=0.2):
+    """Gera um grid sintético: aberto, aleatório, labirinto ou corredores de armazém."""
+    grid = OccupancyGrid(largura, altura)
+    if tipo == "open":
+        return grid
+    if tipo == "random":
+        for indice in range(largura * altura):
+            if rng.random() < densidade:
+                grid.data[indice] = 1
+        return grid
+    if tipo == "maze":
+        # Labirinto perfeito por busca em profundidade: células ímpares são salas, as demais paredes
+        grid.data[:] = b"\x01" * (largura * altura)
+        inicio = (1 % largura, 1 % altura)
+        grid.set_blocked(*inicio, False)
+        pilha = [inicio]
+        while pilha:
+            x, y = pilha[-1]
+            vizinhos = [(x + dx, y + dy, dx // 2, dy // 2) for dx, dy in ((2, 0), (-2, 0), (0, 2), (0, -2))
+                        if 0 < x + dx < largura and 0 < y + dy < altura and grid.is_blocked(x + dx, y + dy)]
+            if not vizinhos:
+                pilha.pop()
+                continue
+            nx, ny, mx, my = rng.choice(vizinhos)
+            grid.set_blocked(x + mx, y + my, False)
+            grid.set_blocked(nx, ny, False)
+            pilha.append((nx, ny))
+        return grid
+    if tipo == "warehouse":
+        # Prateleiras verticais de duas colunas separadas por corredores, com corredores transversais
+        for y in range(altura):
+            if y % 10 in (0, 9) or y == altura - 1:
+                continue
+            for x in range(largura):
+                if x % 4 in (1, 2) and 0 < x < largura - 1:
+                    grid.set_blocked(x, y, True)
+        return grid
+    raise ValueError(f"Tipo de mapa desconhecido: {tipo}")
+
+
+def maior_componente(problem_model):
+    """Células livres da maior região conexa, para que todas as consultas tenham solução."""
+    visitadas = set()
+    melhor = []
+    for y in range(problem_model.grid_height):
+        for x in range(problem_model.grid_width):
+            if (x, y) in visitadas or not problem_model.is_valid_state(x, y):
+                continue
+            componente = []
+            fila = deque([(x, y)])
+            visitadas.add((x, y))
+            while fila:
+                cx, cy = fila.popleft()
+                componente.append((cx, cy))
+                for nx, ny in ((cx + 1, cy), (cx - 1, cy), (cx, cy + 1), (cx, cy - 1)):
+                    if (nx, ny) not in visitadas and problem_model.is_valid_state(nx, ny):
+                        visitadas.add((nx, ny))
+                        fila.append((nx, ny))
+            if len(componente) > len(melhor):
+                melhor = componente
+    return melhor
+
+
+def gerar_consultas(problem_model, quantidade, rng):
+    """Sorteia pares (inicio, fim) com orientações aleatórias dentro da maior região conexa."""
+    celulas = maior_componente(problem_model)
+    if len(celulas) < 2:
+        return []
+    orientacoes = problem_model.orientations
+    return [((rng.choice(celulas), rng.choice(orientacoes)), (rng.choice(celulas), rng.choice(orientacoes)))
+            for _ in range(quantidade)]
+
+
+def executar_consulta(buscas, algoritmo, inicio, fim, limite, medir_memoria):
+    """Executa uma consulta e retorna as métricas medidas."""
+    limite = limite if algoritmo in ALGORITMOS_COM_LIMITE else None
+    resultado = {"memoria_pico_bytes": None}
+    # O tempo é medido sem as estatísticas, para não incluir o custo da instrumentação
+    buscas.stats = None
+    tempo = time.perf_counter()
+    caminho, custo = buscas.buscar(algoritmo, inicio, fim, limite)
+    resultado["tempo_s"] = time.perf_counter() - tempo
+    buscas.stats = SearchStats()
+    buscas.buscar(algoritmo, inicio, fim, limite)
+    resultado.update(expansoes=buscas.stats.nodes_expanded, gerados=buscas.stats.nodes_generated,
+                     descartes=buscas.stats.stale_pops, fronteira_max=buscas.stats.max_frontier,
+                     visitados_max=buscas.stats.max_visited, iteracoes=buscas.stats.iterations)
+    if medir_memoria:
+        # Execução separada, pois o tracemalloc distorce o tempo medido
+        buscas.stats = None
+        tracemalloc.start()
+        buscas.buscar(algoritmo, inicio, fim, limite)
+        resultado["memoria_pico_bytes"] = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    resultado["encontrado"] = caminho is not None
+    resultado["custo"] = custo if caminho is not None else None
+    return resultado
+
+
+def executar_benchmark(tipos, tamanhos, algoritmos, num_consultas, seed, limite, densidade,
+                       compact=False, medir_memoria=True, progresso=None):
+    """Executa todos os algoritmos sobre todos os mapas e consultas; retorna (registros, divergencias)."""
+    registros = []
+    divergencias = []
+    for tipo in tipos:
+        for tamanho in tamanhos:
+            rng = random.Random(f"{seed}-{tipo}-{tamanho}")
+            problem_model = ProblemModel(gerar_grid(tipo, tamanho, tamanho, rng, densidade))
+            buscas = SearchAlgorithms(problem_model, compact=compact)
+            for indice, (inicio, fim) in enumerate(gerar_consultas(problem_model, num_consultas, rng)):
+                custos_otimos = {}
+                for algoritmo in algoritmos:
+                    if progresso:
+                        progresso(f"{tipo} {tamanho}x{tamanho} consulta {indice} {algoritmo}")
+                    metricas = executar_consulta(buscas, algoritmo, inicio, fim, limite, medir_memoria)
+                    registros.append({"mapa": tipo, "tamanho": tamanho, "consulta": indice, "algoritmo": algoritmo,
+                                      "inicio": inicio, "fim": fim, **metricas})
+                    if algoritmo in ALGORITMOS_OTIMOS:
+                        custos_otimos[algoritmo] = metricas["custo"]
+                if len(set(custos_otimos.values())) > 1:
+                    divergencias.append({"mapa": tipo, "tamanho": tamanho, "consulta": indice, "custos": custos_otimos})
+    return registros, divergencias
+
+
+def resumir(registros):
+    """Soma as métricas por (mapa, tamanho, algoritmo)."""
+    resumo = {}
+    for registro in registros:
+        chave = f"{registro['mapa']}/{registro['tamanho']}/{registro['algoritmo']}"
+        item = resumo.setdefault(chave, {"consultas": 0, **{m: 0 for m in METRICAS_COMPARADAS}})
+        item["consultas"] += 1
+        for metrica in METRICAS_COMPARADAS:
+            if registro.get(metrica) is not None:
+                item[metrica] += registro[metrica]
+    return resumo
+
+
+def comparar(resumo, linha_de_base, tolerancia):
+    """Retorna as métricas que pioraram mais que `tolerancia` (fração) em relação à linha de base."""
+    regressoes = []
+    for chave, item in resumo.items():
+        anterior = linha_de_base.get(chave)
+        if anterior is None:
+            continue
+        for metrica in METRICAS_COMPARADAS:
+            antes, depois = anterior.get(metrica) or 0, item.get(metrica) or 0
+            if antes > 0 and depois > antes * (1 + tolerancia):
+                regressoes.append({"chave": chave, "metrica": metrica, "antes": antes, "depois": depois,
+                                   "variacao": depois / antes - 1})
+    return regressoes
+
+
+def salvar(caminho, registros, resumo, divergencias):
+    """Grava os resultados em JSON (completo) ou CSV (uma linha por execução), pela extensão."""
+    if caminho.endswith(".csv"):
+        campos = ["mapa", "tamanho", "consulta", "algoritmo", "inicio", "fim", "tempo_s", "expansoes", "gerados",
+                  "descartes", "fronteira_max", "visitados_max", "iteracoes", "memoria_pico_bytes", "custo",
+                  "encontrado"]
+        with open(caminho, "w", newline="", encoding="utf-8") as arquivo:
+            escritor = csv.DictWriter(arquivo, fieldnames=campos, extrasaction="ignore")
+            escritor.writeheader()
+            escritor.writerows(registros)
+    else:
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            json.dump({"registros": registros, "resumo": resumo, "divergencias": divergencias}, arquivo, indent=2)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark dos algoritmos de busca sem interface gráfica.")
+    parser.add_argument("--mapas", nargs="+", choices=TIPOS_DE_MAPA, default=list(TIPOS_DE_MAPA))
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=[15, 30])
+    parser.add_argument("--algoritmos", nargs="+", choices=ALGORITMOS, default=list(ALGORITMOS))
+    parser.add_argument("--consultas", type=int, default=5, help="consultas por mapa")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--limite", type=int, default=60, help="limite para prof_limitada e aprof_iterativo")
+    parser.add_argument("--densidade", type=float, default=0.2, help="fração de obstáculos dos mapas aleatórios")
+    parser.add_argument("--compact", action="store_true", help="usa o modo de estados compactos")
+    parser.add_argument("--sem-memoria", action="store_true", help="não mede o pico de memória")
+    parser.add_argument("--saida", help="arquivo de resultados (.json ou .csv)")
+    parser.add_argument("--comparar", help="resultado JSON anterior usado como linha de base")
+    parser.add_argument("--tolerancia", type=float, default=0.1, help="piora relativa aceita na comparação")
+    parser.add_argument("--quieto", action="store_true")
+    args = parser.parse_args(argv)
+
+    progresso = None if args.quieto else (lambda texto: print(texto, file=sys.stderr))
+    registros, divergencias = executar_benchmark(args.mapas, args.tamanhos, args.algoritmos, args.consultas,
+                                                 args.seed, args.limite, args.densidade, args.compact,
+                                                 not args.sem_memoria, progresso)
+    resumo = resumir(registros)
+    if args.saida:
+        salvar(args.saida, registros, resumo, divergencias)
+
+    for chave, item in sorted(resumo.items()):
+        print(f"{chave:40} tempo={item['tempo_s']:.4f}s expansoes={item['expansoes']} "
+              f"fronteira={item['fronteira_max']} memoria={item['memoria_pico_bytes']}")
+    falhou = False
+    for divergencia in divergencias:
+        print(f"DIVERGÊNCIA de custo ótimo: {divergencia}")
+        falhou = True
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as arquivo:
+            linha_de_base = json.load(arquivo)["resumo"]
+        for regressao in comparar(resumo, linha_de_base, args.tolerancia):
+            print(f"REGRESSÃO {regressao['chave']} {regressao['metrica']}: "
+                  f"{regressao['antes']} -> {regressao['depois']} (+{regressao['variacao']:.0%})")
+            falhou = True
+    return 1 if falhou else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import argparse
+import random
+import sys
+from benchmark import TIPOS_DE_MAPA, gerar_consultas, gerar_grid
+from hierarchical_search import HierarchicalPlanner
+from landmarks import LandmarkHeuristic
+from problem_model import ProblemModel
+from search_algorithms import SearchAlgorithms
+
+
+def custo_do_caminho(problem_model, caminho, inicio, fim):
+    """Soma os custos das ações do caminho; retorna None se ele não for uma sequência válida de inicio a fim."""
+    if not caminho or caminho[0] != inicio or caminho[-1] != fim:
+        return None
+    total = 0
+    for atual, proximo in zip(caminho, caminho[1:]):
+        custos = [custo for estado, custo, _ in problem_model.get_successors(atual) if estado == proximo]
+        if not custos:
+            return None
+        total += custos[0]
+    return total
+
+
+def conferir(falhas, nome, problem_model, resultado, inicio, fim, otimo, exato=True):
+    """Compara um resultado (caminho, custo) com o custo ótimo e registra a falha, se houver."""
+    caminho, custo = resultado
+    if caminho is None or otimo is None:
+        if (caminho is None) != (otimo is None):
+            falhas.append(f"{nome}: encontrado={caminho is not None}, esperado={otimo is not None} ({inicio} -> {fim})")
+        return
+    if custo_do_caminho(problem_model, caminho, inicio, fim) != custo:
+        falhas.append(f"{nome}: caminho inválido ou com custo diferente de {custo} ({inicio} -> {fim})")
+    elif (custo != otimo) if exato else (custo < otimo):
+        falhas.append(f"{nome}: custo {custo}, ótimo {otimo} ({inicio} -> {fim})")
+
+
+def otimo_atual(buscas, inicio, fim):
+    """Custo ótimo no grid atual, ou None se não houver caminho."""
+    caminho, custo = buscas.custo_uniforme(inicio, fim)
+    return custo if caminho is not None else None
+
+
+def verificar_mapa(problem_model, consultas, rng, tamanho_cluster, num_marcos, edicoes):
+    """Executa as verificações num mapa; retorna (falhas, pior razão de custo do HPA*)."""
+    falhas = []
+    tuplas = SearchAlgorithms(problem_model)
+    compactas = SearchAlgorithms(problem_model, compact=True)
+    otimos = [otimo_atual(tuplas, inicio, fim) for inicio, fim in consultas]
+
+    # JPS nos dois modos e A* com a heurística de marcos (ALT)
+    problem_model.use_landmarks(LandmarkHeuristic(problem_model, num_marcos, seed=rng.randrange(1 << 30)))
+    for (inicio, fim), otimo in zip(consultas, otimos):
+        conferir(falhas, "jps", problem_model, tuplas.jps(inicio, fim), inicio, fim, otimo)
+        conferir(falhas, "jps compacto", problem_model, compactas.jps(inicio, fim), inicio, fim, otimo)
+        conferir(falhas, "alt", problem_model, tuplas.a_estrela(inicio, fim), inicio, fim, otimo)
+        conferir(falhas, "alt compacto", problem_model, compactas.a_estrela(inicio, fim), inicio, fim, otimo)
+    problem_model.use_landmarks(None)
+
+    # ARA*: sem prazo termina com o ótimo provado, e cada solução publicada respeita o seu limite
+    for (inicio, fim), otimo in zip(consultas, otimos):
+        resultado = compactas.ara_estrela(inicio, fim, epsilon=3.0)
+        conferir(falhas, "ara", problem_model, resultado[:2], inicio, fim, otimo)
+        if otimo is not None and any(custo > limitante * otimo for _, custo, limitante in resultado.solutions):
+            falhas.append(f"ara: solução acima do limite publicado ({inicio} -> {fim})")
+
+    # HPA* não é ótimo: o caminho deve ser válido e a razão de custo é apenas relatada
+    pior_razao = 1.0
+    planejador = HierarchicalPlanner(problem_model, tamanho_cluster)
+    for (inicio, fim), otimo in zip(consultas, otimos):
+        resultado = planejador.buscar(inicio, fim)
+        conferir(falhas, "hpa", problem_model, resultado, inicio, fim, otimo, exato=False)
+        if resultado[0] is not None and otimo:
+            pior_razao = max(pior_razao, resultado[1] / otimo)
+
+    # D* Lite: planeja, altera células fora das pontas, anda um passo e replaneja
+    livres = [(x, y) for y in range(problem_model.grid_height) for x in range(problem_model.grid_width)
+              if problem_model.is_valid_state(x, y)]
+    for inicio, fim in consultas:
+        planejador = tuplas.planejador_incremental(inicio, fim)
+        conferir(falhas, "dstar", problem_model, planejador.planejar(), inicio, fim, otimo_atual(tuplas, inicio, fim))
+        pontas = {inicio[0], fim[0]}
+        bloqueadas = problem_model.add_obstacles([c for c in rng.sample(livres, min(edicoes, len(livres)))
+                                                  if c not in pontas])
+        planejador.atualizar_celulas(bloqueadas)
+        resultado = planejador.planejar()
+        conferir(falhas, "dstar replanejado", problem_model, resultado, inicio, fim, otimo_atual(tuplas, inicio, fim))
+        caminho = resultado[0]
+        if caminho is not None and len(caminho) > 1:
+            planejador.mover(caminho[1])
+            conferir(falhas, "dstar após mover", problem_model, planejador.planejar(), caminho[1], fim,
+                     otimo_atual(tuplas, caminho[1], fim))
+        planejador.atualizar_celulas(problem_model.remove_obstacles(bloqueadas))
+        conferir(falhas, "dstar restaurado", problem_model, planejador.planejar(), planejador.inicio, fim,
+                 otimo_atual(tuplas, planejador.inicio, fim))
+    return falhas, pior_razao
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Confere JPS, ALT, D* Lite e HPA* contra o custo uniforme.")
+    parser.add_argument("--mapas", nargs="+", choices=TIPOS_DE_MAPA, default=list(TIPOS_DE_MAPA))
+    parser.add_argument("--tamanhos", nargs="+", type=int, default=[16, 33])
+    parser.add_argument("--consultas", type=int, default=10, help="consultas por mapa")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cluster", type=int, default=8, help="tamanho dos clusters do HPA*")
+    parser.add_argument("--marcos", type=int, default=4, help="número de marcos do ALT")
+    parser.add_argument("--edicoes", type=int, default=5, help="células bloqueadas a cada replanejamento do D* Lite")
+    args = parser.parse_args(argv)
+
+    total_falhas = 0
+    for tipo in args.mapas:
+        for tamanho in args.tamanhos:
+            rng = random.Random(f"{args.seed}-{tipo}-{tamanho}")
+            problem_model = ProblemModel(gerar_grid(tipo, tamanho, tamanho, rng))
+            consultas = gerar_consultas(problem_model, args.consultas, rng)
+            falhas, pior_razao = verificar_mapa(problem_model, consultas, rng, args.cluster, args.marcos, args.edicoes)
+            print(f"{tipo} {tamanho}x{tamanho}: {len(consultas)} consultas, {len(falhas)} falhas, "
+                  f"pior razão HPA* {pior_razao:.3f}")
+            for falha in falhas:
+                print(f"  FALHA {falha}")
+            total_falhas += len(falhas)
+    return 1 if total_falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,124 @@
+try:
+    import numpy as np
+except ImportError:  # O NumPy é opcional: só o campo de distâncias depende dele
+    np = None
+from problem_model import DESLOCAMENTOS, ProblemModel
+
+
+def free_cells_array(grid):
+    """Retorna um array booleano (altura, largura) com True nas células livres do grid."""
+    size = grid.width * grid.height
+    data = np.frombuffer(grid.data, dtype=np.uint8)
+    if grid.bitmap:
+        return np.unpackbits(data, bitorder="little")[:size].reshape(grid.height, grid.width) == 0
+    return data[:size].reshape(grid.height, grid.width) == 0
+
+
+class DistanceField:
+    """
+    Campo de distâncias de custo mínimo de um estado para todos os estados (x, y, orientação),
+    ou, com `reverse`, de todos os estados até ele.
+
+    Como todo custo é múltiplo de 0.5, o campo é calculado por frentes de onda (algoritmo de
+    Dial): todos os estados de um mesmo custo são relaxados de uma vez com operações
+    vetorizadas do NumPy, sem fila de prioridade. Depois, qualquer consulta é O(1).
+
+    Atributos:
+        distances (numpy.ndarray): Array float32 (altura, largura, 4) indexado por
+            [y, x, orientação], com inf nos estados inalcançáveis
+        source (int): Estado de origem (ou destino, com `reverse`) codificado
+        grid_version (int): Versão do grid usada no cálculo
+    """
+    def __init__(self, problem_model: ProblemModel, state, reverse=False):
+        if np is None:
+            raise ImportError("DistanceField requer o NumPy")
+        problem_model.check_state(state)
+        self.problem_model = problem_model
+        self.source = problem_model.encode_state(state)
+        self.reverse = reverse
+        self.grid_version = problem_model.grid.version
+        self._flat = self._wavefront()
+        self.distances = self._flat.reshape(problem_model.grid_height, problem_model.grid_width, 4)
+
+    def _forward_moves(self):
+        """
+        Para cada estado codificado, o estado alcançado (ou, com `reverse`, o estado de onde se
+        chega) com um movimento para frente; -1 quando o movimento não existe.
+        """
+        model = self.problem_model
+        width, height = model.grid_width, model.grid_height
+        free = free_cells_array(model.grid)
+        ys, xs = np.mgrid[0:height, 0:width]
+        moves = np.full((height, width, 4), -1, dtype=np.int64)
+        sign = -1 if self.reverse else 1
+        for o, (dx, dy) in enumerate(DESLOCAMENTOS):
+            nx, ny = xs + sign * dx, ys + sign * dy
+            inside = (nx >= 0) & (nx < width) & (ny >= 0) & (ny < height)
+            # Como em get_successors, só se entra numa célula livre; a de saída pode estar bloqueada
+            entered = free[np.clip(ny, 0, height - 1), np.clip(nx, 0, width - 1)] if not self.reverse else free
+            valid = inside & entered
+            moves[..., o][valid] = (ny[valid] * width + nx[valid]) * 4 + o
+        return moves.reshape(-1)
+
+    def _wavefront(self):
+        """Calcula as distâncias processando um balde de custo (em meios) por vez."""
+        model = self.problem_model
+        moves = self._forward_moves()
+        distances = np.full(model.grid_width * model.grid_height * 4, np.inf, dtype=np.float32)
+        distances[self.source] = 0.0
+        buckets = {0: [np.array([self.source], dtype=np.int64)]}
+
+        def relax(states, half_units):
+            cost = half_units / 2
+            states = states[distances[states] > cost]
+            if states.size:
+                distances[states] = cost
+                buckets.setdefault(half_units, []).append(states)
+
+        k = 0
+        while buckets:
+            pending = buckets.pop(k, None)
+            if pending is not None:
+                current = np.unique(np.concatenate(pending))
+                # Estados que chegaram a este balde e depois ficaram mais baratos já foram processados
+                current = current[distances[current] == k / 2]
+                cell = current & ~3
+                orientation = current & 3
+                # Curvas custam 0.5 (um balde) nos dois sentidos; o conjunto de vizinhos é o mesmo
+                relax(np.concatenate((cell | ((orientation + 1) & 3), cell | ((orientation + 3) & 3))), k + 1)
+                forward = moves[current]
+                relax(forward[forward >= 0], k + 2)
+            k += 1
+        return distances
+
+    def cost(self, state):
+        """Distância do estado (tupla ou codificado); inf se inalcançável."""
+        return float(self._flat[self.problem_model.encode_state(state)])
+
+    def cell_costs(self):
+        """Menor distância de cada célula entre as quatro orientações, em um array (altura, largura)."""
+        return self.distances.min(axis=2)
+
+    def nearest(self, states):
+        """Retorna (estado, distância) do estado mais próximo entre `states`, ou (None, inf)."""
+        best, best_cost = None, np.inf
+        for state in states:
+            cost = self.cost(state)
+            if cost < best_cost:
+                best, best_cost = state, cost
+        return best, float(best_cost)
+
+    def is_current(self):
+        """Indica se o campo ainda corresponde ao grid do modelo."""
+        return self.grid_version == self.problem_model.grid.version
+
+    def bound(self, state_id, goal_id):
+        """
+        Interface de ProblemModel.use_landmarks: a distância exata quando a consulta termina no
+        destino do campo reverso (ou parte da origem do campo direto); 0 nos demais casos.
+        """
+        if self.reverse and goal_id == self.source:
+            return float(self._flat[state_id])
+        if not self.reverse and state_id == self.source:
+            return float(self._flat[goal_id])
+        return 0.0
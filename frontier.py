@@ -0,0 +1,175 @@
+import heapq
+import itertools
+from array import array
+
+INFINITO = float('inf')
+
+
+class HeapFrontier:
+    """
+    Fronteira de prioridade sobre heapq, para prioridades arbitrárias.
+
+    push insere um item ou muda a sua prioridade; a entrada antiga fica no heap e é
+    descartada ao sair (remoção preguiçosa), chamando `on_stale`. Entre prioridades iguais,
+    sai primeiro o item inserido (ou reinserido) há mais tempo, como com itertools.count.
+    """
+    def __init__(self, on_stale=None):
+        self.on_stale = on_stale
+        self._heap = []
+        # Entrada válida de cada item presente: (prioridade, contador)
+        self._entries = {}
+        self._counter = itertools.count()
+
+    def push(self, item, priority):
+        entry = self._entries.get(item)
+        if entry is not None and entry[0] == priority:
+            return
+        count = next(self._counter)
+        self._entries[item] = (priority, count)
+        heapq.heappush(self._heap, (priority, count, item))
+
+    def pop(self):
+        """Retira o item de menor prioridade; retorna (prioridade, item)."""
+        heap, entries = self._heap, self._entries
+        while True:
+            priority, count, item = heapq.heappop(heap)
+            entry = entries.get(item)
+            if entry is not None and entry[1] == count:
+                del entries[item]
+                return priority, item
+            if self.on_stale is not None:
+                self.on_stale()
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class BucketFrontier:
+    """
+    Fila de baldes (Dial) para prioridades múltiplas de 1 / `scale` e itens inteiros em
+    [0, size), como os estados codificados do modo compacto: custos de ação e Manhattan são
+    múltiplos de 0.5, então `scale` = 2 basta.
+
+    Cada balde é uma lista duplamente ligada guardada em arrays indexados pelo item, o que
+    dá push, pop e mudança de prioridade em O(1), sem entradas obsoletas. Os baldes são
+    filas: entre prioridades iguais sai o item inserido (ou reposicionado) há mais tempo,
+    a mesma ordem de um heap de (prioridade, contador, item).
+
+    Uma prioridade fora da escala (fracionária ou infinita) converte a fronteira, com os
+    itens presentes e na mesma ordem, numa HeapFrontier, usada até o próximo reset().
+    """
+    def __init__(self, size, scale=2):
+        self.size = size
+        self.scale = scale
+        self.on_stale = None
+        self._next = array('i', [-1]) * size
+        self._previous = array('i', [-1]) * size
+        # Balde de cada item presente; -1 se ausente
+        self._bucket = array('i', [-1]) * size
+        self._first = []
+        self._last = []
+        self._current = 0
+        self._count = 0
+        self._heap = None
+
+    def reset(self, on_stale=None):
+        """Esvazia a fronteira, limpando apenas os itens que ficaram nela."""
+        for k in range(self._current, len(self._first)):
+            item = self._first[k]
+            while item != -1:
+                self._bucket[item] = -1
+                item = self._next[item]
+        self._first.clear()
+        self._last.clear()
+        self._current = 0
+        self._count = 0
+        self._heap = None
+        self.on_stale = on_stale
+
+    def _unlink(self, item, k):
+        previous, following = self._previous[item], self._next[item]
+        if previous == -1:
+            self._first[k] = following
+        else:
+            self._next[previous] = following
+        if following == -1:
+            self._last[k] = previous
+        else:
+            self._previous[following] = previous
+
+    def _to_heap(self):
+        """Passa os itens presentes, na ordem de saída, para uma HeapFrontier."""
+        heap = HeapFrontier(self.on_stale)
+        for k in range(self._current, len(self._first)):
+            item = self._first[k]
+            while item != -1:
+                heap.push(item, k / self.scale)
+                self._bucket[item] = -1
+                item = self._next[item]
+        self._first.clear()
+        self._last.clear()
+        self._count = 0
+        self._heap = heap
+        return heap
+
+    def push(self, item, priority):
+        """Insere o item ou muda a sua prioridade (que vai para o fim do novo balde)."""
+        heap = self._heap
+        if heap is None:
+            scaled = priority * self.scale
+            # Fracionária, negativa ou infinita (inf % 1 é nan, verdadeiro)
+            if scaled % 1 or scaled < 0:
+                heap = self._to_heap()
+        if heap is not None:
+            heap.push(item, priority)
+            return
+        k = int(scaled)
+        bucket = self._bucket
+        old = bucket[item]
+        if old == k:
+            return
+        if old != -1:
+            self._unlink(item, old)
+        else:
+            self._count += 1
+        first, last = self._first, self._last
+        if k >= len(first):
+            growth = [-1] * (k + 1 - len(first))
+            first.extend(growth)
+            last.extend(growth)
+        tail = last[k]
+        self._previous[item] = tail
+        self._next[item] = -1
+        if tail == -1:
+            first[k] = item
+        else:
+            self._next[tail] = item
+        last[k] = item
+        bucket[item] = k
+        if k < self._current:
+            self._current = k
+
+    def pop(self):
+        """Retira o item de menor prioridade; retorna (prioridade, item)."""
+        if self._heap is not None:
+            return self._heap.pop()
+        if not self._count:
+            raise IndexError("pop de uma fronteira vazia")
+        first = self._first
+        k = self._current
+        while first[k] == -1:
+            k += 1
+        self._current = k
+        item = first[k]
+        following = self._next[item]
+        first[k] = following
+        if following == -1:
+            self._last[k] = -1
+        else:
+            self._previous[following] = -1
+        self._bucket[item] = -1
+        self._count -= 1
+        return k / self.scale, item
+
+    def __len__(self):
+        return len(self._heap) if self._heap is not None else self._count
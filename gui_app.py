@@ -1,292 +1,828 @@
-import tkinter as tk
-from tkinter import ttk, messagebox
-from problem_model import ProblemModel
-from search_algorithms import SearchAlgorithms
-import random
-
-class PathfindingApp(tk.Tk):
-    """
-    Classe principal da aplicação com a interface gráfica.
-    """
-    def __init__(self, problem_model: ProblemModel, search_algorithms: SearchAlgorithms):
-        super().__init__()
-        self.title("Busca de Caminho para Veículos Autônomos")
-        self.geometry("1200x800")
-        self.state('zoomed')
-
-        self.problem_model = problem_model
-        self.search_algorithms = search_algorithms
-        self.current_path = None
-
-        self.create_widgets()
-        # Chama a função para garantir o estado visual inicial correto
-        self.update_limit_entry_visibility()
-        # Adiciona um pequeno delay para o primeiro desenho do grid para garantir que a janela tenha tamanho
-        self.after(100, lambda: self.draw_grid())
-
-
-    def create_widgets(self):
-        """Cria e organiza os widgets na janela."""
-        main_frame = ttk.Frame(self, padding="10")
-        main_frame.pack(fill=tk.BOTH, expand=True)
-        main_frame.grid_rowconfigure(0, weight=1)
-        main_frame.grid_columnconfigure(1, weight=1)
-
-        controls_frame = ttk.LabelFrame(main_frame, text="Controles de Busca", padding="10")
-        controls_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=5)
-        controls_frame.grid_columnconfigure(0, weight=1)
-
-        # 1. Primeiro, criamos os widgets de Limite
-        self.limit_label = ttk.Label(controls_frame, text="Limite (Prof. Limitada/Aprof. Iterativo):")
-        self.limit_entry = ttk.Entry(controls_frame)
-        self.limit_entry.insert(0, "40") # Aumentado para o novo mapa
-
-        # 2. Agora, criamos o menu que pode afetar a visibilidade dos widgets de Limite
-        ttk.Label(controls_frame, text="Método de Busca:").grid(row=0, column=0, sticky="w", pady=5)
-        self.search_method_var = tk.StringVar(self)
-        
-        search_methods = [
-            "AMPLITUDE", "PROFUNDIDADE", "PROFUNDIDADE LIMITADA", 
-            "APROFUNDAMENTO ITERATIVO", "BIDIRECIONAL", "CUSTO UNIFORME",
-            "GREEDY", "A-ESTRELA", "AIA-ESTRELA"
-        ]
-        # A função `update_limit_entry_visibility` será chamada sempre que o usuário mudar a opção
-        search_method_menu = ttk.OptionMenu(controls_frame, self.search_method_var, search_methods[0], *search_methods, command=self.update_limit_entry_visibility)
-        search_method_menu.grid(row=1, column=0, sticky="ew", pady=5)
-        
-        # Posiciona os widgets de limite na tela (escondidos/mostrados pela função de visibilidade)
-        self.limit_label.grid(row=2, column=0, sticky="w", pady=5)
-        self.limit_entry.grid(row=3, column=0, sticky="ew", pady=5)
-
-
-        # Seleção do estado inicial
-        ttk.Label(controls_frame, text="Estado Inicial (X, Y, orientação):").grid(row=4, column=0, sticky="w", pady=5)
-        start_state_frame = ttk.Frame(controls_frame)
-        start_state_frame.grid(row=5, column=0, sticky="ew", pady=5)
-        self.start_x_entry = ttk.Entry(start_state_frame, width=5)
-        self.start_x_entry.insert(0, "0") # INÍCIO X
-        self.start_x_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        self.start_y_entry = ttk.Entry(start_state_frame, width=5)
-        self.start_y_entry.insert(0, "0") # INÍCIO Y
-        self.start_y_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        self.start_orientation_var = tk.StringVar(self)
-        start_orientation_menu = ttk.OptionMenu(start_state_frame, self.start_orientation_var, self.problem_model.orientations[0], *self.problem_model.orientations)
-        self.start_orientation_var.set(self.problem_model.orientations[1])
-        start_orientation_menu.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-        # Seleção do estado objetivo
-        ttk.Label(controls_frame, text="Estado Objetivo (X, Y, orientação):").grid(row=6, column=0, sticky="w", pady=5)
-        goal_state_frame = ttk.Frame(controls_frame)
-        goal_state_frame.grid(row=7, column=0, sticky="ew", pady=5)
-        self.goal_x_entry = ttk.Entry(goal_state_frame, width=5)
-        self.goal_x_entry.insert(0, "14") # FIM X
-        self.goal_x_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        self.goal_y_entry = ttk.Entry(goal_state_frame, width=5)
-        self.goal_y_entry.insert(0, "14") # FIM Y
-        self.goal_y_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
-        self.goal_orientation_var = tk.StringVar(self)
-        goal_orientation_menu = ttk.OptionMenu(goal_state_frame, self.goal_orientation_var, self.problem_model.orientations[0], *self.problem_model.orientations)
-        self.goal_orientation_var.set(self.problem_model.orientations[0])
-        goal_orientation_menu.pack(side=tk.LEFT, fill=tk.X, expand=True)
-
-        # Prioridade de Expansão
-        ttk.Label(controls_frame, text="Prioridade de Expansão:").grid(row=8, column=0, sticky="w", pady=(10, 5))
-        reorder_priority_frame = ttk.Frame(controls_frame)
-        reorder_priority_frame.grid(row=9, column=0, sticky="ew", pady=5)
-        self.priority_listbox = tk.Listbox(reorder_priority_frame, height=4, exportselection=False)
-        for orientation in self.problem_model.orientations:
-            self.priority_listbox.insert(tk.END, orientation)
-        self.priority_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        button_frame = ttk.Frame(reorder_priority_frame)
-        button_frame.pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_frame, text="↑", command=self.move_priority_up, width=2).pack(pady=2)
-        ttk.Button(button_frame, text="↓", command=self.move_priority_down, width=2).pack(pady=2)
-
-        # Botão de busca
-        search_button = ttk.Button(controls_frame, text="Iniciar Busca", command=self.run_search)
-        search_button.grid(row=10, column=0, sticky="ew", pady=10)
-
-        # Resultados
-        ttk.Label(controls_frame, text="Custo do Caminho:").grid(row=11, column=0, sticky="w", pady=5)
-        self.cost_label = ttk.Label(controls_frame, text="-", font=("Consolas", 10, "bold"))
-        self.cost_label.grid(row=12, column=0, sticky="w", pady=5)
-        ttk.Label(controls_frame, text="Caminho Encontrado:").grid(row=13, column=0, sticky="w", pady=5)
-        self.path_text = tk.Text(controls_frame, height=10, state=tk.DISABLED, wrap=tk.WORD)
-        self.path_text.grid(row=14, column=0, sticky="nsew", pady=5)
-        controls_frame.grid_rowconfigure(14, weight=1)
-
-        # Frame de visualização
-        visualization_frame = ttk.LabelFrame(main_frame, text="Visualização do Problema", padding="10")
-        visualization_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=5)
-        visualization_frame.grid_rowconfigure(0, weight=1)
-        visualization_frame.grid_columnconfigure(0, weight=1)
-
-        self.canvas = tk.Canvas(visualization_frame, bg="white")
-        self.canvas.grid(row=0, column=0, sticky="nsew")
-        self.canvas.bind("<Configure>", self.on_canvas_resize)
-
-
-    def move_priority_up(self):
-        """Move o item selecionado na lista de prioridades para cima."""
-        indices = self.priority_listbox.curselection()
-        if not indices: return
-        for index in indices:
-            if index > 0:
-                text = self.priority_listbox.get(index)
-                self.priority_listbox.delete(index)
-                self.priority_listbox.insert(index - 1, text)
-                self.priority_listbox.selection_set(index - 1)
-
-    def move_priority_down(self):
-        """Move o item selecionado na lista de prioridades para baixo."""
-        indices = self.priority_listbox.curselection()
-        if not indices: return
-        for index in reversed(indices):
-            if index < self.priority_listbox.size() - 1:
-                text = self.priority_listbox.get(index)
-                self.priority_listbox.delete(index)
-                self.priority_listbox.insert(index + 1, text)
-                self.priority_listbox.selection_set(index + 1)
-
-    def update_limit_entry_visibility(self, *args):
-        """Mostra ou oculta o campo de limite, dependendo do método de busca selecionado."""
-        if self.search_method_var.get() in ["PROFUNDIDADE LIMITADA", "APROFUNDAMENTO ITERATIVO"]:
-            self.limit_label.grid()
-            self.limit_entry.grid()
-        else:
-            self.limit_label.grid_remove()
-            self.limit_entry.grid_remove()
-
-    def on_canvas_resize(self, event):
-        """Redesenha o grid quando o tamanho da janela é alterado."""
-        self.draw_grid()
-
-    def draw_grid(self):
-        """Desenha o grid, obstáculos e o caminho no canvas."""
-        self.canvas.delete("all")
-        canvas_width = self.canvas.winfo_width()
-        canvas_height = self.canvas.winfo_height()
-        if canvas_width < 50 or canvas_height < 50: return
-
-        num_offset = 20
-        cell_size = min((canvas_width - num_offset) / self.problem_model.grid_width, (canvas_height - num_offset) / self.problem_model.grid_height)
-        
-        for y in range(self.problem_model.grid_height):
-            self.canvas.create_text(num_offset / 2, num_offset + y * cell_size + cell_size / 2, text=str(y), fill="black")
-        for x in range(self.problem_model.grid_width):
-            self.canvas.create_text(num_offset + x * cell_size + cell_size / 2, num_offset / 2, text=str(x), fill="black")
-
-        for y in range(self.problem_model.grid_height):
-            for x in range(self.problem_model.grid_width):
-                x1, y1 = num_offset + x * cell_size, num_offset + y * cell_size
-                x2, y2 = x1 + cell_size, y1 + cell_size
-                color = "#555" if (x, y) in self.problem_model.obstacles else "white"
-                self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="gray")
-        
-        if self.current_path:
-            self.draw_path_on_grid(self.current_path, cell_size, num_offset)
-
-
-    def draw_path_on_grid(self, path, cell_size, num_offset):
-        """Desenha uma representação do caminho encontrado no grid."""
-        if not path: return
-
-        # Desenha as linhas do caminho
-        for i in range(len(path) - 1):
-            (x1, y1), _ = path[i]
-            (x2, y2), _ = path[i+1]
-            center1_x = num_offset + x1 * cell_size + cell_size / 2
-            center1_y = num_offset + y1 * cell_size + cell_size / 2
-            center2_x = num_offset + x2 * cell_size + cell_size / 2
-            center2_y = num_offset + y2 * cell_size + cell_size / 2
-            if x1 != x2 or y1 != y2: # Só desenha linha se houve movimento
-                self.canvas.create_line(center1_x, center1_y, center2_x, center2_y, fill="#4287f5", width=3)
-
-        # Desenha os nós (início, fim e intermediários)
-        for i, state in enumerate(path):
-            (x, y), orientation = state
-            center_x = num_offset + x * cell_size + cell_size / 2
-            center_y = num_offset + y * cell_size + cell_size / 2
-            
-            if i == 0: color = "green"  # Ponto inicial
-            elif i == len(path) - 1: color = "red" # Ponto final
-            else: color = "#4287f5" # Pontos intermediários
-
-            # Desenha um triângulo para indicar a orientação
-            arrow_length = cell_size * 0.3
-            if orientation == 'Norte': points = [center_x, center_y - arrow_length, center_x - arrow_length, center_y + arrow_length, center_x + arrow_length, center_y + arrow_length]
-            elif orientation == 'Leste': points = [center_x + arrow_length, center_y, center_x - arrow_length, center_y - arrow_length, center_x - arrow_length, center_y + arrow_length]
-            elif orientation == 'Sul': points = [center_x, center_y + arrow_length, center_x - arrow_length, center_y - arrow_length, center_x + arrow_length, center_y - arrow_length]
-            else: # Oeste
-                points = [center_x - arrow_length, center_y, center_x + arrow_length, center_y - arrow_length, center_x + arrow_length, center_y + arrow_length]
-            
-            self.canvas.create_polygon(points, fill=color, outline='black')
-
-
-    def run_search(self):
-        """Executa o algoritmo de busca selecionado com os parâmetros da interface."""
-        try:
-            start_x, start_y = int(self.start_x_entry.get()), int(self.start_y_entry.get())
-            start_orientation = self.start_orientation_var.get()
-            start_state = ((start_x, start_y), start_orientation)
-
-            goal_x, goal_y = int(self.goal_x_entry.get()), int(self.goal_y_entry.get())
-            goal_orientation = self.goal_orientation_var.get()
-            goal_state = ((goal_x, goal_y), goal_orientation)
-
-            if not (0 <= start_x < self.problem_model.grid_width and 0 <= start_y < self.problem_model.grid_height) or (start_x, start_y) in self.problem_model.obstacles:
-                messagebox.showerror("Erro de Entrada", f"Estado inicial ({start_x}, {start_y}) é inválido ou um obstáculo.")
-                return
-            if not (0 <= goal_x < self.problem_model.grid_width and 0 <= goal_y < self.problem_model.grid_height) or (goal_x, goal_y) in self.problem_model.obstacles:
-                messagebox.showerror("Erro de Entrada", f"Estado objetivo ({goal_x}, {goal_y}) é inválido ou um obstáculo.")
-                return
-
-            search_method = self.search_method_var.get()
-            limit = int(self.limit_entry.get()) if self.limit_entry.get() else 0
-
-            priority_order = list(self.priority_listbox.get(0, tk.END))
-            self.problem_model.set_expansion_priority(priority_order)
-
-            path, cost = None, 0
-            
-            search_function_map = {
-                "AMPLITUDE": self.search_algorithms.amplitude,
-                "PROFUNDIDADE": self.search_algorithms.profundidade,
-                "PROFUNDIDADE LIMITADA": lambda i, f: self.search_algorithms.prof_limitada(i, f, limit),
-                "APROFUNDAMENTO ITERATIVO": lambda i, f: self.search_algorithms.aprof_iterativo(i, f, limit),
-                "BIDIRECIONAL": self.search_algorithms.bidirecional,
-                "CUSTO UNIFORME": self.search_algorithms.custo_uniforme,
-                "GREEDY": self.search_algorithms.greedy,
-                "A-ESTRELA": self.search_algorithms.a_estrela,
-                "AIA-ESTRELA": self.search_algorithms.aia_estrela
-            }
-            
-            path, cost = search_function_map[search_method](start_state, goal_state)
-
-            self.cost_label.config(text=f"{cost:.2f}" if path else "Não encontrado")
-            self.path_text.config(state=tk.NORMAL)
-            self.path_text.delete(1.0, tk.END)
-            if path:
-                path_str = " -> ".join([f"({s[0][0]},{s[0][1]},{s[1][0]})" for s in path])
-                self.path_text.insert(tk.END, path_str)
-                self.current_path = path
-            else:
-                self.path_text.insert(tk.END, "Nenhum caminho encontrado.")
-                self.current_path = None
-            
-            self.path_text.config(state=tk.DISABLED)
-            self.draw_grid()
-
-        except ValueError:
-            messagebox.showerror("Erro de Entrada", "As coordenadas X e Y devem ser números inteiros.")
-        except Exception as e:
-            messagebox.showerror("Erro Inesperado", f"Ocorreu um erro: {e}")
-
-if __name__ == "__main__":
-    # Carrega o modelo do problema com o grid estático
-    problem_model = ProblemModel()
-    search_algorithms = SearchAlgorithms(problem_model)
-
-    app = PathfindingApp(problem_model, search_algorithms)
-
+import tkinter as tk
+from tkinter import ttk, messagebox
+from distance_field import DistanceField
+from portfolio import SearchPortfolio, formatar_tabela
+from problem_model import ProblemModel
+from search_algorithms import SearchAlgorithms
+from search_stats import SearchCancelled, SearchControl, SearchStats, SearchTimeout
+import colorsys
+import itertools
+import math
+import queue
+import random
+import sys
+import threading
+import time
+
+# Nome do método de SearchAlgorithms para cada opção do menu de busca
+SEARCH_METHOD_NAMES = {
+    "AMPLITUDE": "amplitude", "PROFUNDIDADE": "profundidade", "PROFUNDIDADE LIMITADA": "prof_limitada",
+    "APROFUNDAMENTO ITERATIVO": "aprof_iterativo", "BIDIRECIONAL": "bidirecional", "CUSTO UNIFORME": "custo_uniforme",
+    "GREEDY": "greedy", "A-ESTRELA": "a_estrela",
+    "A-ESTRELA BIDIRECIONAL": "a_estrela_bidirecional", "AIA-ESTRELA": "aia_estrela", "JPS": "jps"
+}
+# Intervalo, em ms, entre as consultas ao andamento da busca em segundo plano
+PROGRESS_INTERVAL_MS = 100
+# Espera, em ms, antes de redesenhar após redimensionar, aproximar ou arrastar; eventos seguidos geram um único desenho
+REDRAW_DELAY_MS = 80
+# Acima deste número de células o grid é desenhado como uma única imagem em vez de um retângulo por célula
+RETAINED_MAX_CELLS = 10000
+# Margem reservada para a numeração das linhas e colunas
+NUM_OFFSET = 20
+ZOOM_STEP = 1.25
+# Abaixo deste tamanho de célula (em pixels) só o traçado e as extremidades do caminho são desenhados
+MIN_ARROW_CELL_SIZE = 4
+# Intervalo, em ms, entre os quadros da animação da busca
+ANIMATION_FRAME_MS = 30
+CLOSED_COLOR = "#f5d98b"
+FRONTIER_COLOR = "#a8e6a1"
+PATH_COLOR = "#4287f5"
+# Cores dos caminhos no modo de comparação, uma por algoritmo (na ordem de SEARCH_METHOD_NAMES)
+COMPARISON_COLORS = ["#4287f5", "#e6194b", "#3cb44b", "#f58231", "#911eb4", "#42d4f4", "#f032e6",
+                     "#9a6324", "#808000", "#000075", "#a9a9a9"]
+# Cores do mapa de calor, do mais perto (azul) ao mais longe (vermelho) do estado inicial
+HEATMAP_PALETTE = ["#%02x%02x%02x" % tuple(int(c * 255) for c in colorsys.hsv_to_rgb(0.66 * (1 - i / 63), 0.75, 1.0))
+                   for i in range(64)]
+
+class PathfindingApp(tk.Tk):
+    """
+    Classe principal da aplicação com a interface gráfica.
+    """
+    def __init__(self, problem_model: ProblemModel, search_algorithms: SearchAlgorithms):
+        super().__init__()
+        self.title("Busca de Caminho para Veículos Autônomos")
+        self.geometry("1200x800")
+        self.state('zoomed')
+
+        self.problem_model = problem_model
+        self.search_algorithms = search_algorithms
+        self.current_path = None
+        # Busca em andamento: thread trabalhadora, controle de cancelamento e fila de resultado
+        self.search_thread = None
+        self.search_control = None
+        self.search_results = queue.Queue()
+        self.search_started_at = 0.0
+        # Modo de comparação: portfólio de processos (criado no primeiro uso) e caminhos sobrepostos (caminho, cor)
+        self.portfolio = None
+        self.comparing = False
+        self.compared_paths = []
+        # Visualização: tamanho da célula e deslocamento do grid no canvas (None = ajustar à janela)
+        self.view_cell_size = None
+        self.view_offset = (NUM_OFFSET, NUM_OFFSET)
+        self.user_view = False
+        self.pan_anchor = None
+        self.redraw_job = None
+        # Camada do grid já desenhada: (grid, versão, modo imagem) e a visualização usada nos itens
+        self.drawn_layer = None
+        self.drawn_view = None
+        self.grid_image_base = None
+        self.grid_image = None
+        # Animação passo a passo: busca em andamento e células já expandidas / na fronteira
+        self.animation = None
+        self.animation_paused = False
+        self.closed_cells = set()
+        self.frontier_cells = set()
+        self.overlay_items = {}
+        # Mapa de calor do campo de distâncias: (camada do grid, custos por célula, imagem base ou None)
+        self.heatmap = None
+        self.heatmap_image = None
+
+        self.create_widgets()
+        # Chama a função para garantir o estado visual inicial correto
+        self.update_limit_entry_visibility()
+        # Adiciona um pequeno delay para o primeiro desenho do grid para garantir que a janela tenha tamanho
+        self.after(100, lambda: self.draw_grid())
+
+
+    def create_widgets(self):
+        """Cria e organiza os widgets na janela."""
+        main_frame = ttk.Frame(self, padding="10")
+        main_frame.pack(fill=tk.BOTH, expand=True)
+        main_frame.grid_rowconfigure(0, weight=1)
+        main_frame.grid_columnconfigure(1, weight=1)
+
+        controls_frame = ttk.LabelFrame(main_frame, text="Controles de Busca", padding="10")
+        controls_frame.grid(row=0, column=0, sticky="nsew", padx=10, pady=5)
+        controls_frame.grid_columnconfigure(0, weight=1)
+
+        # 1. Primeiro, criamos os widgets de Limite
+        self.limit_label = ttk.Label(controls_frame, text="Limite (Prof. Limitada/Aprof. Iterativo):")
+        self.limit_entry = ttk.Entry(controls_frame)
+        self.limit_entry.insert(0, "40") # Aumentado para o novo mapa
+
+        # 2. Agora, criamos o menu que pode afetar a visibilidade dos widgets de Limite
+        ttk.Label(controls_frame, text="Método de Busca:").grid(row=0, column=0, sticky="w", pady=5)
+        self.search_method_var = tk.StringVar(self)
+        
+        search_methods = [
+            "AMPLITUDE", "PROFUNDIDADE", "PROFUNDIDADE LIMITADA", 
+            "APROFUNDAMENTO ITERATIVO", "BIDIRECIONAL", "CUSTO UNIFORME",
+            "GREEDY", "A-ESTRELA", "A-ESTRELA BIDIRECIONAL", "AIA-ESTRELA", "JPS"
+        ]
+        # A função `update_limit_entry_visibility` será chamada sempre que o usuário mudar a opção
+        search_method_menu = ttk.OptionMenu(controls_frame, self.search_method_var, search_methods[0], *search_methods, command=self.update_limit_entry_visibility)
+        search_method_menu.grid(row=1, column=0, sticky="ew", pady=5)
+        
+        # Posiciona os widgets de limite na tela (escondidos/mostrados pela função de visibilidade)
+        self.limit_label.grid(row=2, column=0, sticky="w", pady=5)
+        self.limit_entry.grid(row=3, column=0, sticky="ew", pady=5)
+
+
+        # Seleção do estado inicial
+        ttk.Label(controls_frame, text="Estado Inicial (X, Y, orientação):").grid(row=4, column=0, sticky="w", pady=5)
+        start_state_frame = ttk.Frame(controls_frame)
+        start_state_frame.grid(row=5, column=0, sticky="ew", pady=5)
+        self.start_x_entry = ttk.Entry(start_state_frame, width=5)
+        self.start_x_entry.insert(0, "0") # INÍCIO X
+        self.start_x_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.start_y_entry = ttk.Entry(start_state_frame, width=5)
+        self.start_y_entry.insert(0, "0") # INÍCIO Y
+        self.start_y_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.start_orientation_var = tk.StringVar(self)
+        start_orientation_menu = ttk.OptionMenu(start_state_frame, self.start_orientation_var, self.problem_model.orientations[0], *self.problem_model.orientations)
+        self.start_orientation_var.set(self.problem_model.orientations[1])
+        start_orientation_menu.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        # Seleção do estado objetivo
+        ttk.Label(controls_frame, text="Estado Objetivo (X, Y, orientação):").grid(row=6, column=0, sticky="w", pady=5)
+        goal_state_frame = ttk.Frame(controls_frame)
+        goal_state_frame.grid(row=7, column=0, sticky="ew", pady=5)
+        self.goal_x_entry = ttk.Entry(goal_state_frame, width=5)
+        self.goal_x_entry.insert(0, "14") # FIM X
+        self.goal_x_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.goal_y_entry = ttk.Entry(goal_state_frame, width=5)
+        self.goal_y_entry.insert(0, "14") # FIM Y
+        self.goal_y_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.goal_orientation_var = tk.StringVar(self)
+        goal_orientation_menu = ttk.OptionMenu(goal_state_frame, self.goal_orientation_var, self.problem_model.orientations[0], *self.problem_model.orientations)
+        self.goal_orientation_var.set(self.problem_model.orientations[0])
+        goal_orientation_menu.pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        # Prioridade de Expansão
+        ttk.Label(controls_frame, text="Prioridade de Expansão:").grid(row=8, column=0, sticky="w", pady=(10, 5))
+        reorder_priority_frame = ttk.Frame(controls_frame)
+        reorder_priority_frame.grid(row=9, column=0, sticky="ew", pady=5)
+        self.priority_listbox = tk.Listbox(reorder_priority_frame, height=4, exportselection=False)
+        for orientation in self.problem_model.orientations:
+            self.priority_listbox.insert(tk.END, orientation)
+        self.priority_listbox.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        button_frame = ttk.Frame(reorder_priority_frame)
+        button_frame.pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_frame, text="↑", command=self.move_priority_up, width=2).pack(pady=2)
+        ttk.Button(button_frame, text="↓", command=self.move_priority_down, width=2).pack(pady=2)
+
+        # Tempo limite da busca (vazio ou 0 = sem limite)
+        timeout_frame = ttk.Frame(controls_frame)
+        timeout_frame.grid(row=10, column=0, sticky="ew", pady=5)
+        ttk.Label(timeout_frame, text="Tempo Limite (s):").pack(side=tk.LEFT)
+        self.timeout_entry = ttk.Entry(timeout_frame, width=8)
+        self.timeout_entry.insert(0, "30")
+        self.timeout_entry.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(5, 0))
+
+        # Animação: expansões por quadro, pausa e passo único
+        animation_frame = ttk.Frame(controls_frame)
+        animation_frame.grid(row=11, column=0, sticky="ew", pady=5)
+        self.animate_var = tk.BooleanVar(self, value=False)
+        ttk.Checkbutton(animation_frame, text="Animar", variable=self.animate_var).pack(side=tk.LEFT)
+        self.speed_var = tk.IntVar(self, value=10)
+        ttk.Label(animation_frame, text="Expansões/quadro:").pack(side=tk.LEFT, padx=(5, 0))
+        ttk.Spinbox(animation_frame, from_=1, to=5000, width=6, textvariable=self.speed_var).pack(side=tk.LEFT, padx=5)
+        self.pause_button = ttk.Button(animation_frame, text="Pausar", command=self.toggle_animation_pause, state=tk.DISABLED, width=9)
+        self.pause_button.pack(side=tk.LEFT)
+        self.step_button = ttk.Button(animation_frame, text="Passo", command=self.step_animation, state=tk.DISABLED, width=6)
+        self.step_button.pack(side=tk.LEFT, padx=(5, 0))
+
+        # Botões de busca e cancelamento
+        search_buttons_frame = ttk.Frame(controls_frame)
+        search_buttons_frame.grid(row=12, column=0, sticky="ew", pady=10)
+        self.search_button = ttk.Button(search_buttons_frame, text="Iniciar Busca", command=self.run_search)
+        self.search_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.cancel_button = ttk.Button(search_buttons_frame, text="Cancelar", command=self.cancel_search, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        self.compare_button = ttk.Button(search_buttons_frame, text="Comparar", command=self.run_comparison)
+        self.compare_button.pack(side=tk.LEFT, fill=tk.X, expand=True, padx=(0, 5))
+        ttk.Button(search_buttons_frame, text="Mapa de Calor", command=self.toggle_heatmap).pack(side=tk.LEFT, fill=tk.X, expand=True)
+
+        # Resultados
+        ttk.Label(controls_frame, text="Custo do Caminho:").grid(row=13, column=0, sticky="w", pady=5)
+        self.cost_label = ttk.Label(controls_frame, text="-", font=("Consolas", 10, "bold"))
+        self.cost_label.grid(row=14, column=0, sticky="w", pady=5)
+        ttk.Label(controls_frame, text="Estatísticas da Busca:").grid(row=15, column=0, sticky="w", pady=5)
+        self.stats_label = ttk.Label(controls_frame, text="-", font=("Consolas", 9), justify=tk.LEFT)
+        self.stats_label.grid(row=16, column=0, sticky="w", pady=5)
+        ttk.Label(controls_frame, text="Caminho Encontrado:").grid(row=17, column=0, sticky="w", pady=5)
+        self.path_text = tk.Text(controls_frame, height=10, state=tk.DISABLED, wrap=tk.WORD)
+        self.path_text.grid(row=18, column=0, sticky="nsew", pady=5)
+        controls_frame.grid_rowconfigure(18, weight=1)
+
+        # Frame de visualização
+        visualization_frame = ttk.LabelFrame(main_frame, text="Visualização do Problema", padding="10")
+        visualization_frame.grid(row=0, column=1, sticky="nsew", padx=10, pady=5)
+        visualization_frame.grid_rowconfigure(0, weight=1)
+        visualization_frame.grid_columnconfigure(0, weight=1)
+
+        self.canvas = tk.Canvas(visualization_frame, bg="white")
+        self.canvas.grid(row=0, column=0, sticky="nsew")
+        self.canvas.bind("<Configure>", self.on_canvas_resize)
+        # Roda do mouse aproxima/afasta, arrastar desloca e clique duplo volta a ajustar o grid à janela
+        self.canvas.bind("<MouseWheel>", self.on_zoom)
+        self.canvas.bind("<Button-4>", self.on_zoom)
+        self.canvas.bind("<Button-5>", self.on_zoom)
+        self.canvas.bind("<ButtonPress-1>", self.on_pan_start)
+        self.canvas.bind("<B1-Motion>", self.on_pan_move)
+        self.canvas.bind("<Double-Button-1>", self.reset_view)
+
+
+    def move_priority_up(self):
+        """Move o item selecionado na lista de prioridades para cima."""
+        indices = self.priority_listbox.curselection()
+        if not indices: return
+        for index in indices:
+            if index > 0:
+                text = self.priority_listbox.get(index)
+                self.priority_listbox.delete(index)
+                self.priority_listbox.insert(index - 1, text)
+                self.priority_listbox.selection_set(index - 1)
+
+    def move_priority_down(self):
+        """Move o item selecionado na lista de prioridades para baixo."""
+        indices = self.priority_listbox.curselection()
+        if not indices: return
+        for index in reversed(indices):
+            if index < self.priority_listbox.size() - 1:
+                text = self.priority_listbox.get(index)
+                self.priority_listbox.delete(index)
+                self.priority_listbox.insert(index + 1, text)
+                self.priority_listbox.selection_set(index + 1)
+
+    def update_limit_entry_visibility(self, *args):
+        """Mostra ou oculta o campo de limite, dependendo do método de busca selecionado."""
+        if self.search_method_var.get() in ["PROFUNDIDADE LIMITADA", "APROFUNDAMENTO ITERATIVO"]:
+            self.limit_label.grid()
+            self.limit_entry.grid()
+        else:
+            self.limit_label.grid_remove()
+            self.limit_entry.grid_remove()
+
+    def on_canvas_resize(self, event):
+        """Agenda o redesenho do grid quando o tamanho da janela é alterado."""
+        self.schedule_redraw()
+
+    def schedule_redraw(self, delay=REDRAW_DELAY_MS):
+        """Agenda um único redesenho, descartando o que já estava agendado."""
+        if self.redraw_job is not None:
+            self.after_cancel(self.redraw_job)
+        self.redraw_job = self.after(delay, self.draw_grid)
+
+    def uses_grid_image(self):
+        return self.problem_model.grid_width * self.problem_model.grid_height > RETAINED_MAX_CELLS
+
+    def fit_view(self):
+        """Ajusta o tamanho das células para o grid inteiro caber no canvas."""
+        canvas_width, canvas_height = self.canvas.winfo_width(), self.canvas.winfo_height()
+        self.view_cell_size = min((canvas_width - NUM_OFFSET) / self.problem_model.grid_width, (canvas_height - NUM_OFFSET) / self.problem_model.grid_height)
+        self.view_offset = (NUM_OFFSET, NUM_OFFSET)
+
+    def reset_view(self, event=None):
+        self.user_view = False
+        self.draw_grid()
+
+    def on_zoom(self, event):
+        """Aproxima ou afasta a visualização mantendo fixo o ponto sob o cursor."""
+        if self.view_cell_size is None: return
+        zoom_in = event.num == 4 or event.delta > 0
+        cell_size = self.view_cell_size
+        if self.uses_grid_image():
+            # A imagem só é ampliada ou reduzida por fatores inteiros
+            if cell_size >= 1 and (zoom_in or cell_size > 1):
+                new_cell_size = cell_size + (1 if zoom_in else -1)
+            else:
+                subsample = round(1 / cell_size) + (-1 if zoom_in else 1)
+                new_cell_size = 1 / max(1, subsample)
+        else:
+            new_cell_size = cell_size * (ZOOM_STEP if zoom_in else 1 / ZOOM_STEP)
+        offset_x, offset_y = self.view_offset
+        factor = new_cell_size / cell_size
+        self.view_offset = (event.x - (event.x - offset_x) * factor, event.y - (event.y - offset_y) * factor)
+        self.view_cell_size = new_cell_size
+        self.user_view = True
+        self.schedule_redraw(REDRAW_DELAY_MS // 2)
+
+    def on_pan_start(self, event):
+        self.pan_anchor = (event.x, event.y)
+
+    def on_pan_move(self, event):
+        """Desloca a visualização acompanhando o arraste do mouse."""
+        if self.view_cell_size is None or self.pan_anchor is None: return
+        dx, dy = event.x - self.pan_anchor[0], event.y - self.pan_anchor[1]
+        self.pan_anchor = (event.x, event.y)
+        offset_x, offset_y = self.view_offset
+        self.view_offset = (offset_x + dx, offset_y + dy)
+        self.user_view = True
+        if self.uses_grid_image():
+            # Move a imagem já desenhada e só recorta a nova área visível quando o arraste parar
+            self.canvas.move("grid_image", dx, dy)
+            self.canvas.move("path", dx, dy)
+            self.canvas.move("overlay", dx, dy)
+            self.canvas.move("heatmap", dx, dy)
+            self.schedule_redraw()
+        else:
+            self.draw_grid()
+
+    def draw_grid(self):
+        """
+        Desenha o grid, obstáculos e o caminho no canvas. Os itens do grid são criados
+        uma única vez por versão do mapa e depois apenas reposicionados; o caminho é
+        redesenhado à parte.
+        """
+        self.redraw_job = None
+        canvas_width = self.canvas.winfo_width()
+        canvas_height = self.canvas.winfo_height()
+        if canvas_width < 50 or canvas_height < 50: return
+        if not self.user_view:
+            self.fit_view()
+
+        grid = self.problem_model.grid
+        large = self.uses_grid_image()
+        layer = (id(grid), grid.version, large)
+        if layer != self.drawn_layer:
+            self.canvas.delete("grid")
+            self.drawn_view = None
+            self.grid_image_base = self.build_grid_image() if large else None
+            self.drawn_layer = layer
+
+        if large:
+            self.draw_grid_image(canvas_width, canvas_height)
+        else:
+            self.draw_grid_cells()
+        self.draw_heatmap(canvas_width, canvas_height)
+        self.draw_search_overlay()
+        self.canvas.delete("path")
+        if self.current_path:
+            self.draw_path_on_grid(self.current_path, self.view_cell_size, *self.view_offset)
+        # Na comparação, os traçados são afastados um pouco entre si para que os trechos comuns continuem visíveis
+        spacing = min(2.0, self.view_cell_size / (2 * max(1, len(self.compared_paths))))
+        for i, (path, color) in enumerate(self.compared_paths):
+            shift = (i - (len(self.compared_paths) - 1) / 2) * spacing
+            self.draw_path_on_grid(path, self.view_cell_size, *self.view_offset, color=color, shift=shift, arrows=False)
+
+    def draw_grid_cells(self):
+        """Cria os retângulos e a numeração do grid ou reposiciona os existentes para a visualização atual."""
+        cell_size = self.view_cell_size
+        offset_x, offset_y = self.view_offset
+        if self.drawn_view is None:
+            for y in range(self.problem_model.grid_height):
+                self.canvas.create_text(NUM_OFFSET / 2, offset_y + y * cell_size + cell_size / 2, text=str(y), fill="black", tags=("grid", "row_label"))
+            for x in range(self.problem_model.grid_width):
+                self.canvas.create_text(offset_x + x * cell_size + cell_size / 2, NUM_OFFSET / 2, text=str(x), fill="black", tags=("grid", "col_label"))
+
+            for y in range(self.problem_model.grid_height):
+                for x in range(self.problem_model.grid_width):
+                    x1, y1 = offset_x + x * cell_size, offset_y + y * cell_size
+                    x2, y2 = x1 + cell_size, y1 + cell_size
+                    color = "#555" if (x, y) in self.problem_model.obstacles else "white"
+                    self.canvas.create_rectangle(x1, y1, x2, y2, fill=color, outline="gray", tags=("grid", "cell"))
+        elif self.drawn_view != (cell_size, offset_x, offset_y):
+            # Reescala os itens existentes em vez de recriá-los
+            old_cell_size, old_x, old_y = self.drawn_view
+            factor = cell_size / old_cell_size
+            self.canvas.scale("cell", old_x, old_y, factor, factor)
+            self.canvas.move("cell", offset_x - old_x, offset_y - old_y)
+            self.canvas.scale("row_label", 0, old_y, 1, factor)
+            self.canvas.move("row_label", 0, offset_y - old_y)
+            self.canvas.scale("col_label", old_x, 0, factor, 1)
+            self.canvas.move("col_label", offset_x - old_x, 0)
+        self.drawn_view = (cell_size, offset_x, offset_y)
+
+    def draw_search_overlay(self):
+        """Redesenha as células expandidas e de fronteira da animação para a visualização atual."""
+        self.canvas.delete("overlay")
+        self.overlay_items = {}
+        self.update_search_overlay(self.closed_cells | self.frontier_cells)
+
+    def update_search_overlay(self, cells):
+        """Cria ou recolore os marcadores de `cells` (um retângulo por célula, todos num único quadro)."""
+        cell_size = self.view_cell_size
+        offset_x, offset_y = self.view_offset
+        for cell in cells:
+            color = CLOSED_COLOR if cell in self.closed_cells else FRONTIER_COLOR
+            item = self.overlay_items.get(cell)
+            if item is not None:
+                self.canvas.itemconfig(item, fill=color)
+                continue
+            x1, y1 = offset_x + cell[0] * cell_size, offset_y + cell[1] * cell_size
+            self.overlay_items[cell] = self.canvas.create_rectangle(x1, y1, x1 + cell_size, y1 + cell_size, fill=color, outline="", tags="overlay")
+        self.canvas.tag_raise("path")
+
+    def build_grid_image(self):
+        """Cria uma imagem com um pixel por célula (branco livre, cinza obstáculo)."""
+        grid = self.problem_model.grid
+        image = tk.PhotoImage(width=grid.width, height=grid.height)
+        colors = ("white", "#555")
+        # Envia as linhas em blocos para não montar uma única string gigante
+        for first_row in range(0, grid.height, 64):
+            rows = []
+            for y in range(first_row, min(grid.height, first_row + 64)):
+                rows.append("{" + " ".join(colors[grid.is_blocked(x, y)] for x in range(grid.width)) + "}")
+            image.put(" ".join(rows), to=(0, first_row))
+        return image
+
+    def draw_grid_image(self, canvas_width, canvas_height):
+        """Mostra apenas a parte visível da imagem do grid, ampliada ou reduzida para a visualização."""
+        self.canvas.delete("grid_image")
+        self.grid_image = self.draw_visible_image(self.grid_image_base, canvas_width, canvas_height, ("grid", "grid_image"))
+        self.canvas.tag_lower("grid_image")
+
+    def draw_visible_image(self, base, canvas_width, canvas_height, tags):
+        """
+        Desenha a parte visível de uma imagem com um pixel por célula e retorna a imagem criada,
+        cuja referência deve ser mantida (senão o Tk a descarta).
+        """
+        # Fatores inteiros de ampliação (zoom) ou redução (subsample), como exige a cópia de imagens do Tk
+        if self.view_cell_size >= 1:
+            zoom, subsample = int(self.view_cell_size), 1
+        else:
+            zoom, subsample = 1, math.ceil(1 / self.view_cell_size)
+        cell_size = self.view_cell_size = zoom / subsample
+        offset_x, offset_y = self.view_offset
+
+        x0 = max(0, math.floor(-offset_x / cell_size))
+        y0 = max(0, math.floor(-offset_y / cell_size))
+        x1 = min(self.problem_model.grid_width, math.ceil((canvas_width - offset_x) / cell_size))
+        y1 = min(self.problem_model.grid_height, math.ceil((canvas_height - offset_y) / cell_size))
+        x0, y0 = x0 - x0 % subsample, y0 - y0 % subsample
+        if x1 <= x0 or y1 <= y0:
+            return None
+
+        image = tk.PhotoImage()
+        image.tk.call(image, "copy", base, "-from", x0, y0, x1, y1, "-zoom", zoom, zoom, "-subsample", subsample, subsample)
+        self.canvas.create_image(offset_x + x0 * cell_size, offset_y + y0 * cell_size, image=image, anchor="nw", tags=tags)
+        return image
+
+    def toggle_heatmap(self):
+        """Mostra o mapa de calor das distâncias a partir do estado inicial, ou o esconde se já estiver visível."""
+        if self.heatmap is not None:
+            self.heatmap = None
+            self.draw_grid()
+            return
+        try:
+            start_state = ((int(self.start_x_entry.get()), int(self.start_y_entry.get())), self.start_orientation_var.get())
+            field = DistanceField(self.problem_model, start_state)
+        except ImportError as e:
+            messagebox.showerror("Mapa de Calor", str(e))
+            return
+        except ValueError:
+            messagebox.showerror("Erro de Entrada", "Estado inicial inválido para o mapa de calor.")
+            return
+        grid = self.problem_model.grid
+        self.heatmap = ((id(grid), grid.version), field.cell_costs(), None)
+        self.draw_grid()
+
+    def heatmap_colors(self, costs):
+        """Cor de cada célula no mapa de calor, linha a linha; None nas células inalcançáveis."""
+        reachable = costs[costs != float("inf")]
+        farthest = float(reachable.max()) if reachable.size else 0.0
+        scale = (len(HEATMAP_PALETTE) - 1) / farthest if farthest > 0 else 0.0
+        return [[HEATMAP_PALETTE[int(cost * scale)] if cost != float("inf") else None for cost in row]
+                for row in costs.tolist()]
+
+    def draw_heatmap(self, canvas_width, canvas_height):
+        """Desenha o mapa de calor sobre o grid: uma imagem nos mapas grandes, um retângulo por célula nos demais."""
+        self.canvas.delete("heatmap")
+        self.heatmap_image = None
+        if self.heatmap is None: return
+        grid = self.problem_model.grid
+        layer, costs, image_base = self.heatmap
+        if layer != (id(grid), grid.version):
+            # O grid mudou depois do cálculo: o campo de distâncias não vale mais
+            self.heatmap = None
+            return
+
+        if self.uses_grid_image():
+            if image_base is None:
+                image_base = tk.PhotoImage(width=grid.width, height=grid.height)
+                colors = self.heatmap_colors(costs)
+                for first_row in range(0, grid.height, 64):
+                    rows = []
+                    for y in range(first_row, min(grid.height, first_row + 64)):
+                        rows.append("{" + " ".join(color or ("#555" if grid.is_blocked(x, y) else "white")
+                                                   for x, color in enumerate(colors[y])) + "}")
+                    image_base.put(" ".join(rows), to=(0, first_row))
+                self.heatmap = (layer, costs, image_base)
+            self.heatmap_image = self.draw_visible_image(image_base, canvas_width, canvas_height, "heatmap")
+            return
+
+        cell_size = self.view_cell_size
+        offset_x, offset_y = self.view_offset
+        for y, row in enumerate(self.heatmap_colors(costs)):
+            for x, color in enumerate(row):
+                if color is None or grid.is_blocked(x, y): continue
+                x1, y1 = offset_x + x * cell_size, offset_y + y * cell_size
+                self.canvas.create_rectangle(x1, y1, x1 + cell_size, y1 + cell_size, fill=color, outline="", tags="heatmap")
+
+    def draw_path_on_grid(self, path, cell_size, offset_x, offset_y, color=PATH_COLOR, shift=0, arrows=True):
+        """
+        Desenha uma representação do caminho encontrado no grid. Sem `arrows`, só o início e o
+        fim recebem a seta; `shift` desloca o traçado em pixels, como na comparação.
+        """
+        if not path: return
+        path_color = color
+
+        # Desenha o traçado do caminho numa única linha (curvas no lugar repetem o ponto)
+        centers = []
+        for (x, y), _ in path:
+            centers.extend((offset_x + x * cell_size + cell_size / 2 + shift, offset_y + y * cell_size + cell_size / 2 + shift))
+        if len(centers) >= 4:
+            self.canvas.create_line(*centers, fill=path_color, width=3, tags="path")
+
+        # Desenha os nós (início, fim e intermediários)
+        for i, state in enumerate(path):
+            if 0 < i < len(path) - 1 and (not arrows or cell_size < MIN_ARROW_CELL_SIZE): continue
+            (x, y), orientation = state
+            center_x = offset_x + x * cell_size + cell_size / 2
+            center_y = offset_y + y * cell_size + cell_size / 2
+            
+            if i == 0: color = "green"  # Ponto inicial
+            elif i == len(path) - 1: color = "red" # Ponto final
+            else: color = path_color # Pontos intermediários
+
+            # Desenha um triângulo para indicar a orientação
+            arrow_length = cell_size * 0.3 if cell_size >= MIN_ARROW_CELL_SIZE else MIN_ARROW_CELL_SIZE
+            if orientation == 'Norte': points = [center_x, center_y - arrow_length, center_x - arrow_length, center_y + arrow_length, center_x + arrow_length, center_y + arrow_length]
+            elif orientation == 'Leste': points = [center_x + arrow_length, center_y, center_x - arrow_length, center_y - arrow_length, center_x - arrow_length, center_y + arrow_length]
+            elif orientation == 'Sul': points = [center_x, center_y + arrow_length, center_x - arrow_length, center_y - arrow_length, center_x + arrow_length, center_y - arrow_length]
+            else: # Oeste
+                points = [center_x - arrow_length, center_y, center_x + arrow_length, center_y - arrow_length, center_x + arrow_length, center_y + arrow_length]
+            
+            self.canvas.create_polygon(points, fill=color, outline='black', tags="path")
+
+
+    def show_stats(self, stats, elapsed=None):
+        """Mostra as estatísticas da busca no painel de resultados (durante ou após a busca)."""
+        if stats is None:
+            self.stats_label.config(text="-")
+            return
+        elapsed = stats.elapsed if elapsed is None else elapsed
+        self.stats_label.config(text=(
+            f"Tempo: {elapsed * 1000:.1f} ms\n"
+            f"Nós expandidos: {stats.nodes_expanded}   gerados: {stats.nodes_generated}\n"
+            f"Fronteira máx.: {stats.max_frontier}   visitados máx.: {stats.max_visited}\n"
+            f"Descartes: {stats.stale_pops}   iterações: {stats.iterations}"))
+
+    def read_search_inputs(self):
+        """
+        Lê e valida os parâmetros da interface e aplica a prioridade de expansão.
+        Retorna (start_state, goal_state, algorithm, limit, timeout) ou None se forem inválidos.
+        """
+        try:
+            start_x, start_y = int(self.start_x_entry.get()), int(self.start_y_entry.get())
+            start_orientation = self.start_orientation_var.get()
+            start_state = ((start_x, start_y), start_orientation)
+
+            goal_x, goal_y = int(self.goal_x_entry.get()), int(self.goal_y_entry.get())
+            goal_orientation = self.goal_orientation_var.get()
+            goal_state = ((goal_x, goal_y), goal_orientation)
+
+            if not (0 <= start_x < self.problem_model.grid_width and 0 <= start_y < self.problem_model.grid_height) or (start_x, start_y) in self.problem_model.obstacles:
+                messagebox.showerror("Erro de Entrada", f"Estado inicial ({start_x}, {start_y}) é inválido ou um obstáculo.")
+                return None
+            if not (0 <= goal_x < self.problem_model.grid_width and 0 <= goal_y < self.problem_model.grid_height) or (goal_x, goal_y) in self.problem_model.obstacles:
+                messagebox.showerror("Erro de Entrada", f"Estado objetivo ({goal_x}, {goal_y}) é inválido ou um obstáculo.")
+                return None
+
+            search_method = self.search_method_var.get()
+            limit = int(self.limit_entry.get()) if self.limit_entry.get() else 0
+
+            priority_order = list(self.priority_listbox.get(0, tk.END))
+            self.problem_model.set_expansion_priority(priority_order)
+
+            algorithm = SEARCH_METHOD_NAMES[search_method]
+            timeout = float(self.timeout_entry.get()) if self.timeout_entry.get() else 0
+        except ValueError:
+            messagebox.showerror("Erro de Entrada", "As coordenadas X e Y e o limite devem ser números inteiros e o tempo limite um número.")
+            return None
+        return start_state, goal_state, algorithm, limit, timeout
+
+    def run_search(self):
+        """Inicia o algoritmo de busca selecionado em segundo plano, com os parâmetros da interface."""
+        if self.search_thread is not None or self.animation is not None: return
+        inputs = self.read_search_inputs()
+        if inputs is None: return
+        start_state, goal_state, algorithm, limit, timeout = inputs
+
+        self.closed_cells, self.frontier_cells = set(), set()
+        self.current_path = None
+        self.compared_paths = []
+        self.draw_grid()
+        self.search_algorithms.stats = self.search_algorithms.stats or SearchStats()
+        if self.animate_var.get():
+            self.start_animation(algorithm, start_state, goal_state, limit)
+            return
+        search_function = lambda i, f: self.search_algorithms.buscar(algorithm, i, f, limit)
+
+        self.search_control = SearchControl(timeout=timeout or None)
+        self.search_control.start()
+        self.search_algorithms.hooks = self.search_control
+        self.search_started_at = time.perf_counter()
+        self.search_thread = threading.Thread(target=self.search_worker, args=(search_function, start_state, goal_state), daemon=True)
+        self.search_button.config(state=tk.DISABLED)
+        self.compare_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.cost_label.config(text="Buscando...")
+        self.search_thread.start()
+        self.after(PROGRESS_INTERVAL_MS, self.poll_search)
+
+    def run_comparison(self):
+        """
+        Executa todos os algoritmos sobre a mesma consulta, em processos separados (ver portfolio),
+        e sobrepõe os caminhos encontrados no grid, cada um numa cor.
+        """
+        if self.search_thread is not None or self.animation is not None: return
+        inputs = self.read_search_inputs()
+        if inputs is None: return
+        start_state, goal_state, _, limit, timeout = inputs
+
+        self.closed_cells, self.frontier_cells = set(), set()
+        self.current_path = None
+        self.compared_paths = []
+        self.draw_grid()
+        if self.portfolio is None:
+            self.portfolio = SearchPortfolio(self.problem_model, compact=self.search_algorithms.compact)
+        algorithms = list(SEARCH_METHOD_NAMES.values())
+        compare_function = lambda i, f: self.portfolio.comparar(i, f, algorithms, limit, timeout or None)
+
+        self.comparing = True
+        self.search_started_at = time.perf_counter()
+        self.search_thread = threading.Thread(target=self.search_worker, args=(compare_function, start_state, goal_state), daemon=True)
+        self.search_button.config(state=tk.DISABLED)
+        self.compare_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.cost_label.config(text="Comparando...")
+        self.search_thread.start()
+        self.after(PROGRESS_INTERVAL_MS, self.poll_search)
+
+    def search_worker(self, search_function, start_state, goal_state):
+        """Executa a busca na thread trabalhadora; o resultado volta à interface pela fila."""
+        try:
+            self.search_results.put(("ok", search_function(start_state, goal_state)))
+        except SearchCancelled as e:
+            self.search_results.put(("cancelada", e))
+        except Exception as e:
+            self.search_results.put(("erro", f"Ocorreu um erro: {e}"))
+
+    def poll_search(self):
+        """Atualiza o andamento da busca e, quando ela termina, mostra o resultado (thread do Tk)."""
+        try:
+            status, result = self.search_results.get_nowait()
+        except queue.Empty:
+            if self.comparing:
+                self.stats_label.config(text=f"Tempo: {(time.perf_counter() - self.search_started_at) * 1000:.1f} ms")
+            else:
+                self.show_stats(self.search_algorithms.stats, time.perf_counter() - self.search_started_at)
+            self.after(PROGRESS_INTERVAL_MS, self.poll_search)
+            return
+
+        self.search_thread.join()
+        self.search_thread = None
+        self.search_algorithms.hooks = None
+        comparing, self.comparing = self.comparing, False
+        self.search_button.config(state=tk.NORMAL)
+        self.compare_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+
+        if status == "cancelada":
+            self.cost_label.config(text="Tempo esgotado" if isinstance(result, SearchTimeout) else "Busca cancelada")
+            self.show_stats(self.search_algorithms.stats, time.perf_counter() - self.search_started_at)
+            return
+        if status == "erro":
+            self.cost_label.config(text="-")
+            messagebox.showerror("Erro Inesperado", result)
+            return
+        if comparing:
+            self.show_comparison(result)
+            return
+        self.show_result(*result)
+
+    def cancel_search(self):
+        """Pede o cancelamento cooperativo da busca em andamento."""
+        if self.animation is not None:
+            self.animation.close()
+            self.finish_animation()
+            return
+        if self.comparing:
+            self.portfolio.cancelar()
+        elif self.search_control is not None:
+            self.search_control.cancel()
+
+    def start_animation(self, algorithm, start_state, goal_state, limit):
+        """Inicia a busca passo a passo; cada quadro avança algumas expansões e desenha o resultado de uma vez."""
+        self.search_algorithms.hooks = None
+        self.animation = self.search_algorithms.passo_a_passo(algorithm, start_state, goal_state, limit)
+        self.animation_paused = False
+        self.search_button.config(state=tk.DISABLED)
+        self.cancel_button.config(state=tk.NORMAL)
+        self.pause_button.config(state=tk.NORMAL, text="Pausar")
+        self.step_button.config(state=tk.NORMAL)
+        self.cost_label.config(text="Buscando...")
+        self.after(ANIMATION_FRAME_MS, self.animation_frame)
+
+    def animation_frame(self):
+        if self.animation is None: return
+        if not self.animation_paused:
+            try:
+                self.advance_animation(max(1, self.speed_var.get()))
+            except (tk.TclError, ValueError):
+                self.advance_animation(1)
+        if self.animation is not None:
+            self.after(ANIMATION_FRAME_MS, self.animation_frame)
+
+    def advance_animation(self, count):
+        """Consome até `count` eventos de expansão e atualiza os marcadores alterados."""
+        events = list(itertools.islice(self.animation, count))
+        changed = set()
+        for event in events:
+            cell = event.state[0]
+            self.closed_cells.add(cell)
+            self.frontier_cells.discard(cell)
+            changed.add(cell)
+            for state in event.pushed:
+                if state[0] not in self.closed_cells:
+                    self.frontier_cells.add(state[0])
+                    changed.add(state[0])
+        self.update_search_overlay(changed)
+        self.show_stats(self.search_algorithms.stats)
+        if self.animation.finished:
+            self.finish_animation()
+
+    def toggle_animation_pause(self):
+        self.animation_paused = not self.animation_paused
+        self.pause_button.config(text="Continuar" if self.animation_paused else "Pausar")
+
+    def step_animation(self):
+        """Avança uma única expansão (pausando a animação)."""
+        if self.animation is None: return
+        if not self.animation_paused:
+            self.toggle_animation_pause()
+        self.advance_animation(1)
+
+    def finish_animation(self):
+        """Encerra a animação e mostra o resultado, se a busca terminou."""
+        animation, self.animation = self.animation, None
+        self.search_button.config(state=tk.NORMAL)
+        self.cancel_button.config(state=tk.DISABLED)
+        self.pause_button.config(state=tk.DISABLED, text="Pausar")
+        self.step_button.config(state=tk.DISABLED)
+        if animation is not None and animation.result is not None:
+            self.show_result(*animation.result)
+        else:
+            self.cost_label.config(text="Busca cancelada")
+
+    def show_result(self, path, cost):
+        """Mostra o custo, as estatísticas e o caminho encontrados e redesenha o grid."""
+        self.cost_label.config(text=f"{cost:.2f}" if path else "Não encontrado")
+        self.show_stats(self.search_algorithms.stats)
+        self.path_text.config(state=tk.NORMAL, wrap=tk.WORD)
+        self.path_text.delete(1.0, tk.END)
+        if path:
+            path_str = " -> ".join([f"({s[0][0]},{s[0][1]},{s[1][0]})" for s in path])
+            self.path_text.insert(tk.END, path_str)
+            self.current_path = path
+        else:
+            self.path_text.insert(tk.END, "Nenhum caminho encontrado.")
+            self.current_path = None
+
+        self.path_text.config(state=tk.DISABLED)
+        self.draw_grid()
+
+    def show_comparison(self, entries):
+        """Mostra a tabela da comparação (cada linha na cor do seu caminho) e sobrepõe os caminhos no grid."""
+        found = [entry for entry in entries if entry.path is not None]
+        self.cost_label.config(text=f"{len(found)} de {len(entries)} algoritmos encontraram caminho")
+        self.stats_label.config(text=f"Tempo: {(time.perf_counter() - self.search_started_at) * 1000:.1f} ms")
+        self.path_text.config(state=tk.NORMAL)
+        self.path_text.delete(1.0, tk.END)
+        header, *rows = formatar_tabela(entries).split("\n")
+        self.path_text.insert(tk.END, header + "\n")
+        self.compared_paths = []
+        for entry, row, color in zip(entries, rows, COMPARISON_COLORS):
+            self.path_text.tag_configure(color, foreground=color)
+            self.path_text.insert(tk.END, row + "\n", color)
+            if entry.path is not None:
+                self.compared_paths.append((entry.path, color))
+        self.path_text.config(state=tk.DISABLED, wrap=tk.NONE)
+        self.draw_grid()
+
+    def destroy(self):
+        """Encerra também os processos do portfólio de comparação."""
+        if self.portfolio is not None:
+            self.portfolio.close()
+        super().destroy()
+
+if __name__ == "__main__":
+    # Carrega o mapa informado na linha de comando (texto 0/9 ou binário) ou, sem argumentos, o grid estático
+    problem_model = ProblemModel.from_file(sys.argv[1]) if len(sys.argv) > 1 else ProblemModel()
+    search_algorithms = SearchAlgorithms(problem_model, stats=SearchStats())
+
+    app = PathfindingApp(problem_model, search_algorithms)
+
     app.mainloop()
\ No newline at end of file
@@ -0,0 +1,357 @@
+import heapq
+import itertools
+from array import array
+from problem_model import DESLOCAMENTOS, ProblemModel
+
+# Entradas com até este número de células recebem uma única transição, no meio;
+# entradas maiores recebem uma transição em cada extremidade
+TAMANHO_MAXIMO_ENTRADA_SIMPLES = 5
+
+class HierarchicalPlanner:
+    """
+    Busca hierárquica HPA* (Botea, Müller e Schaeffer) com orientação
+
+    O grid é dividido em clusters quadrados. Em cada fronteira entre clusters vizinhos são
+    escolhidas transições, e os estados (x, y, orientação) que atravessam a fronteira viram nós
+    de um grafo abstrato. Dentro de cada cluster, o custo entre todos os pares de nós (já
+    incluindo as curvas) é pré-calculado. A busca é feita no grafo abstrato e só depois os
+    segmentos necessários são refinados para o caminho completo. O resultado é quase ótimo:
+    o custo pode exceder o ótimo quando a melhor rota não passa pelas transições escolhidas.
+    Internamente os estados são codificados como inteiros (ProblemModel.encode_state).
+    """
+    def __init__(self, problem_model: ProblemModel, cluster_size=16, construir=True):
+        """
+        Args:
+            construir (bool): Se False, a abstração fica vazia, para ser preenchida por
+                carregar_tabelas (ver artifacts)
+        """
+        self.problem_model = problem_model
+        self.cluster_size = cluster_size
+        self.clusters_x = -(-problem_model.grid_width // cluster_size)
+        self.clusters_y = -(-problem_model.grid_height // cluster_size)
+        # Transições de cada fronteira: (cx, cy, "h") liga (cx, cy) a (cx + 1, cy); "v" liga a (cx, cy + 1)
+        self.transicoes = {}
+        self.nos_cluster = {}
+        self.arestas = {}
+        if not construir:
+            return
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                for direcao in ("h", "v"):
+                    self._construir_fronteira(cx, cy, direcao)
+        for cy in range(self.clusters_y):
+            for cx in range(self.clusters_x):
+                self._construir_cluster((cx, cy))
+
+    def tabelas(self):
+        """
+        Exporta a abstração em arrays planos: transições (cx, cy, direção, ax, ay, bx, by,
+        com direção 0 = "h" e 1 = "v"), nós (índice do cluster, nó) e arestas (origem, destino, custo).
+        """
+        transicoes = array("i")
+        for (cx, cy, direcao), pares in self.transicoes.items():
+            for (ax, ay), (bx, by) in pares:
+                transicoes.extend((cx, cy, 0 if direcao == "h" else 1, ax, ay, bx, by))
+        nos = array("i")
+        for (cx, cy), nos_do_cluster in self.nos_cluster.items():
+            for no in nos_do_cluster:
+                nos.extend((cy * self.clusters_x + cx, no))
+        origens, destinos, custos = array("i"), array("i"), array("f")
+        for origem, vizinhos in self.arestas.items():
+            for destino, custo in vizinhos.items():
+                origens.append(origem)
+                destinos.append(destino)
+                custos.append(custo)
+        return {"transicoes": transicoes, "nos": nos, "origens": origens, "destinos": destinos, "custos": custos}
+
+    def carregar_tabelas(self, transicoes, nos, origens, destinos, custos):
+        """Reconstrói a abstração a partir dos arrays de tabelas() (ou de memoryviews equivalentes)."""
+        self.transicoes = {(cx, cy, direcao): [] for cy in range(self.clusters_y) for cx in range(self.clusters_x)
+                           for direcao in ("h", "v")
+                           if (cx + 1 < self.clusters_x if direcao == "h" else cy + 1 < self.clusters_y)}
+        for i in range(0, len(transicoes), 7):
+            cx, cy, direcao, ax, ay, bx, by = transicoes[i:i + 7]
+            self.transicoes[(cx, cy, "h" if direcao == 0 else "v")].append(((ax, ay), (bx, by)))
+        self.nos_cluster = {(cx, cy): set() for cy in range(self.clusters_y) for cx in range(self.clusters_x)}
+        for i in range(0, len(nos), 2):
+            cy, cx = divmod(nos[i], self.clusters_x)
+            self.nos_cluster[(cx, cy)].add(nos[i + 1])
+        self.arestas = {no: {} for nos_do_cluster in self.nos_cluster.values() for no in nos_do_cluster}
+        for origem, destino, custo in zip(origens, destinos, custos):
+            self.arestas[origem][destino] = custo
+
+    def _cluster_de(self, x, y):
+        return (x // self.cluster_size, y // self.cluster_size)
+
+    def _cluster_do_estado(self, estado):
+        y, x = divmod(estado >> 2, self.problem_model.grid_width)
+        return (x // self.cluster_size, y // self.cluster_size)
+
+    def _limites(self, cluster):
+        """Retorna (x_min, y_min, x_max, y_max), com máximos exclusivos, de um cluster."""
+        cx, cy = cluster
+        return (cx * self.cluster_size, cy * self.cluster_size,
+                min((cx + 1) * self.cluster_size, self.problem_model.grid_width),
+                min((cy + 1) * self.cluster_size, self.problem_model.grid_height))
+
+    def _construir_fronteira(self, cx, cy, direcao):
+        """Encontra as entradas livres na fronteira e escolhe as transições de cada uma."""
+        if direcao == "h" and cx + 1 >= self.clusters_x or direcao == "v" and cy + 1 >= self.clusters_y:
+            return
+        x_min, y_min, x_max, y_max = self._limites((cx, cy))
+        if direcao == "h":
+            pares = [((x_max - 1, y), (x_max, y)) for y in range(y_min, y_max)]
+        else:
+            pares = [((x, y_max - 1), (x, y_max)) for x in range(x_min, x_max)]
+
+        transicoes = []
+        segmento = []
+        # O par vazio no final fecha o último segmento
+        for a, b in pares + [(None, None)]:
+            if a is not None and self.problem_model.is_valid_state(*a) and self.problem_model.is_valid_state(*b):
+                segmento.append((a, b))
+                continue
+            if segmento:
+                if len(segmento) <= TAMANHO_MAXIMO_ENTRADA_SIMPLES:
+                    transicoes.append(segmento[len(segmento) // 2])
+                else:
+                    transicoes.extend((segmento[0], segmento[-1]))
+                segmento = []
+        self.transicoes[(cx, cy, direcao)] = transicoes
+
+    def _nos_da_fronteira(self, chave):
+        """Gera (no_saida, no_entrada) de cada travessia da fronteira, nos dois sentidos."""
+        cx, cy, direcao = chave
+        ida, volta = ("Leste", "Oeste") if direcao == "h" else ("Sul", "Norte")
+        codificar = self.problem_model.encode_state
+        for a, b in self.transicoes.get(chave, ()):
+            yield codificar((a, ida)), codificar((b, ida))
+            yield codificar((b, volta)), codificar((a, volta))
+
+    def _fronteiras_do_cluster(self, cluster):
+        cx, cy = cluster
+        return [(cx, cy, "h"), (cx, cy, "v"), (cx - 1, cy, "h"), (cx, cy - 1, "v")]
+
+    def _construir_cluster(self, cluster):
+        """Recalcula os nós de um cluster, suas arestas internas e as travessias que saem dele."""
+        for no in self.nos_cluster.get(cluster, ()):
+            self.arestas.pop(no, None)
+        nos = set()
+        saidas = []
+        for chave in self._fronteiras_do_cluster(cluster):
+            for saida, entrada in self._nos_da_fronteira(chave):
+                if self._cluster_do_estado(saida) == cluster:
+                    nos.add(saida)
+                    saidas.append((saida, entrada))
+                else:
+                    nos.add(entrada)
+        self.nos_cluster[cluster] = nos
+        self._calcular_custos_internos(nos, self._limites(cluster))
+        for saida, entrada in saidas:
+            self.arestas[saida][entrada] = 1.0
+
+    def _calcular_custos_internos(self, nos, limites):
+        """
+        Custo mínimo entre todos os pares de nós de um cluster. As adjacências do cluster são
+        montadas uma vez, com índices locais, e reaproveitadas pelo Dijkstra de cada nó.
+        """
+        x_min, y_min, x_max, y_max = limites
+        largura_local = x_max - x_min
+        width = self.problem_model.grid_width
+        num_local = largura_local * (y_max - y_min) * 4
+
+        def local(estado):
+            y, x = divmod(estado >> 2, width)
+            return ((y - y_min) * largura_local + (x - x_min)) * 4 + (estado & 3)
+
+        adjacencias = [None] * num_local
+        for y in range(y_min, y_max):
+            for x in range(x_min, x_max):
+                if not self.problem_model.is_valid_state(x, y): continue
+                for o in range(4):
+                    estado = (y * width + x) * 4 + o
+                    adjacencias[local(estado)] = [(local(vizinho), custo) for vizinho, custo in self._vizinhos_locais(estado, limites)]
+
+        indices = {no: local(no) for no in nos}
+        alvos = set(indices.values())
+        for no, origem in indices.items():
+            custos = [float('inf')] * num_local
+            custos[origem] = 0
+            fila = [(0, origem)]
+            restantes = len(indices) - 1
+            while fila and restantes:
+                custo, atual = heapq.heappop(fila)
+                if custo > custos[atual]:
+                    continue
+                if atual != origem and atual in alvos:
+                    restantes -= 1
+                for vizinho, custo_acao in adjacencias[atual] or ():
+                    novo_custo = custo + custo_acao
+                    if novo_custo < custos[vizinho]:
+                        custos[vizinho] = novo_custo
+                        heapq.heappush(fila, (novo_custo, vizinho))
+            self.arestas[no] = {outro: custos[indice] for outro, indice in indices.items()
+                                if outro != no and custos[indice] != float('inf')}
+
+    def _vizinhos_locais(self, estado, limites, reverso=False):
+        """Sucessores (ou predecessores) de um estado codificado que não saem dos limites."""
+        x_min, y_min, x_max, y_max = limites
+        width = self.problem_model.grid_width
+        celula, o = estado >> 2, estado & 3
+        y, x = divmod(celula, width)
+        vizinhos = [(celula * 4 + (o + 1) % 4, 0.5), (celula * 4 + (o - 1 + 4) % 4, 0.5)]
+        dx, dy = DESLOCAMENTOS[o]
+        if reverso:
+            dx, dy = -dx, -dy
+        nx, ny = x + dx, y + dy
+        if x_min <= nx < x_max and y_min <= ny < y_max and self.problem_model.is_valid_state(nx, ny):
+            vizinhos.append((((ny * width) + nx) * 4 + o, 1.0))
+        return vizinhos
+
+    def _dijkstra_local(self, origem, limites, reverso=False):
+        """Custos de `origem` para os estados dentro dos limites (ou até `origem`, se `reverso`)."""
+        custos = {origem: 0}
+        contador = itertools.count()
+        fila = [(0, next(contador), origem)]
+        while fila:
+            custo, _, estado = heapq.heappop(fila)
+            if custo > custos[estado]:
+                continue
+            for novo_estado, custo_acao in self._vizinhos_locais(estado, limites, reverso):
+                novo_custo = custo + custo_acao
+                if novo_estado not in custos or novo_custo < custos[novo_estado]:
+                    custos[novo_estado] = novo_custo
+                    heapq.heappush(fila, (novo_custo, next(contador), novo_estado))
+        return custos
+
+    def _caminho_local(self, inicio, fim, limites):
+        """A* restrito aos limites; retorna (lista de estados de `inicio` até `fim`, custo) ou (None, 0)."""
+        heuristic = self.problem_model.heuristic_compact
+        pais = {inicio: None}
+        custos = {inicio: 0}
+        contador = itertools.count()
+        fila = [(heuristic(inicio, fim), next(contador), 0, inicio)]
+        while fila:
+            _, _, custo, estado = heapq.heappop(fila)
+            if custo > custos[estado]:
+                continue
+            if estado == fim:
+                caminho = []
+                while estado is not None:
+                    caminho.append(estado)
+                    estado = pais[estado]
+                return caminho[::-1], custo
+            for novo_estado, custo_acao in self._vizinhos_locais(estado, limites):
+                novo_custo = custo + custo_acao
+                if novo_estado not in custos or novo_custo < custos[novo_estado]:
+                    custos[novo_estado] = novo_custo
+                    pais[novo_estado] = estado
+                    heapq.heappush(fila, (novo_custo + heuristic(novo_estado, fim), next(contador), novo_custo, novo_estado))
+        return None, 0
+
+    def buscar_abstrato(self, inicio, fim):
+        """
+        Busca no grafo abstrato, inserindo início e objetivo temporariamente.
+        Retorna (lista de estados abstratos codificados, custo) ou (None, 0).
+        """
+        self.problem_model.check_state(inicio)
+        self.problem_model.check_state(fim)
+        inicio, fim = self.problem_model.encode_state(inicio), self.problem_model.encode_state(fim)
+        if inicio == fim: return [inicio], 0
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        cluster_inicio = self._cluster_do_estado(inicio)
+        cluster_fim = self._cluster_do_estado(fim)
+
+        # Arestas temporárias: do início para os nós do seu cluster e desses nós para o objetivo
+        custos_inicio = self._dijkstra_local(inicio, self._limites(cluster_inicio))
+        saidas_inicio = {no: custos_inicio[no] for no in self.nos_cluster[cluster_inicio] if no in custos_inicio}
+        custos_fim = self._dijkstra_local(fim, self._limites(cluster_fim), reverso=True)
+        entradas_fim = {no: custos_fim[no] for no in self.nos_cluster[cluster_fim] if no in custos_fim}
+        if cluster_inicio == cluster_fim and inicio in custos_fim:
+            saidas_inicio[fim] = custos_fim[inicio]
+
+        heuristic = self.problem_model.heuristic_compact
+        pais = {inicio: None}
+        custos = {inicio: 0}
+        contador = itertools.count()
+        fila = [(heuristic(inicio, fim), next(contador), 0, inicio)]
+        while fila:
+            _, _, custo, no = heapq.heappop(fila)
+            if custo > custos[no]:
+                continue
+            if no == fim:
+                caminho = []
+                while no is not None:
+                    caminho.append(no)
+                    no = pais[no]
+                return caminho[::-1], custo
+            vizinhos = list(self.arestas.get(no, {}).items())
+            if no == inicio:
+                vizinhos.extend(saidas_inicio.items())
+            if no in entradas_fim:
+                vizinhos.append((fim, entradas_fim[no]))
+            for vizinho, custo_aresta in vizinhos:
+                novo_custo = custo + custo_aresta
+                if vizinho not in custos or novo_custo < custos[vizinho]:
+                    custos[vizinho] = novo_custo
+                    pais[vizinho] = no
+                    heapq.heappush(fila, (novo_custo + heuristic(vizinho, fim), next(contador), novo_custo, vizinho))
+        return None, 0
+
+    def refinar_segmentos(self, caminho_abstrato):
+        """
+        Gera, sob demanda, os trechos concretos entre nós abstratos consecutivos (sem repetir o
+        estado inicial de cada trecho). Quem só precisa do começo da rota pode parar a iteração.
+        """
+        decodificar = self.problem_model.decode_state
+        for a, b in zip(caminho_abstrato, caminho_abstrato[1:]):
+            cluster_a, cluster_b = self._cluster_do_estado(a), self._cluster_do_estado(b)
+            if cluster_a != cluster_b:
+                # Travessia de fronteira: um único movimento para frente
+                yield [decodificar(b)]
+            else:
+                trecho, _ = self._caminho_local(a, b, self._limites(cluster_a))
+                yield [decodificar(estado) for estado in trecho[1:]]
+
+    def buscar(self, inicio, fim):
+        """Busca hierárquica completa: retorna (caminho, custo) como os métodos de SearchAlgorithms."""
+        if inicio == fim: return [inicio], 0
+        self.problem_model.check_state(inicio)
+        self.problem_model.check_state(fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        caminho_abstrato, custo = self.buscar_abstrato(inicio, fim)
+
+        # Com início e objetivo em clusters vizinhos, as transições escolhidas podem forçar um desvio
+        # grande; uma busca direta na área dos dois clusters é barata e evita isso
+        (cx1, cy1), (cx2, cy2) = self._cluster_de(*inicio[0]), self._cluster_de(*fim[0])
+        if abs(cx1 - cx2) + abs(cy1 - cy2) == 1:
+            x_min, y_min, _, _ = self._limites((min(cx1, cx2), min(cy1, cy2)))
+            _, _, x_max, y_max = self._limites((max(cx1, cx2), max(cy1, cy2)))
+            codificar = self.problem_model.encode_state
+            direto, custo_direto = self._caminho_local(codificar(inicio), codificar(fim), (x_min, y_min, x_max, y_max))
+            if direto is not None and (caminho_abstrato is None or custo_direto <= custo):
+                return [self.problem_model.decode_state(estado) for estado in direto], custo_direto
+
+        if caminho_abstrato is None:
+            return None, 0
+        caminho = [inicio]
+        for trecho in self.refinar_segmentos(caminho_abstrato):
+            caminho.extend(trecho)
+        return caminho, custo
+
+    def atualizar_celulas(self, celulas):
+        """
+        Reconstrói a abstração apenas ao redor das células (x, y) alteradas: as fronteiras
+        dos clusters afetados e os nós e custos internos desses clusters e de seus vizinhos.
+        """
+        afetados = {self._cluster_de(x, y) for x, y in celulas}
+        fronteiras = {chave for cluster in afetados for chave in self._fronteiras_do_cluster(cluster)}
+        for cx, cy, direcao in fronteiras:
+            if cx >= 0 and cy >= 0:
+                self._construir_fronteira(cx, cy, direcao)
+        reconstruir = set(afetados)
+        for cx, cy in afetados:
+            reconstruir.update(((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1)))
+        for cx, cy in reconstruir:
+            if 0 <= cx < self.clusters_x and 0 <= cy < self.clusters_y:
+                self._construir_cluster((cx, cy))
@@ -0,0 +1,163 @@
+import heapq
+import random
+from array import array
+from problem_model import DESLOCAMENTOS, ProblemModel
+
+INFINITO = float('inf')
+# Cada marco guarda duas tabelas (distância a partir dele e até ele) de floats de 4 bytes por estado
+BYTES_POR_ESTADO = 2 * array("f").itemsize
+
+class LandmarkHeuristic:
+    """
+    Heurística ALT (A*, Landmarks e desigualdade Triangular)
+
+    Pré-calcula, para K marcos, as distâncias de custo mínimo de cada marco para todos os
+    estados (x, y, orientação) e de todos os estados até o marco. Pela desigualdade
+    triangular, max(d(L, t) - d(L, v), d(v, L) - d(t, L)) é um limite inferior admissível
+    e consistente para o custo de v até t, que considera obstáculos e curvas.
+
+    Atributos:
+        landmarks (list): Estados codificados escolhidos como marcos
+        grid_version (int): Versão do grid usada no pré-processamento; a heurística
+            só é usada enquanto o grid não mudar
+    """
+    def __init__(self, problem_model: ProblemModel, num_landmarks=4, selection="farthest",
+                 memory_budget=None, seed=0):
+        """
+        Args:
+            num_landmarks (int): Número de marcos desejado
+            selection (str ou list): "farthest" (marcos afastados entre si), "random",
+                ou uma lista de estados ((x, y), orientação) a usar como marcos
+            memory_budget (int): Limite em bytes para as tabelas; reduz o número de marcos se preciso
+            seed (int): Semente para a escolha do estado inicial e dos marcos aleatórios
+        """
+        self.problem_model = problem_model
+        self.num_states = problem_model.grid_width * problem_model.grid_height * 4
+        if memory_budget is not None:
+            num_landmarks = min(num_landmarks, memory_budget // (BYTES_POR_ESTADO * self.num_states))
+        self.landmarks = []
+        self.distances_from = []
+        self.distances_to = []
+        self.grid_version = problem_model.grid.version
+        self._rng = random.Random(seed)
+
+        if isinstance(selection, str):
+            if selection == "farthest":
+                self._select_farthest(num_landmarks)
+            elif selection == "random":
+                self._select_random(num_landmarks)
+            else:
+                raise ValueError(f"Seleção de marcos desconhecida: {selection}")
+        else:
+            for state in list(selection)[:num_landmarks]:
+                self._add_landmark(problem_model.encode_state(state))
+
+    @classmethod
+    def from_tables(cls, problem_model: ProblemModel, landmarks, distances_from, distances_to):
+        """
+        Cria a heurística a partir de tabelas já calculadas para o grid atual (por exemplo,
+        mapeadas de um arquivo por artifacts), sem refazer os Dijkstras.
+        """
+        heuristic = cls.__new__(cls)
+        heuristic.problem_model = problem_model
+        heuristic.num_states = problem_model.grid_width * problem_model.grid_height * 4
+        heuristic.landmarks = list(landmarks)
+        heuristic.distances_from = list(distances_from)
+        heuristic.distances_to = list(distances_to)
+        heuristic.grid_version = problem_model.grid.version
+        heuristic._rng = None
+        return heuristic
+
+    def _free_states(self):
+        """Percorre os estados codificados das células livres."""
+        model = self.problem_model
+        for y in range(model.grid_height):
+            for x in range(model.grid_width):
+                if model.is_valid_state(x, y):
+                    cell = (y * model.grid_width + x) * 4
+                    yield from range(cell, cell + 4)
+
+    def _select_random(self, count):
+        states = list(self._free_states())
+        for state_id in self._rng.sample(states, min(count, len(states))):
+            self._add_landmark(state_id)
+
+    def _select_farthest(self, count):
+        """Escolhe cada marco como o estado alcançável mais distante dos marcos já escolhidos."""
+        if count <= 0: return
+        states = list(self._free_states())
+        if not states: return
+        # O primeiro marco é o estado mais distante de um estado livre qualquer
+        nearest = self._dijkstra(self._rng.choice(states), reverse=False)
+        while len(self.landmarks) < count:
+            best, best_distance = None, 0
+            for state_id in states:
+                distance = nearest[state_id]
+                if distance != INFINITO and distance > best_distance:
+                    best, best_distance = state_id, distance
+            if best is None: return
+            self._add_landmark(best)
+            distances = self.distances_from[-1]
+            for state_id in states:
+                if distances[state_id] < nearest[state_id]:
+                    nearest[state_id] = distances[state_id]
+
+    def _add_landmark(self, state_id):
+        self.landmarks.append(state_id)
+        self.distances_from.append(self._dijkstra(state_id, reverse=False))
+        self.distances_to.append(self._dijkstra(state_id, reverse=True))
+
+    def _dijkstra(self, source, reverse):
+        """
+        Custo mínimo de `source` para todos os estados (ou de todos até `source`, se `reverse`),
+        numa tabela compacta indexada pelo estado codificado.
+        """
+        model = self.problem_model
+        width, height = model.grid_width, model.grid_height
+        is_free = model.is_valid_state
+        distances = array("f", [INFINITO]) * self.num_states
+        distances[source] = 0.0
+        heap = [(0.0, source)]
+        while heap:
+            distance, state_id = heapq.heappop(heap)
+            if distance > distances[state_id]:
+                continue
+            cell, o = divmod(state_id, 4)
+            y, x = divmod(cell, width)
+            dx, dy = DESLOCAMENTOS[o]
+            neighbours = [(cell * 4 + (o + 1) % 4, 0.5), (cell * 4 + (o - 1 + 4) % 4, 0.5)]
+            if not reverse:
+                if is_free(x + dx, y + dy):
+                    neighbours.append((((y + dy) * width + x + dx) * 4 + o, 1.0))
+            elif is_free(x, y) and 0 <= x - dx < width and 0 <= y - dy < height:
+                # Um estado sobre um obstáculo ainda pode avançar para uma célula livre
+                neighbours.append((((y - dy) * width + x - dx) * 4 + o, 1.0))
+            for neighbour, cost in neighbours:
+                new_distance = distance + cost
+                if new_distance < distances[neighbour]:
+                    distances[neighbour] = new_distance
+                    heapq.heappush(heap, (new_distance, neighbour))
+        return distances
+
+    def is_current(self):
+        """Indica se as tabelas ainda correspondem ao grid do modelo."""
+        return self.grid_version == self.problem_model.grid.version
+
+    def bound(self, state_id, goal_id):
+        """Limite inferior para o custo do estado codificado `state_id` até `goal_id`."""
+        best = 0.0
+        for distances_from, distances_to in zip(self.distances_from, self.distances_to):
+            from_state, from_goal = distances_from[state_id], distances_from[goal_id]
+            if from_state != INFINITO:
+                # O marco alcança o estado mas não o objetivo: o objetivo é inalcançável a partir do estado
+                if from_goal == INFINITO: return INFINITO
+                if from_goal - from_state > best: best = from_goal - from_state
+            to_state, to_goal = distances_to[state_id], distances_to[goal_id]
+            if to_goal != INFINITO:
+                if to_state == INFINITO: return INFINITO
+                if to_state - to_goal > best: best = to_state - to_goal
+        return best
+
+    def memory_usage(self):
+        """Bytes ocupados pelas tabelas de distância."""
+        return sum(t.itemsize * len(t) for t in self.distances_from + self.distances_to)
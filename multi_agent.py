@@ -0,0 +1,237 @@
+import heapq
+import itertools
+import time
+from collections import namedtuple
+from problem_model import ProblemModel
+
+# Custo de esperar parado por um passo de tempo; cada ação (mover, virar ou esperar) dura um passo
+CUSTO_ESPERA = 0.5
+INFINITO = float('inf')
+
+# Resultado de MultiAgentPlanner.planejar. `paths` tem, para cada veículo, o estado em cada passo
+# de tempo (ou None se ele ficou sem rota); `conflicts` conta os conflitos do plano final
+MultiAgentPlan = namedtuple("MultiAgentPlan", ("paths", "costs", "conflicts", "failed", "expansions", "elapsed"))
+
+
+class ReservationTable:
+    """
+    Tabela de reservas espaço-tempo: quais células estão ocupadas em cada passo de tempo,
+    quais travessias (célula a -> célula b entre t e t + 1) já foram usadas e a partir de
+    quando uma célula fica ocupada para sempre por um veículo estacionado no seu objetivo.
+    As células são identificadas por qualquer valor hashable.
+    """
+    def __init__(self):
+        self.celulas = {}
+        self.travessias = set()
+        self.estacionados = {}
+        self.ultima_reserva = {}
+
+    def ocupada(self, celula, t):
+        """Indica se a célula está reservada no passo `t`."""
+        estacionado = self.estacionados.get(celula)
+        return (celula, t) in self.celulas or (estacionado is not None and t >= estacionado)
+
+    def troca(self, origem, destino, t):
+        """Indica se outro veículo vai de `destino` para `origem` entre t e t + 1 (conflito de troca)."""
+        return (destino, origem, t) in self.travessias
+
+    def livre_a_partir_de(self, celula, t):
+        """Indica se nenhuma reserva ocupa a célula no passo `t` ou depois."""
+        return celula not in self.estacionados and self.ultima_reserva.get(celula, -1) < t
+
+    def reservar(self, agente, celulas):
+        """Reserva uma célula por passo de tempo e estaciona o veículo na última."""
+        for t, celula in enumerate(celulas):
+            self.celulas[(celula, t)] = agente
+            if t + 1 < len(celulas) and celulas[t + 1] != celula:
+                self.travessias.add((celula, celulas[t + 1], t))
+            if t > self.ultima_reserva.get(celula, -1):
+                self.ultima_reserva[celula] = t
+        self.estacionados[celulas[-1]] = len(celulas) - 1
+
+
+class _ResumableDistance:
+    """
+    Distância exata (sem os outros veículos) de cada estado codificado até o objetivo, por uma
+    A* reversa a partir dele retomada sob demanda (Reverse Resumable A*). Serve de heurística
+    para a busca no espaço-tempo.
+    """
+    def __init__(self, problem_model, inicio, fim):
+        self.antecessores = problem_model.get_predecessors_compact
+        self.heuristica = problem_model.heuristic_compact
+        self.inicio = inicio
+        self.custos = {fim: 0}
+        self.fechados = {}
+        self.fila = [(self.heuristica(inicio, fim), 0, fim)]
+
+    def distancia(self, estado):
+        d = self.fechados.get(estado)
+        if d is not None:
+            return d
+        fila, custos, fechados = self.fila, self.custos, self.fechados
+        while fila:
+            _, g, atual = heapq.heappop(fila)
+            if atual in fechados or g > custos[atual]:
+                continue
+            fechados[atual] = g
+            for anterior, custo_acao, _ in self.antecessores(atual):
+                novo_g = g + custo_acao
+                if novo_g < custos.get(anterior, INFINITO):
+                    custos[anterior] = novo_g
+                    heapq.heappush(fila, (novo_g + self.heuristica(self.inicio, anterior), novo_g, anterior))
+            if atual == estado:
+                return g
+        return INFINITO
+
+
+def contar_conflitos(caminhos):
+    """
+    Conta os conflitos entre caminhos temporais (listas de estados ((x, y), orientação), um
+    por passo): dois veículos na mesma célula no mesmo passo (vértice) ou trocando de célula
+    entre si (troca). Ao fim do caminho o veículo fica parado no último estado.
+    Retorna (conflitos_de_vertice, conflitos_de_troca).
+    """
+    caminhos = [caminho for caminho in caminhos if caminho]
+    vertices = trocas = 0
+    duracao = max((len(caminho) for caminho in caminhos), default=0)
+    for t in range(duracao):
+        ocupacao = {}
+        movimentos = set()
+        for caminho in caminhos:
+            celula = caminho[min(t, len(caminho) - 1)][0]
+            ocupacao[celula] = ocupacao.get(celula, 0) + 1
+            if t + 1 < len(caminho) and caminho[t + 1][0] != celula:
+                movimentos.add((celula, caminho[t + 1][0]))
+        vertices += sum(quantidade - 1 for quantidade in ocupacao.values())
+        trocas += sum(1 for a, b in movimentos if (b, a) in movimentos) // 2
+    return vertices, trocas
+
+
+class MultiAgentPlanner:
+    """
+    Planejamento cooperativo de vários veículos (Cooperative A*, Silver 2005)
+
+    Os veículos são planejados um a um, em ordem de prioridade, por uma A* no espaço
+    (x, y, orientação, t) que inclui a ação de esperar, guiada pela distância exata até o
+    objetivo sem os outros veículos (calculada sob demanda por uma A* reversa). Cada caminho
+    encontrado é gravado numa ReservationTable, e os seguintes evitam as células reservadas
+    (conflitos de vértice) e as travessias em sentido contrário (conflitos de troca). Ao
+    chegar, o veículo fica estacionado no objetivo. Veículos sem rota ficam parados no início.
+    """
+    def __init__(self, problem_model: ProblemModel, horizonte=None, max_expansoes=None):
+        """
+        Args:
+            horizonte (int): Maior passo de tempo considerado pelas buscas; sem ele,
+                4 * (largura + altura) mais o número de veículos
+            max_expansoes (int): Expansões permitidas por veículo; acima disso ele fica sem
+                rota, para que um veículo bloqueado não consuma o prazo de todos
+        """
+        self.problem_model = problem_model
+        self.horizonte = horizonte
+        self.max_expansoes = max_expansoes
+
+    def planejar(self, agentes, prazo=None):
+        """
+        Planeja os pares (inicio, fim) de `agentes`, do mais ao menos prioritário. Com `prazo`
+        (segundos), os veículos ainda não planejados quando ele se esgota ficam sem rota.
+        Retorna um MultiAgentPlan.
+        """
+        model = self.problem_model
+        for inicio, fim in agentes:
+            model.check_state(inicio)
+            model.check_state(fim)
+        model.build_successor_table()
+        horizonte = self.horizonte or 4 * (model.grid_width + model.grid_height) + len(agentes)
+        tempo = time.perf_counter()
+        limite = tempo + prazo if prazo is not None else None
+
+        reservas = ReservationTable()
+        caminhos, custos, falhas = [], [], []
+        expansoes = 0
+        for agente, (inicio, fim) in enumerate(agentes):
+            resultado = None
+            if limite is None or time.perf_counter() < limite:
+                resultado, expandidos = self._buscar(model.encode_state(inicio), model.encode_state(fim),
+                                                     reservas, horizonte, limite)
+                expansoes += expandidos
+            if resultado is None:
+                # Sem rota, o veículo continua parado no início
+                falhas.append(agente)
+                caminhos.append(None)
+                custos.append(None)
+                reservas.reservar(agente, [inicio[0]])
+                continue
+            caminho, custo = resultado
+            reservas.reservar(agente, [estado[0] for estado in caminho])
+            caminhos.append(caminho)
+            custos.append(custo)
+
+        parados = [caminho if caminho is not None else [inicio] for caminho, (inicio, _) in zip(caminhos, agentes)]
+        conflitos = sum(contar_conflitos(parados))
+        return MultiAgentPlan(caminhos, custos, conflitos, falhas, expansoes, time.perf_counter() - tempo)
+
+    def _buscar(self, inicio, fim, reservas, horizonte, limite):
+        """
+        A* no espaço-tempo entre estados codificados, respeitando `reservas`.
+        Retorna ((caminho, custo) ou None, expansões); o caminho tem um estado por passo de tempo.
+        """
+        model = self.problem_model
+        # Objetivo em outra região conexa: falha sem nem mesmo a A* reversa
+        if not model.is_reachable(inicio, fim):
+            return None, 0
+        sucessores, decodificar = model.get_successors_compact, model.decode_state
+        heuristica = _ResumableDistance(model, inicio, fim).distancia
+        largura = model.grid_width
+        celula_fim = divmod(fim >> 2, largura)[::-1]
+        if celula_fim in reservas.estacionados or reservas.ocupada(divmod(inicio >> 2, largura)[::-1], 0):
+            return None, 0
+        # Sem os outros veículos o objetivo já é inalcançável: falha sem percorrer o espaço-tempo
+        if heuristica(inicio) == INFINITO:
+            return None, 0
+
+        contador = itertools.count()
+        # Entre f iguais, prefere o nó com maior g, que está mais perto do objetivo
+        fila = [(heuristica(inicio), 0, next(contador), inicio, 0)]
+        custos = {(inicio, 0): 0}
+        pais = {(inicio, 0): None}
+        expansoes = 0
+        while fila:
+            _, negativo_g, _, estado, t = heapq.heappop(fila)
+            g = -negativo_g
+            if g > custos[(estado, t)]:
+                continue
+            if estado == fim and reservas.livre_a_partir_de(celula_fim, t):
+                caminho = []
+                chave = (estado, t)
+                while chave is not None:
+                    caminho.append(decodificar(chave[0]))
+                    chave = pais[chave]
+                caminho.reverse()
+                return (caminho, g), expansoes
+
+            expansoes += 1
+            if t >= horizonte:
+                continue
+            if expansoes == self.max_expansoes:
+                return None, expansoes
+            if limite is not None and expansoes % 1024 == 0 and time.perf_counter() > limite:
+                return None, expansoes
+            y, x = divmod(estado >> 2, largura)
+            vizinhos = [(novo_estado, custo_acao) for novo_estado, custo_acao, _ in sucessores(estado)]
+            vizinhos.append((estado, CUSTO_ESPERA))
+            for novo_estado, custo_acao in vizinhos:
+                ny, nx = divmod(novo_estado >> 2, largura)
+                if reservas.ocupada((nx, ny), t + 1):
+                    continue
+                if (nx, ny) != (x, y) and reservas.troca((x, y), (nx, ny), t):
+                    continue
+                chave = (novo_estado, t + 1)
+                novo_g = g + custo_acao
+                if chave not in custos or novo_g < custos[chave]:
+                    h = heuristica(novo_estado)
+                    if h == INFINITO:
+                        continue
+                    custos[chave] = novo_g
+                    pais[chave] = (estado, t)
+                    heapq.heappush(fila, (novo_g + h, -novo_g, next(contador), novo_estado, t + 1))
+        return None, expansoes
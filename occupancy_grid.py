@@ -0,0 +1,196 @@
+import mmap
+import struct
+
+# Cabeçalho do formato binário: assinatura, versão, codificação, reservado, largura, altura
+FORMATO_CABECALHO = struct.Struct("<4sBBHII")
+ASSINATURA = b"OGRD"
+VERSAO_FORMATO = 1
+CODIFICACAO_UINT8 = 0
+CODIFICACAO_BITMAP = 1
+# Valor que marca um obstáculo no layout de texto
+OBSTACULO = 9
+
+class OccupancyGrid:
+    """
+    Grid de ocupação armazenado em um buffer plano, sem objetos Python por célula
+
+    Atributos:
+        width (int): Largura do grid (número de colunas)
+        height (int): Altura do grid (número de linhas)
+        bitmap (bool): Se True, cada célula ocupa 1 bit; caso contrário, 1 byte (0 = livre)
+        data (buffer): bytearray, mmap ou memoryview com as células, linha a linha
+        version (int): Incrementado a cada alteração de célula
+        path (str): Arquivo de onde o grid foi carregado, se houver
+    """
+    def __init__(self, width, height, data=None, bitmap=False, path=None):
+        self.width = width
+        self.height = height
+        self.bitmap = bitmap
+        size = (width * height + 7) // 8 if bitmap else width * height
+        self.data = data if data is not None else bytearray(size)
+        if len(self.data) < size:
+            raise ValueError(f"Buffer do grid tem {len(self.data)} bytes, esperado {size}")
+        self.version = 0
+        self.path = path
+        self._mmap = None
+        # Escolhe a consulta de célula uma única vez, para que is_free seja um acesso direto ao buffer
+        self.is_free = self._is_free_bitmap if bitmap else self._is_free_uint8
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Cria um grid a partir de uma lista de linhas no layout 0/9"""
+        height = len(rows)
+        width = len(rows[0]) if height > 0 else 0
+        grid = cls(width, height)
+        for y, row in enumerate(rows):
+            grid.data[y * width:(y + 1) * width] = bytes(1 if cell == OBSTACULO else 0 for cell in row)
+        return grid
+
+    def __reduce__(self):
+        # Um mapa binário ainda não alterado é reaberto do arquivo (compartilhando o cache de páginas);
+        # nos demais casos o buffer é copiado
+        if self._mmap is not None and self.version == 0:
+            return (load_binary_grid, (self.path,))
+        size = (self.width * self.height + 7) // 8 if self.bitmap else self.width * self.height
+        return (_restore_grid, (self.width, self.height, bytearray(self.data[:size]), self.bitmap, self.path, self.version))
+
+    def _is_free_uint8(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and not self.data[y * self.width + x]
+
+    def _is_free_bitmap(self, x, y):
+        if not (0 <= x < self.width and 0 <= y < self.height): return False
+        index = y * self.width + x
+        return not (self.data[index >> 3] >> (index & 7)) & 1
+
+    def is_blocked(self, x, y):
+        """Verifica se a célula (x, y) está dentro do grid e é um obstáculo"""
+        return 0 <= x < self.width and 0 <= y < self.height and not self.is_free(x, y)
+
+    def set_blocked(self, x, y, blocked=True):
+        """Marca ou desmarca a célula (x, y) como obstáculo; retorna True se ela mudou"""
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            raise IndexError(f"Célula ({x}, {y}) fora do grid")
+        if self.is_blocked(x, y) == blocked: return False
+        index = y * self.width + x
+        if self.bitmap:
+            self.data[index >> 3] ^= 1 << (index & 7)
+        else:
+            self.data[index] = 1 if blocked else 0
+        self.version += 1
+        return True
+
+    def iter_obstacles(self):
+        """Percorre as células bloqueadas como tuplas (x, y), linha a linha"""
+        for y in range(self.height):
+            for x in range(self.width):
+                if not self.is_free(x, y):
+                    yield (x, y)
+
+    def count_obstacles(self):
+        """Conta as células bloqueadas sem criar objetos por célula"""
+        if self.bitmap:
+            return sum(byte.bit_count() for byte in self.data[:(self.width * self.height + 7) // 8])
+        return self.width * self.height - bytes(self.data[:self.width * self.height]).count(0)
+
+    def close(self):
+        """Libera o mapeamento de memória, se o grid veio de um arquivo binário"""
+        if self._mmap is not None:
+            self.data.release()
+            self._mmap.close()
+            self._mmap = None
+
+
+def _restore_grid(width, height, data, bitmap, path, version):
+    """Recria um OccupancyGrid serializado (usado por OccupancyGrid.__reduce__)"""
+    grid = OccupancyGrid(width, height, data, bitmap=bitmap, path=path)
+    grid.version = version
+    return grid
+
+
+class ObstacleView:
+    """Visão somente leitura dos obstáculos de um OccupancyGrid com a interface de um conjunto de tuplas (x, y)"""
+    def __init__(self, grid):
+        self.grid = grid
+
+    def __contains__(self, cell):
+        x, y = cell
+        return self.grid.is_blocked(x, y)
+
+    def __iter__(self):
+        return self.grid.iter_obstacles()
+
+    def __len__(self):
+        return self.grid.count_obstacles()
+
+
+def load_text_grid(path):
+    """
+    Carrega um grid no layout de texto 0/9 (uma linha do mapa por linha do arquivo).
+    Os valores podem estar separados por vírgulas, espaços ou escritos sem separador.
+    """
+    data = bytearray()
+    width = None
+    height = 0
+    with open(path, "r", encoding="utf-8") as file:
+        for line in file:
+            cells = line.strip().strip("[],").replace(",", " ").split()
+            if len(cells) == 1:
+                cells = cells[0]
+            if not cells: continue
+            if width is None:
+                width = len(cells)
+            elif len(cells) != width:
+                raise ValueError(f"Linha {height + 1} de {path} tem {len(cells)} células, esperado {width}")
+            data += bytes(1 if cell == str(OBSTACULO) else 0 for cell in cells)
+            height += 1
+    return OccupancyGrid(width or 0, height, data, path=path)
+
+
+def load_binary_grid(path):
+    """
+    Carrega um grid no formato binário compactado, mapeando o arquivo em memória.
+    O mapeamento é copy-on-write: alterações de células não são gravadas no arquivo.
+    """
+    with open(path, "rb") as file:
+        mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_COPY)
+    magic, version, encoding, _, width, height = FORMATO_CABECALHO.unpack_from(mapped)
+    if magic != ASSINATURA:
+        mapped.close()
+        raise ValueError(f"{path} não é um grid binário")
+    if version != VERSAO_FORMATO:
+        mapped.close()
+        raise ValueError(f"Versão {version} do formato de grid não suportada")
+    with memoryview(mapped) as view:
+        data = view[FORMATO_CABECALHO.size:]
+    grid = OccupancyGrid(width, height, data, bitmap=encoding == CODIFICACAO_BITMAP, path=path)
+    grid._mmap = mapped
+    return grid
+
+
+def save_binary_grid(grid, path, bitmap=None):
+    """Grava o grid no formato binário, opcionalmente convertendo entre bytes e bitmap"""
+    bitmap = grid.bitmap if bitmap is None else bitmap
+    if bitmap == grid.bitmap:
+        size = (grid.width * grid.height + 7) // 8 if bitmap else grid.width * grid.height
+        payload = bytes(grid.data[:size])
+    elif bitmap:
+        payload = bytearray((grid.width * grid.height + 7) // 8)
+        for index, cell in enumerate(grid.data[:grid.width * grid.height]):
+            if cell: payload[index >> 3] |= 1 << (index & 7)
+    else:
+        payload = bytearray(grid.width * grid.height)
+        for index in range(grid.width * grid.height):
+            payload[index] = (grid.data[index >> 3] >> (index & 7)) & 1
+    encoding = CODIFICACAO_BITMAP if bitmap else CODIFICACAO_UINT8
+    with open(path, "wb") as file:
+        file.write(FORMATO_CABECALHO.pack(ASSINATURA, VERSAO_FORMATO, encoding, 0, grid.width, grid.height))
+        file.write(payload)
+
+
+def load_grid(path):
+    """Carrega um grid de arquivo, detectando o formato (binário ou texto) pela assinatura"""
+    with open(path, "rb") as file:
+        magic = file.read(len(ASSINATURA))
+    if magic == ASSINATURA:
+        return load_binary_grid(path)
+    return load_text_grid(path)
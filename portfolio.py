@@ -0,0 +1,224 @@
+import argparse
+import multiprocessing
+import sys
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from problem_model import ProblemModel
+from search_algorithms import ALGORITMOS, ALGORITMOS_COM_LIMITE, SearchAlgorithms
+from search_stats import SearchCancelled, SearchControl, SearchStats, SearchTimeout
+
+# Resultado de um algoritmo do portfólio: caminho e custo (None sem caminho), tempo da busca (s),
+# expansões e situação: "ok" (terminou), "tempo esgotado" ou "cancelado"
+PortfolioEntry = namedtuple("PortfolioEntry", ("algorithm", "path", "cost", "elapsed", "expansions", "status"))
+
+# Estado de cada processo trabalhador, criado uma única vez por _inicializar_trabalhador
+_buscas_trabalhador = None
+# Número da última execução cancelada, compartilhado com o processo principal
+_cancelamento_trabalhador = None
+
+def _inicializar_trabalhador(grid, prioridade, compact, cancelamento):
+    """
+    Monta o modelo do problema no processo trabalhador a partir do grid enviado na criação do
+    pool. A tabela de sucessores e as regiões conexas ficam prontas aqui, fora do tempo medido.
+    """
+    global _buscas_trabalhador, _cancelamento_trabalhador
+    problem_model = ProblemModel(grid)
+    problem_model.set_expansion_priority(prioridade)
+    if compact:
+        problem_model.build_successor_table()
+    problem_model.build_components()
+    _buscas_trabalhador = SearchAlgorithms(problem_model, compact=compact, stats=SearchStats())
+    _cancelamento_trabalhador = cancelamento
+
+
+class _ControleExecucao(SearchControl):
+    """SearchControl que também interrompe a busca quando o portfólio cancela a sua execução."""
+    def __init__(self, execucao, timeout=None):
+        super().__init__(timeout)
+        self.execucao = execucao
+
+    def check(self):
+        if _cancelamento_trabalhador.value >= self.execucao:
+            raise SearchCancelled("Execução cancelada pelo portfólio")
+        super().check()
+
+
+def _executar_algoritmo(execucao, algoritmo, prioridade, inicio, fim, limite, tempo_limite):
+    """Executa um algoritmo do portfólio no processo trabalhador e retorna a sua PortfolioEntry."""
+    buscas = _buscas_trabalhador
+    problem_model = buscas.problem_model
+    if list(problem_model.expansion_priority) != prioridade:
+        problem_model.set_expansion_priority(prioridade)
+    if _cancelamento_trabalhador.value >= execucao:
+        return PortfolioEntry(algoritmo, None, None, 0.0, 0, "cancelado")
+    controle = _ControleExecucao(execucao, tempo_limite)
+    controle.start()
+    buscas.hooks = controle
+    caminho = custo = None
+    situacao = "ok"
+    try:
+        caminho, custo = buscas.buscar(algoritmo, inicio, fim, limite)
+    except SearchTimeout:
+        situacao = "tempo esgotado"
+    except SearchCancelled:
+        situacao = "cancelado"
+    finally:
+        buscas.hooks = None
+    return PortfolioEntry(algoritmo, caminho, custo, buscas.stats.elapsed, buscas.stats.nodes_expanded, situacao)
+
+
+def caminho_encontrado(entrada):
+    """Critério padrão da corrida: aceita o primeiro algoritmo que encontrar um caminho."""
+    return entrada.path is not None
+
+
+class SearchPortfolio:
+    """
+    Portfólio de algoritmos: executa vários métodos de SearchAlgorithms sobre a mesma consulta,
+    cada um num processo de um pool. Como em BatchSearch, o grid é enviado a cada trabalhador
+    uma única vez e o pool é recriado se o grid mudar.
+
+    Dois modos: comparar() espera todos e retorna uma linha por algoritmo; corrida() retorna o
+    primeiro resultado aceito e cancela os demais. O cancelamento é cooperativo: cada execução
+    tem um número, e os trabalhadores param (a cada poucas expansões) quando ele é cancelado.
+
+    Por padrão há um processo por algoritmo, para que todos disputem a corrida desde o início.
+    Com menos CPUs que processos, os tempos de comparar() incluem a divisão das CPUs; passe
+    `max_workers` = os.cpu_count() para medi-los sem essa concorrência.
+    """
+    def __init__(self, problem_model: ProblemModel, max_workers=None, compact=False):
+        self.problem_model = problem_model
+        self.max_workers = max_workers or len(ALGORITMOS)
+        self.compact = compact
+        self._pool = None
+        self._versao_grid = None
+        self._cancelamento = None
+        self._execucao = 0
+
+    def _obter_pool(self):
+        """Cria o pool na primeira chamada e o recria se o grid mudou desde então."""
+        grid = self.problem_model.grid
+        if self._pool is not None and self._versao_grid != (id(grid), grid.version):
+            self.close()
+        if self._pool is None:
+            prioridade = list(self.problem_model.expansion_priority)
+            self._cancelamento = multiprocessing.Value("q", 0)
+            self._execucao = 0
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_inicializar_trabalhador,
+                                             initargs=(grid, prioridade, self.compact, self._cancelamento))
+            self._versao_grid = (id(grid), grid.version)
+        return self._pool
+
+    def _submeter(self, inicio, fim, algoritmos, limite, tempo_limite):
+        """Valida a consulta e envia um algoritmo por tarefa; retorna os futuros na ordem de `algoritmos`."""
+        algoritmos = list(algoritmos)
+        for algoritmo in algoritmos:
+            if algoritmo not in ALGORITMOS:
+                raise ValueError(f"Algoritmo de busca desconhecido: {algoritmo}")
+            if algoritmo in ALGORITMOS_COM_LIMITE and limite is None:
+                raise ValueError(f"O algoritmo {algoritmo} exige um limite")
+        self.problem_model.check_state(inicio)
+        self.problem_model.check_state(fim)
+        pool = self._obter_pool()
+        self._execucao += 1
+        prioridade = list(self.problem_model.expansion_priority)
+        return [pool.submit(_executar_algoritmo, self._execucao, algoritmo, prioridade, inicio, fim,
+                            limite if algoritmo in ALGORITMOS_COM_LIMITE else None, tempo_limite)
+                for algoritmo in algoritmos]
+
+    def cancelar(self):
+        """Cancela a execução em andamento; os algoritmos ainda não terminados saem como "cancelado"."""
+        if self._cancelamento is not None:
+            with self._cancelamento.get_lock():
+                self._cancelamento.value = max(self._cancelamento.value, self._execucao)
+
+    def comparar(self, inicio, fim, algoritmos=ALGORITMOS, limite=None, tempo_limite=None):
+        """
+        Executa todos os `algoritmos` sobre a consulta e retorna uma PortfolioEntry por algoritmo,
+        na ordem dada. `tempo_limite` (s) vale para cada algoritmo, contado do início da sua busca.
+        """
+        futuros = self._submeter(inicio, fim, algoritmos, limite, tempo_limite)
+        try:
+            return [futuro.result() for futuro in futuros]
+        except BaseException:
+            self.cancelar()
+            raise
+
+    def corrida(self, inicio, fim, algoritmos=ALGORITMOS, limite=None, tempo_limite=None, aceitar=caminho_encontrado):
+        """
+        Executa os `algoritmos` ao mesmo tempo e retorna a PortfolioEntry do primeiro resultado
+        aceito por `aceitar` (por padrão, o primeiro caminho encontrado), cancelando os demais.
+        Retorna None se todos terminarem sem um resultado aceito.
+        """
+        futuros = self._submeter(inicio, fim, algoritmos, limite, tempo_limite)
+        pendentes = set(futuros)
+        try:
+            while pendentes:
+                prontos, pendentes = wait(pendentes, return_when=FIRST_COMPLETED)
+                # Entre os que terminaram juntos, vale a ordem de `algoritmos`
+                for futuro in sorted(prontos, key=futuros.index):
+                    entrada = futuro.result()
+                    if entrada.status == "ok" and aceitar(entrada):
+                        return entrada
+            return None
+        finally:
+            if pendentes:
+                self.cancelar()
+                for futuro in pendentes:
+                    futuro.cancel()
+
+    def close(self):
+        """Cancela o que estiver em andamento e encerra os processos trabalhadores."""
+        if self._pool is not None:
+            self.cancelar()
+            self._pool.shutdown(cancel_futures=True)
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def formatar_tabela(entradas):
+    """Formata as PortfolioEntry como uma tabela de texto, uma linha por algoritmo."""
+    linhas = [f"{'algoritmo':24} {'custo':>8} {'passos':>7} {'tempo_ms':>10} {'expansões':>10}  situação"]
+    for entrada in entradas:
+        custo = f"{entrada.cost:.2f}" if entrada.path is not None else "-"
+        passos = len(entrada.path) - 1 if entrada.path is not None else "-"
+        linhas.append(f"{entrada.algorithm:24} {custo:>8} {passos:>7} {entrada.elapsed * 1000:>10.1f} "
+                      f"{entrada.expansions:>10}  {entrada.status}")
+    return "\n".join(linhas)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compara (ou põe para competir) vários algoritmos numa consulta.")
+    parser.add_argument("mapa")
+    parser.add_argument("--inicio", nargs=3, metavar=("X", "Y", "ORIENTACAO"), required=True)
+    parser.add_argument("--fim", nargs=3, metavar=("X", "Y", "ORIENTACAO"), required=True)
+    parser.add_argument("--algoritmos", nargs="+", choices=ALGORITMOS, default=list(ALGORITMOS))
+    parser.add_argument("--corrida", action="store_true", help="retorna o primeiro caminho encontrado e cancela o resto")
+    parser.add_argument("--limite", type=int, default=60, help="limite para prof_limitada e aprof_iterativo")
+    parser.add_argument("--tempo-limite", type=float, help="tempo limite (s) de cada algoritmo")
+    parser.add_argument("--processos", type=int, help="processos trabalhadores (padrão: um por algoritmo)")
+    parser.add_argument("--compact", action="store_true", help="usa o modo de estados compactos")
+    args = parser.parse_args(argv)
+
+    problem_model = ProblemModel.from_file(args.mapa)
+    inicio = ((int(args.inicio[0]), int(args.inicio[1])), args.inicio[2])
+    fim = ((int(args.fim[0]), int(args.fim[1])), args.fim[2])
+    with SearchPortfolio(problem_model, max_workers=args.processos, compact=args.compact) as portfolio:
+        if args.corrida:
+            vencedor = portfolio.corrida(inicio, fim, args.algoritmos, args.limite, args.tempo_limite)
+            if vencedor is None:
+                print("Nenhum algoritmo encontrou um caminho.")
+                return 1
+            print(formatar_tabela([vencedor]))
+            return 0
+        print(formatar_tabela(portfolio.comparar(inicio, fim, args.algoritmos, args.limite, args.tempo_limite)))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
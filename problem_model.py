@@ -1,103 +1,461 @@
-import math
-import random
-
-class ProblemModel:
-    def __init__(self):
-        self.obstacles, self.grid_width, self.grid_height = self._create_static_grid()
-        self.orientations = ["Norte", "Leste", "Sul", "Oeste"]
-        self.expansion_priority = {orientation: i for i, orientation in enumerate(self.orientations)}
-
-    def _create_static_grid(self):
-        """
-        Cria um grid estático de 15x15 para o mapa da fábrica
-        '9' representa um obstáculo
-        """
-        grid = [
-            [0,0,0,9,9,0,0,0,9,0,0,0,0,9,0],
-            [0,9,0,0,0,0,9,0,0,9,0,0,0,0,0],
-            [0,0,0,9,0,0,9,9,0,0,0,9,0,0,9],
-            [9,0,9,0,0,9,0,0,0,9,0,0,9,0,0],
-            [0,0,0,0,9,0,0,9,0,0,9,0,0,9,0],
-            [0,9,9,0,0,0,0,9,0,0,0,0,0,0,0],
-            [0,0,0,0,9,9,0,0,0,9,9,0,9,0,0],
-            [9,0,9,0,0,0,0,9,0,0,0,0,0,0,9],
-            [0,0,0,0,9,0,0,9,0,0,9,0,0,0,0],
-            [0,9,0,0,0,0,9,0,0,0,0,9,0,0,0],
-            [0,0,9,0,9,0,0,0,9,9,0,0,0,9,0],
-            [9,0,0,0,0,9,9,0,0,0,0,9,0,0,0],
-            [0,0,9,9,0,0,0,9,0,9,0,0,9,9,0],
-            [0,9,0,0,9,0,0,0,0,0,9,0,0,0,0],
-            [0,0,0,0,0,9,0,9,0,0,0,9,9,0,0]
-        ]
-
-        obstacles = set()
-        grid_height = len(grid)
-        grid_width = len(grid[0]) if grid_height > 0 else 0
-
-        for y, row in enumerate(grid):
-            for x, cell in enumerate(row):
-                if cell == 9:
-                    obstacles.add((x, y))
-        
-        return obstacles, grid_width, grid_height
-
-    def is_valid_state(self, x, y):
-        """Verifica se um estado (x, y) é válido (dentro do grid e não é um obstáculo)"""
-        return 0 <= x < self.grid_width and 0 <= y < self.grid_height and (x, y) not in self.obstacles
-
-    def get_all_states(self):
-        """Retorna uma lista de todos os estados possíveis no grid"""
-        states = []
-        for y in range(self.grid_height):
-            for x in range(self.grid_width):
-                if self.is_valid_state(x, y):
-                    for orientation in self.orientations:
-                        states.append(((x, y), orientation))
-        return states
-
-    def set_expansion_priority(self, priority_list):
-        """Define a prioridade de expansão com base em uma lista de orientações"""
-        self.expansion_priority = {item: i for i, item in enumerate(priority_list)}
-
-    def get_successors(self, state):
-        """Gera os sucessores válidos a partir de um estado, com base nas ações possíveis"""
-        (x, y), orientation = state
-        potential_successors = []
-
-        # Mover para frente
-        next_x, next_y = x, y
-        if orientation == "Norte": next_y -= 1
-        elif orientation == "Leste": next_x += 1
-        elif orientation == "Sul": next_y += 1
-        elif orientation == "Oeste": next_x -= 1
-
-        if self.is_valid_state(next_x, next_y):
-            potential_successors.append((((next_x, next_y), orientation), 1.0, "mover_frente"))
-
-        # Virar à direita
-        current_orientation_index = self.orientations.index(orientation)
-        new_orientation_index_right = (current_orientation_index + 1) % 4
-        new_orientation_right = self.orientations[new_orientation_index_right]
-        potential_successors.append((((x, y), new_orientation_right), 0.5, "virar_direita"))
-
-        # Virar à esquerda
-        new_orientation_index_left = (current_orientation_index - 1 + 4) % 4
-        new_orientation_left = self.orientations[new_orientation_index_left]
-        potential_successors.append((((x, y), new_orientation_left), 0.5, "virar_esquerda"))
-        
-        # Ordena os sucessores com base na prioridade de expansão
-        sorted_successors = sorted(potential_successors, key=lambda s: self.expansion_priority.get(s[0][1], 999))
-        
-        return sorted_successors
-
-    def get_cost(self, state1, action, state2):
-        """Retorna o custo de uma ação"""
-        if "mover_frente" in action: return 1.0
-        elif "virar_direita" in action or "virar_esquerda" in action: return 1.5
-        return float("inf")
-
-    def heuristic(self, state, goal_state):
-        """Calcula a heurística da Distância de Manhattan"""
-        (x1, y1), _ = state
-        (x2, y2), _ = goal_state
-        return abs(x1 - x2) + abs(y1 - y2)
\ No newline at end of file
+import math
+import random
+from array import array
+from collections import deque
+from occupancy_grid import ObstacleView, OccupancyGrid, load_grid
+
+# Deslocamento (dx, dy) do movimento para frente em cada orientação, na ordem de ProblemModel.orientations
+DESLOCAMENTOS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+# Ações possíveis e seus custos, na ordem em que get_successors as gera
+ACOES = ("mover_frente", "virar_direita", "virar_esquerda")
+CUSTOS_ACOES = (1.0, 0.5, 0.5)
+
+class ProblemModel:
+    def __init__(self, grid=None):
+        # Sem um grid carregado de arquivo, usa o mapa estático padrão da fábrica
+        self.grid = grid if grid is not None else self._create_static_grid()
+        self.grid_width, self.grid_height = self.grid.width, self.grid.height
+        self.obstacles = ObstacleView(self.grid)
+        self.orientations = ["Norte", "Leste", "Sul", "Oeste"]
+        self.orientation_index = {orientation: i for i, orientation in enumerate(self.orientations)}
+        self.expansion_priority = {orientation: i for i, orientation in enumerate(self.orientations)}
+        # Tabela de sucessores do modo compacto (construída sob demanda por build_successor_table)
+        self._successor_ids = None
+        self._successor_actions = None
+        self._successor_orders = None
+        self._successor_version = None
+        # Regiões conexas das células livres (construídas sob demanda por build_components):
+        # rótulo de cada célula (-1 se bloqueada) e union-find entre rótulos
+        self._components = None
+        self._component_parent = None
+        self._component_version = None
+        # Heurística de marcos opcional (ver landmarks.LandmarkHeuristic e use_landmarks)
+        self.landmarks = None
+        # Incrementada sempre que a heurística muda, para quem guarda resultados (ver RouteCache)
+        self.heuristic_version = 0
+
+    @classmethod
+    def from_file(cls, path):
+        """Cria o modelo a partir de um mapa em disco (texto 0/9 ou binário, ver occupancy_grid)"""
+        return cls(load_grid(path))
+
+    def _create_static_grid(self):
+        """
+        Cria um grid estático de 15x15 para o mapa da fábrica
+        '9' representa um obstáculo
+        """
+        grid = [
+            [0,0,0,9,9,0,0,0,9,0,0,0,0,9,0],
+            [0,9,0,0,0,0,9,0,0,9,0,0,0,0,0],
+            [0,0,0,9,0,0,9,9,0,0,0,9,0,0,9],
+            [9,0,9,0,0,9,0,0,0,9,0,0,9,0,0],
+            [0,0,0,0,9,0,0,9,0,0,9,0,0,9,0],
+            [0,9,9,0,0,0,0,9,0,0,0,0,0,0,0],
+            [0,0,0,0,9,9,0,0,0,9,9,0,9,0,0],
+            [9,0,9,0,0,0,0,9,0,0,0,0,0,0,9],
+            [0,0,0,0,9,0,0,9,0,0,9,0,0,0,0],
+            [0,9,0,0,0,0,9,0,0,0,0,9,0,0,0],
+            [0,0,9,0,9,0,0,0,9,9,0,0,0,9,0],
+            [9,0,0,0,0,9,9,0,0,0,0,9,0,0,0],
+            [0,0,9,9,0,0,0,9,0,9,0,0,9,9,0],
+            [0,9,0,0,9,0,0,0,0,0,9,0,0,0,0],
+            [0,0,0,0,0,9,0,9,0,0,0,9,9,0,0]
+        ]
+
+        return OccupancyGrid.from_rows(grid)
+
+    def is_valid_state(self, x, y):
+        """Verifica se um estado (x, y) é válido (dentro do grid e não é um obstáculo)"""
+        return self.grid.is_free(x, y)
+
+    def check_state(self, state):
+        """Levanta ValueError se o estado não for ((x, y), orientação) com a célula dentro do grid"""
+        (x, y), orientation = state
+        if orientation not in self.orientation_index:
+            raise ValueError(f"Orientação desconhecida: {orientation}")
+        if not (0 <= x < self.grid_width and 0 <= y < self.grid_height):
+            raise ValueError(f"Estado ({x}, {y}) fora do grid")
+
+    def add_obstacles(self, cells):
+        """Bloqueia as células (x, y) informadas e retorna a lista das que de fato mudaram"""
+        return self._edit_cells(cells, True)
+
+    def remove_obstacles(self, cells):
+        """Libera as células (x, y) informadas e retorna a lista das que de fato mudaram"""
+        return self._edit_cells(cells, False)
+
+    def _edit_cells(self, cells, blocked):
+        """
+        Altera as células e, se a tabela de sucessores e as regiões conexas estavam atualizadas,
+        corrige só as entradas afetadas
+        """
+        table_current = self._successor_ids is not None and self._successor_version == self.grid.version
+        components_current = self._components is not None and self._component_version == self.grid.version
+        changed = []
+        for x, y in cells:
+            if not self.grid.set_blocked(x, y, blocked): continue
+            changed.append((x, y))
+            # As regiões são corrigidas célula a célula, cada uma sobre o grid já com as anteriores
+            if components_current:
+                if blocked:
+                    self._split_component(x, y)
+                else:
+                    self._merge_component(x, y)
+        if table_current:
+            self._patch_successor_table(changed)
+        if components_current:
+            self._component_version = self.grid.version
+        return changed
+
+    def get_all_states(self):
+        """Retorna uma lista de todos os estados possíveis no grid"""
+        states = []
+        for y in range(self.grid_height):
+            for x in range(self.grid_width):
+                if self.is_valid_state(x, y):
+                    for orientation in self.orientations:
+                        states.append(((x, y), orientation))
+        return states
+
+    def set_expansion_priority(self, priority_list):
+        """Define a prioridade de expansão com base em uma lista de orientações"""
+        self.expansion_priority = {item: i for i, item in enumerate(priority_list)}
+        # A ordem dos sucessores mudou: a tabela do modo compacto precisa ser refeita
+        self._successor_ids = None
+
+    def get_successors(self, state):
+        """Gera os sucessores válidos a partir de um estado, com base nas ações possíveis"""
+        (x, y), orientation = state
+        potential_successors = []
+
+        # Mover para frente
+        next_x, next_y = x, y
+        if orientation == "Norte": next_y -= 1
+        elif orientation == "Leste": next_x += 1
+        elif orientation == "Sul": next_y += 1
+        elif orientation == "Oeste": next_x -= 1
+
+        if self.is_valid_state(next_x, next_y):
+            potential_successors.append((((next_x, next_y), orientation), 1.0, "mover_frente"))
+
+        # Virar à direita
+        current_orientation_index = self.orientations.index(orientation)
+        new_orientation_index_right = (current_orientation_index + 1) % 4
+        new_orientation_right = self.orientations[new_orientation_index_right]
+        potential_successors.append((((x, y), new_orientation_right), 0.5, "virar_direita"))
+
+        # Virar à esquerda
+        new_orientation_index_left = (current_orientation_index - 1 + 4) % 4
+        new_orientation_left = self.orientations[new_orientation_index_left]
+        potential_successors.append((((x, y), new_orientation_left), 0.5, "virar_esquerda"))
+        
+        # Ordena os sucessores com base na prioridade de expansão
+        sorted_successors = sorted(potential_successors, key=lambda s: self.expansion_priority.get(s[0][1], 999))
+        
+        return sorted_successors
+
+    def get_predecessors(self, state):
+        """Gera os estados a partir dos quais uma única ação leva a `state` (sucessores reversos)"""
+        (x, y), orientation = state
+        if not self.is_valid_state(x, y): return []
+        o = self.orientation_index[orientation]
+        predecessors = []
+
+        # Mover para frente a partir da célula de trás, com a mesma orientação
+        dx, dy = DESLOCAMENTOS[o]
+        if self.is_valid_state(x - dx, y - dy):
+            predecessors.append((((x - dx, y - dy), orientation), 1.0, "mover_frente"))
+
+        # Virar à direita a partir da orientação anterior e à esquerda a partir da seguinte
+        predecessors.append((((x, y), self.orientations[(o - 1 + 4) % 4]), 0.5, "virar_direita"))
+        predecessors.append((((x, y), self.orientations[(o + 1) % 4]), 0.5, "virar_esquerda"))
+        return predecessors
+
+    def get_predecessors_compact(self, state_id):
+        """Equivalente a get_predecessors para estados codificados"""
+        cell, o = divmod(state_id, 4)
+        y, x = divmod(cell, self.grid_width)
+        if not self.is_valid_state(x, y): return []
+        predecessors = []
+        dx, dy = DESLOCAMENTOS[o]
+        if self.is_valid_state(x - dx, y - dy):
+            predecessors.append((state_id - (dx + dy * self.grid_width) * 4, 1.0, "mover_frente"))
+        predecessors.append((cell * 4 + (o - 1 + 4) % 4, 0.5, "virar_direita"))
+        predecessors.append((cell * 4 + (o + 1) % 4, 0.5, "virar_esquerda"))
+        return predecessors
+
+    def encode_state(self, state):
+        """Codifica um estado ((x, y), orientação) como um inteiro: índice da célula * 4 + orientação"""
+        if isinstance(state, int): return state
+        (x, y), orientation = state
+        return (y * self.grid_width + x) * 4 + self.orientation_index[orientation]
+
+    def decode_state(self, state_id):
+        """Converte um estado codificado de volta para a forma ((x, y), orientação)"""
+        cell, orientation = divmod(state_id, 4)
+        y, x = divmod(cell, self.grid_width)
+        return ((x, y), self.orientations[orientation])
+
+    def build_successor_table(self):
+        """
+        Constrói a tabela de sucessores do modo compacto, se ainda não existir.
+        Cada estado codificado s ocupa as posições 3*s .. 3*s+2 de dois arrays planos
+        (sucessor e ação), já na ordem da prioridade de expansão; -1 marca ausência.
+        O custo vem da ação (CUSTOS_ACOES) e não é guardado.
+        Células bloqueadas também têm sucessores, como em get_successors, para que uma busca
+        iniciada sobre um obstáculo se comporte igual nos dois modos.
+        """
+        if self._successor_ids is not None and self._successor_version == self.grid.version: return
+
+        num_states = self.grid_width * self.grid_height * 4
+        self._successor_ids = array("i", [-1]) * (num_states * 3)
+        self._successor_actions = array("b", [-1]) * (num_states * 3)
+        self._successor_orders = self._successor_order_permutations()
+
+        for y in range(self.grid_height):
+            for x in range(self.grid_width):
+                self._fill_successors(x, y)
+        self._successor_version = self.grid.version
+
+    def _successor_order_permutations(self):
+        """A ordem dos sucessores depende apenas da orientação atual: calcula uma permutação por orientação"""
+        orders = []
+        for o in range(4):
+            orientations = (o, (o + 1) % 4, (o - 1 + 4) % 4)
+            orders.append(sorted(range(3), key=lambda k: self.expansion_priority.get(self.orientations[orientations[k]], 999)))
+        return orders
+
+    def use_successor_table(self, ids, actions):
+        """
+        Adota uma tabela de sucessores pronta (por exemplo, mapeada de um arquivo por artifacts),
+        que deve ter sido construída para o grid e a prioridade de expansão atuais.
+        Os buffers precisam ser graváveis, pois add_obstacles/remove_obstacles os atualizam.
+        """
+        num_entries = self.grid_width * self.grid_height * 4 * 3
+        if len(ids) != num_entries or len(actions) != num_entries:
+            raise ValueError(f"Tabela de sucessores com {len(ids)} entradas, esperado {num_entries}")
+        self._successor_ids = ids
+        self._successor_actions = actions
+        self._successor_orders = self._successor_order_permutations()
+        self._successor_version = self.grid.version
+
+    def _fill_successors(self, x, y):
+        """Preenche as entradas da tabela de sucessores para os quatro estados da célula (x, y)"""
+        ids, actions, orders = self._successor_ids, self._successor_actions, self._successor_orders
+        cell = (y * self.grid_width + x) * 4
+        for o in range(4):
+            dx, dy = DESLOCAMENTOS[o]
+            forward = (cell + (dx + dy * self.grid_width) * 4 + o) if self.is_valid_state(x + dx, y + dy) else -1
+            candidates = (forward, cell + (o + 1) % 4, cell + (o - 1 + 4) % 4)
+            slot = (cell + o) * 3
+            ids[slot + 2] = -1
+            for k in orders[o]:
+                if candidates[k] < 0: continue
+                ids[slot] = candidates[k]
+                actions[slot] = k
+                slot += 1
+
+    def _patch_successor_table(self, cells):
+        """
+        Atualiza a tabela após a alteração das células (x, y): refaz cada célula alterada e as
+        quatro vizinhas, as únicas com um movimento para frente que entra nela.
+        """
+        for x, y in cells:
+            for cx, cy in ((x, y), (x, y + 1), (x - 1, y), (x, y - 1), (x + 1, y)):
+                if 0 <= cx < self.grid_width and 0 <= cy < self.grid_height:
+                    self._fill_successors(cx, cy)
+        self._successor_version = self.grid.version
+
+    def get_successors_compact(self, state_id):
+        """Equivalente a get_successors para estados codificados, lido da tabela pré-calculada"""
+        ids, actions = self._successor_ids, self._successor_actions
+        k = state_id * 3
+        a0, a1 = actions[k], actions[k + 1]
+        # Todo estado tem as duas rotações; só o movimento para frente pode faltar
+        if ids[k + 2] >= 0:
+            a2 = actions[k + 2]
+            return [(ids[k], CUSTOS_ACOES[a0], ACOES[a0]), (ids[k + 1], CUSTOS_ACOES[a1], ACOES[a1]),
+                    (ids[k + 2], CUSTOS_ACOES[a2], ACOES[a2])]
+        if ids[k] < 0: return []
+        return [(ids[k], CUSTOS_ACOES[a0], ACOES[a0]), (ids[k + 1], CUSTOS_ACOES[a1], ACOES[a1])]
+
+    def build_components(self):
+        """
+        Rotula as regiões conexas (vizinhança 4) das células livres, se ainda não estiverem
+        atualizadas. Como o veículo sempre pode virar no lugar, dois estados em células livres
+        da mesma região alcançam um ao outro em qualquer orientação.
+        """
+        if self._components is not None and self._component_version == self.grid.version: return
+
+        width, height = self.grid_width, self.grid_height
+        labels = array("i", [-1]) * (width * height)
+        parent = []
+        for cell in range(width * height):
+            y, x = divmod(cell, width)
+            if labels[cell] == -1 and self.is_valid_state(x, y):
+                labels[cell] = len(parent)
+                self._flood_component(cell, labels, len(parent))
+                parent.append(len(parent))
+        self._components = labels
+        self._component_parent = parent
+        self._component_version = self.grid.version
+
+    def _free_neighbors(self, cell):
+        """Índices das células livres vizinhas (vizinhança 4) de um índice de célula"""
+        y, x = divmod(cell, self.grid_width)
+        return [ny * self.grid_width + nx for nx, ny in ((x + 1, y), (x - 1, y), (x, y + 1), (x, y - 1))
+                if self.is_valid_state(nx, ny)]
+
+    def _flood_component(self, cell, labels, label):
+        """Marca com `label` as células livres ligadas a `cell` (busca em largura)"""
+        queue = deque([cell])
+        while queue:
+            for neighbor in self._free_neighbors(queue.popleft()):
+                if labels[neighbor] != label:
+                    labels[neighbor] = label
+                    queue.append(neighbor)
+
+    def _find_component(self, label):
+        """Raiz do rótulo no union-find das regiões (com compressão de caminho)"""
+        parent = self._component_parent
+        while parent[label] != label:
+            parent[label] = parent[parent[label]]
+            label = parent[label]
+        return label
+
+    def _merge_component(self, x, y):
+        """Célula (x, y) liberada: ganha um rótulo novo, unido às regiões vizinhas"""
+        labels, parent = self._components, self._component_parent
+        cell = y * self.grid_width + x
+        root = labels[cell] = len(parent)
+        parent.append(root)
+        for neighbor in self._free_neighbors(cell):
+            other = self._find_component(labels[neighbor])
+            if other != root:
+                parent[other] = root
+
+    def _split_component(self, x, y):
+        """
+        Célula (x, y) bloqueada: a região só pode se partir se os vizinhos livres deixarem de
+        estar ligados pelo anel de 8 células ao redor. Nesse caso, uma busca em largura por
+        vizinho avança em paralelo; as que se encontram se juntam, e a que se esgota sozinha
+        é uma região separada, que recebe um rótulo novo. O custo fica limitado pelas partes
+        menores, não pela região inteira.
+        """
+        cell = y * self.grid_width + x
+        self._components[cell] = -1
+        seeds = self._free_neighbors(cell)
+        if len(seeds) > 1 and not self._ring_connected(x, y):
+            self._separate(seeds)
+
+    def _ring_connected(self, x, y):
+        """Indica se os vizinhos livres de (x, y) se ligam pelas células livres do anel ao seu redor"""
+        ring = ((1, 0), (1, 1), (0, 1), (-1, 1), (-1, 0), (-1, -1), (0, -1), (1, -1))
+        free = [self.is_valid_state(x + dx, y + dy) for dx, dy in ring]
+        if all(free): return True
+        # Percorre o anel a partir de uma célula bloqueada: cada trecho livre contínuo liga os
+        # vizinhos laterais que contém
+        start = free.index(False)
+        runs = 0
+        inside = False
+        for i in range(1, 9):
+            k = (start + i) % 8
+            if free[k] and k % 2 == 0 and not inside:
+                runs += 1
+                inside = True
+            elif not free[k]:
+                inside = False
+        return runs <= 1
+
+    def _separate(self, seeds):
+        """Buscas em largura paralelas a partir de `seeds` (ver _split_component)"""
+        labels, parent = self._components, self._component_parent
+        groups = list(range(len(seeds)))
+        owner = {seed: i for i, seed in enumerate(seeds)}
+        queues = {i: deque([seed]) for i, seed in enumerate(seeds)}
+
+        def find(i):
+            while groups[i] != i:
+                i = groups[i]
+            return i
+
+        while len(queues) > 1:
+            for i in list(queues):
+                queue = queues.get(i)
+                if queue is None or len(queues) == 1: continue
+                if not queue:
+                    # Parte isolada: recebe um rótulo novo
+                    label = len(parent)
+                    parent.append(label)
+                    for cell, j in owner.items():
+                        if find(j) == i:
+                            labels[cell] = label
+                    del queues[i]
+                    continue
+                for neighbor in self._free_neighbors(queue.popleft()):
+                    j = owner.get(neighbor)
+                    if j is None:
+                        owner[neighbor] = i
+                        queue.append(neighbor)
+                    else:
+                        j = find(j)
+                        if j != i:
+                            groups[j] = i
+                            queue.extend(queues.pop(j))
+
+    def _cell_of(self, state):
+        """Índice da célula de um estado ((x, y), orientação) ou codificado"""
+        if isinstance(state, int): return state >> 2
+        (x, y), _ = state
+        return y * self.grid_width + x
+
+    def is_reachable(self, start, goal):
+        """
+        Consulta as regiões conexas (construídas ou corrigidas sob demanda) e indica, em O(1),
+        se existe caminho de `start` até `goal`, estados ((x, y), orientação) ou codificados.
+        Um início sobre um obstáculo ainda pode virar e sair para uma célula livre vizinha,
+        como em get_successors; um objetivo sobre um obstáculo só é alcançável a partir da
+        própria célula.
+        """
+        if start == goal: return True
+        start_cell, goal_cell = self._cell_of(start), self._cell_of(goal)
+        if start_cell == goal_cell: return True
+        self.build_components()
+        labels = self._components
+        if labels[goal_cell] == -1: return False
+        target = self._find_component(labels[goal_cell])
+        if labels[start_cell] != -1:
+            return self._find_component(labels[start_cell]) == target
+        return any(self._find_component(labels[cell]) == target for cell in self._free_neighbors(start_cell))
+
+    def get_cost(self, state1, action, state2):
+        """Retorna o custo de uma ação"""
+        if "mover_frente" in action: return 1.0
+        elif "virar_direita" in action or "virar_esquerda" in action: return 1.5
+        return float("inf")
+
+    def use_landmarks(self, landmarks):
+        """
+        Ativa (ou desativa, com None) uma heurística de marcos pré-calculada. Enquanto o grid
+        não mudar, heuristic passa a retornar o maior entre Manhattan e o limite dos marcos.
+        """
+        self.landmarks = landmarks
+        self.heuristic_version += 1
+
+    def heuristic(self, state, goal_state):
+        """Calcula a heurística da Distância de Manhattan"""
+        (x1, y1), _ = state
+        (x2, y2), _ = goal_state
+        manhattan = abs(x1 - x2) + abs(y1 - y2)
+        if self.landmarks is not None and self.landmarks.is_current():
+            return max(manhattan, self.landmarks.bound(self.encode_state(state), self.encode_state(goal_state)))
+        return manhattan
+
+    def heuristic_compact(self, state_id, goal_id):
+        """Distância de Manhattan entre estados codificados"""
+        y1, x1 = divmod(state_id >> 2, self.grid_width)
+        y2, x2 = divmod(goal_id >> 2, self.grid_width)
+        manhattan = abs(x1 - x2) + abs(y1 - y2)
+        if self.landmarks is not None and self.landmarks.is_current():
+            return max(manhattan, self.landmarks.bound(state_id, goal_id))
+        return manhattan
\ No newline at end of file
@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from search_algorithms import ALGORITMOS, ALGORITMOS_COM_LIMITE, SearchAlgorithms
+
+class RouteCache:
+    """
+    Cache LRU de rotas na frente de SearchAlgorithms
+
+    A chave inclui início, objetivo, algoritmo, limite e a prioridade de expansão atual,
+    pois a prioridade muda o caminho retornado por buscas como amplitude e profundidade.
+    Todas as entradas são descartadas quando o grid do modelo é alterado ou substituído, ou
+    quando a heurística muda (use_landmarks), pois greedy e a_estrela dependem dela.
+
+    Atributos:
+        search_algorithms (SearchAlgorithms): Buscas usadas quando a rota não está no cache
+        maxsize (int): Número máximo de rotas guardadas
+        hits (int): Consultas respondidas pelo cache
+        misses (int): Consultas que precisaram executar a busca
+        evictions (int): Entradas removidas por falta de espaço
+        invalidations (int): Vezes em que o cache foi esvaziado por alteração do grid ou da heurística
+    """
+    def __init__(self, search_algorithms: SearchAlgorithms, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("O tamanho do cache deve ser positivo")
+        self.search_algorithms = search_algorithms
+        self.maxsize = maxsize
+        self._entradas = OrderedDict()
+        self._versao_grid = self._versao_atual()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def _versao_atual(self):
+        problem_model = self.search_algorithms.problem_model
+        return (id(problem_model.grid), problem_model.grid.version, problem_model.heuristic_version)
+
+    def buscar(self, algoritmo, inicio, fim, limite=None):
+        """Retorna a rota (caminho, custo) do cache ou executa a busca e a guarda."""
+        versao = self._versao_atual()
+        if versao != self._versao_grid:
+            if self._entradas:
+                self.invalidations += 1
+            self._entradas.clear()
+            self._versao_grid = versao
+
+        if algoritmo not in ALGORITMOS_COM_LIMITE:
+            limite = None
+        prioridade = tuple(self.search_algorithms.problem_model.expansion_priority)
+        chave = (inicio, fim, algoritmo, limite, prioridade)
+
+        resultado = self._entradas.get(chave)
+        if resultado is not None:
+            self._entradas.move_to_end(chave)
+            self.hits += 1
+        else:
+            self.misses += 1
+            caminho, custo = self.search_algorithms.buscar(algoritmo, inicio, fim, limite)
+            resultado = (tuple(caminho) if caminho is not None else None, custo)
+            self._entradas[chave] = resultado
+            if len(self._entradas) > self.maxsize:
+                self._entradas.popitem(last=False)
+                self.evictions += 1
+
+        caminho, custo = resultado
+        return (list(caminho) if caminho is not None else None), custo
+
+    def __getattr__(self, nome):
+        # Permite usar o cache no lugar de SearchAlgorithms: cache.a_estrela(inicio, fim)
+        if nome in ALGORITMOS:
+            if nome in ALGORITMOS_COM_LIMITE:
+                return lambda inicio, fim, limite: self.buscar(nome, inicio, fim, limite)
+            return lambda inicio, fim: self.buscar(nome, inicio, fim)
+        raise AttributeError(nome)
+
+    def clear(self):
+        """Esvazia o cache sem zerar os contadores."""
+        self._entradas.clear()
+
+    def __len__(self):
+        return len(self._entradas)
+
+    def stats(self):
+        """Retorna os contadores do cache, para dimensionar maxsize."""
+        consultas = self.hits + self.misses
+        return {
+            "size": len(self._entradas),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "hit_rate": self.hits / consultas if consultas else 0.0,
+        }
@@ -0,0 +1,354 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from artifacts import PlanningArtifacts
+from problem_model import ProblemModel
+from search_algorithms import ALGORITMOS, ALGORITMOS_ANYTIME, ALGORITMOS_COM_LIMITE, SearchAlgorithms
+from search_stats import SearchControl, SearchTimeout
+
+# Estado de cada processo trabalhador, criado uma única vez por _inicializar_trabalhador
+_buscas_trabalhador = None
+# Tempo além do prazo que o serviço espera por um pedido anytime, para o trabalhador devolver o
+# melhor caminho encontrado até o prazo
+FOLGA_ANYTIME = 0.1
+
+def _inicializar_trabalhador(grid, compact, artefatos):
+    """
+    Monta o modelo do problema no processo trabalhador a partir do grid enviado na criação do
+    pool. Com `artefatos`, a tabela de sucessores é mapeada do arquivo gravado ao lado do mapa.
+    A tabela e as regiões conexas ficam prontas aqui, fora do tempo limite dos pedidos.
+    """
+    global _buscas_trabalhador
+    problem_model = ProblemModel(grid)
+    if artefatos:
+        PlanningArtifacts(problem_model).successor_table()
+    elif compact:
+        problem_model.build_successor_table()
+    problem_model.build_components()
+    _buscas_trabalhador = SearchAlgorithms(problem_model, compact=compact)
+
+def _trabalhador_pronto():
+    return True
+
+def _resolver_pedido(algoritmo, prioridade, inicio, fim, limite, prazo):
+    """
+    Resolve um pedido no processo trabalhador. `prazo` (time.time(), ou None) vale para o
+    tempo de espera na fila e para a busca; retorna None se ele se esgotar. Retorna (caminho,
+    custo, limitante), com o limite de subotimalidade dos algoritmos anytime (senão None).
+    """
+    buscas = _buscas_trabalhador
+    problem_model = buscas.problem_model
+    if list(problem_model.expansion_priority) != prioridade:
+        problem_model.set_expansion_priority(prioridade)
+    restante = None
+    if prazo is not None:
+        restante = prazo - time.time()
+        if restante <= 0:
+            return None
+    if algoritmo in ALGORITMOS_ANYTIME:
+        # No prazo, o ARA* devolve o melhor caminho que já tiver
+        resultado = getattr(buscas, algoritmo)(inicio, fim, prazo=restante)
+        if resultado.path is None and resultado.timed_out:
+            return None
+        return resultado.path, resultado.cost, resultado.bound
+    controle = None
+    if restante is not None:
+        controle = SearchControl(timeout=restante)
+        controle.start()
+    buscas.hooks = controle
+    try:
+        return (*buscas.buscar(algoritmo, inicio, fim, limite), None)
+    except SearchTimeout:
+        return None
+    finally:
+        buscas.hooks = None
+
+
+class RouteService:
+    """
+    Serviço de rotas sem interface gráfica. O ProblemModel é carregado uma vez e enviado a
+    um pool de processos, que resolve as buscas sem bloquear o laço asyncio; assim, vários
+    clientes e vários pedidos por conexão (pipelining) são atendidos ao mesmo tempo.
+
+    O protocolo é um objeto JSON por linha. Pedidos de rota:
+
+        {"id": 1, "inicio": [x, y, "Norte"], "fim": [x, y, "Sul"], "algoritmo": "a_estrela",
+         "prioridade": ["Norte", "Leste", "Sul", "Oeste"], "limite": 60, "tempo_limite": 2.0}
+
+    Só inicio e fim são obrigatórios. As respostas repetem o "id" e podem sair fora da ordem
+    dos pedidos: {"id": 1, "ok": true, "encontrado": true, "custo": 12.5, "caminho": [[x, y,
+    "Norte"], ...], "tempo_s": 0.01}. Erros e tempo esgotado respondem {"ok": false, "erro": ...}.
+    Com um algoritmo anytime (ALGORITMOS_ANYTIME), o tempo limite devolve o melhor caminho
+    encontrado até ele, e a resposta inclui "limitante": o custo é no máximo limitante vezes o ótimo.
+    {"op": "estatisticas"} retorna os contadores do serviço (ver estatisticas()).
+    """
+    def __init__(self, problem_model: ProblemModel, max_workers=None, compact=True, algoritmo="a_estrela",
+                 tempo_limite=None, max_pendentes=256, artefatos=False):
+        """
+        Args:
+            max_workers (int): Processos trabalhadores; sem ele, um por CPU
+            compact (bool): Usa o modo compacto de SearchAlgorithms nos trabalhadores
+            algoritmo (str): Algoritmo dos pedidos que não informam um
+            tempo_limite (float): Tempo limite padrão (s) dos pedidos que não informam um
+            max_pendentes (int): Pedidos em andamento por conexão; acima disso a leitura espera
+            artefatos (bool): Usa a tabela de sucessores persistida ao lado do mapa (ver artifacts),
+                reconstruída uma vez aqui se estiver ausente ou desatualizada
+        """
+        if algoritmo not in ALGORITMOS + ALGORITMOS_ANYTIME:
+            raise ValueError(f"Algoritmo de busca desconhecido: {algoritmo}")
+        self.problem_model = problem_model
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.compact = compact
+        self.algoritmo = algoritmo
+        self.tempo_limite = tempo_limite
+        self.max_pendentes = max_pendentes
+        self.artefatos = artefatos and compact
+        self._pool = None
+        self._inicio = time.time()
+        self._contadores = {"pedidos": 0, "rotas": 0, "erros": 0, "tempos_esgotados": 0, "em_andamento": 0,
+                            "conexoes": 0}
+        self._por_algoritmo = {}
+
+    def iniciar(self):
+        """Cria o pool e espera os trabalhadores carregarem o mapa, antes de aceitar pedidos."""
+        if self._pool is None:
+            if self.artefatos:
+                PlanningArtifacts(self.problem_model).successor_table()
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=_inicializar_trabalhador,
+                                             initargs=(self.problem_model.grid, self.compact, self.artefatos))
+            self._pool.submit(_trabalhador_pronto).result()
+        return self._pool
+
+    def close(self):
+        """Encerra os processos trabalhadores."""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _estado(self, valor, campo):
+        """Converte [x, y, orientação] em ((x, y), orientação) e o valida."""
+        if not isinstance(valor, list) or len(valor) != 3:
+            raise ValueError(f"'{campo}' deve ser [x, y, orientação]")
+        x, y, orientacao = valor
+        if not isinstance(x, int) or not isinstance(y, int):
+            raise ValueError(f"As coordenadas de '{campo}' devem ser inteiras")
+        estado = ((x, y), orientacao)
+        self.problem_model.check_state(estado)
+        return estado
+
+    def _ler_pedido(self, pedido):
+        """Valida um pedido de rota e retorna (algoritmo, prioridade, inicio, fim, limite, tempo_limite)."""
+        if "inicio" not in pedido or "fim" not in pedido:
+            raise ValueError("O pedido precisa de 'inicio' e 'fim'")
+        inicio, fim = self._estado(pedido["inicio"], "inicio"), self._estado(pedido["fim"], "fim")
+        algoritmo = pedido.get("algoritmo", self.algoritmo)
+        if algoritmo not in ALGORITMOS + ALGORITMOS_ANYTIME:
+            raise ValueError(f"Algoritmo de busca desconhecido: {algoritmo}")
+        limite = pedido.get("limite")
+        if algoritmo in ALGORITMOS_COM_LIMITE:
+            if not isinstance(limite, int) or limite < 0:
+                raise ValueError(f"O algoritmo {algoritmo} exige um limite inteiro não negativo")
+        else:
+            limite = None
+        prioridade = pedido.get("prioridade", list(self.problem_model.expansion_priority))
+        if not isinstance(prioridade, list) or sorted(prioridade) != sorted(self.problem_model.orientations):
+            raise ValueError("'prioridade' deve ser uma permutação de " + ", ".join(self.problem_model.orientations))
+        tempo_limite = pedido.get("tempo_limite", self.tempo_limite)
+        if tempo_limite is not None and (not isinstance(tempo_limite, (int, float)) or tempo_limite <= 0):
+            raise ValueError("'tempo_limite' deve ser um número positivo")
+        return algoritmo, prioridade, inicio, fim, limite, tempo_limite
+
+    async def processar(self, pedido):
+        """Atende um pedido já decodificado (dict) e retorna a resposta (dict)."""
+        resposta = {"id": pedido.get("id")} if isinstance(pedido, dict) else {"id": None}
+        self._contadores["pedidos"] += 1
+        if not isinstance(pedido, dict):
+            self._contadores["erros"] += 1
+            return {**resposta, "ok": False, "erro": "O pedido deve ser um objeto JSON"}
+        operacao = pedido.get("op", "rota")
+        if operacao == "estatisticas":
+            return {**resposta, "ok": True, **self.estatisticas()}
+        if operacao != "rota":
+            self._contadores["erros"] += 1
+            return {**resposta, "ok": False, "erro": f"Operação desconhecida: {operacao}"}
+        try:
+            algoritmo, prioridade, inicio, fim, limite, tempo_limite = self._ler_pedido(pedido)
+        except ValueError as erro:
+            self._contadores["erros"] += 1
+            return {**resposta, "ok": False, "erro": str(erro)}
+
+        tempo = time.perf_counter()
+        prazo = time.time() + tempo_limite if tempo_limite is not None else None
+        self._contadores["em_andamento"] += 1
+        try:
+            busca = asyncio.get_running_loop().run_in_executor(
+                self.iniciar(), _resolver_pedido, algoritmo, prioridade, inicio, fim, limite, prazo)
+            # O prazo também é vigiado aqui: um pedido ainda na fila é cancelado e respondido na hora
+            if tempo_limite is not None:
+                espera = tempo_limite + FOLGA_ANYTIME if algoritmo in ALGORITMOS_ANYTIME else tempo_limite
+                resultado = await asyncio.wait_for(busca, espera)
+            else:
+                resultado = await busca
+        except asyncio.TimeoutError:
+            resultado = None
+        except Exception as erro:
+            # Uma falha no trabalhador responde só a este pedido; os demais seguem normalmente
+            self._contadores["erros"] += 1
+            return {**resposta, "ok": False, "erro": f"{type(erro).__name__}: {erro}"}
+        finally:
+            self._contadores["em_andamento"] -= 1
+        decorrido = time.perf_counter() - tempo
+        item = self._por_algoritmo.setdefault(algoritmo, {"pedidos": 0, "tempo_s": 0.0})
+        item["pedidos"] += 1
+        item["tempo_s"] += decorrido
+        if resultado is None:
+            self._contadores["tempos_esgotados"] += 1
+            return {**resposta, "ok": False, "erro": "tempo esgotado", "tempo_s": decorrido}
+        self._contadores["rotas"] += 1
+        caminho, custo, limitante = resultado
+        if limitante is not None:
+            resposta["limitante"] = limitante
+        if caminho is None:
+            return {**resposta, "ok": True, "encontrado": False, "custo": None, "caminho": None, "tempo_s": decorrido}
+        return {**resposta, "ok": True, "encontrado": True, "custo": custo,
+                "caminho": [[x, y, orientacao] for (x, y), orientacao in caminho], "tempo_s": decorrido}
+
+    def estatisticas(self):
+        """Contadores desde o início do serviço, com o número de pedidos e o tempo total por algoritmo."""
+        return {**self._contadores, "tempo_ativo_s": time.time() - self._inicio,
+                "grid": [self.problem_model.grid_width, self.problem_model.grid_height],
+                "trabalhadores": self.max_workers,
+                "algoritmos": {nome: dict(item) for nome, item in self._por_algoritmo.items()}}
+
+    async def _responder(self, linha):
+        """Decodifica uma linha, atende o pedido e retorna a resposta codificada."""
+        try:
+            pedido = json.loads(linha)
+        except ValueError:
+            self._contadores["pedidos"] += 1
+            self._contadores["erros"] += 1
+            resposta = {"id": None, "ok": False, "erro": "JSON inválido"}
+        else:
+            resposta = await self.processar(pedido)
+        return (json.dumps(resposta, ensure_ascii=False) + "\n").encode("utf-8")
+
+    async def atender(self, ler_linha, escrever):
+        """
+        Atende uma conexão: `ler_linha` é uma corrotina que retorna a próxima linha (b"" no fim)
+        e `escrever`, uma corrotina que envia uma resposta. Cada linha vira uma tarefa, e as
+        respostas são escritas à medida que ficam prontas.
+        """
+        self._contadores["conexoes"] += 1
+        vagas = asyncio.Semaphore(self.max_pendentes)
+        tarefas = set()
+
+        async def responder(linha):
+            try:
+                await escrever(await self._responder(linha))
+            finally:
+                vagas.release()
+
+        try:
+            while True:
+                await vagas.acquire()
+                linha = await ler_linha()
+                if not linha:
+                    vagas.release()
+                    break
+                if not linha.strip():
+                    vagas.release()
+                    continue
+                tarefa = asyncio.create_task(responder(linha))
+                tarefas.add(tarefa)
+                tarefa.add_done_callback(tarefas.discard)
+            if tarefas:
+                await asyncio.gather(*tarefas, return_exceptions=True)
+        finally:
+            self._contadores["conexoes"] -= 1
+
+    async def _atender_stream(self, reader, writer):
+        async def escrever(dados):
+            writer.write(dados)
+            await writer.drain()
+        try:
+            await self.atender(reader.readline, escrever)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def servir_tcp(self, host, porta):
+        """Atende conexões TCP até ser cancelado."""
+        self.iniciar()
+        servidor = await asyncio.start_server(self._atender_stream, host, porta)
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def servir_unix(self, caminho):
+        """Atende conexões num socket Unix até ser cancelado."""
+        self.iniciar()
+        servidor = await asyncio.start_unix_server(self._atender_stream, caminho)
+        async with servidor:
+            await servidor.serve_forever()
+
+    async def servir_stdio(self, entrada=None, saida=None):
+        """Lê pedidos da entrada padrão e escreve as respostas na saída padrão, até o fim da entrada."""
+        self.iniciar()
+        entrada = entrada or sys.stdin.buffer
+        saida = saida or sys.stdout.buffer
+        loop = asyncio.get_running_loop()
+
+        async def ler_linha():
+            # A leitura bloqueante fica numa thread, o que funciona com pipes, terminais e arquivos
+            return await loop.run_in_executor(None, entrada.readline)
+
+        async def escrever(dados):
+            saida.write(dados)
+            saida.flush()
+
+        await self.atender(ler_linha, escrever)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serviço de rotas em JSON por linha (stdin/stdout, TCP ou socket Unix).")
+    parser.add_argument("mapa", nargs="?", help="arquivo do mapa (texto ou binário); sem ele, o grid estático")
+    destino = parser.add_mutually_exclusive_group()
+    destino.add_argument("--porta", type=int, help="atende conexões TCP nesta porta")
+    destino.add_argument("--unix", help="atende conexões neste socket Unix")
+    parser.add_argument("--host", default="127.0.0.1", help="endereço TCP (padrão: apenas local)")
+    parser.add_argument("--trabalhadores", type=int, help="processos de busca (padrão: um por CPU)")
+    parser.add_argument("--algoritmo", choices=ALGORITMOS + ALGORITMOS_ANYTIME, default="a_estrela", help="algoritmo padrão")
+    parser.add_argument("--tempo-limite", type=float, help="tempo limite padrão por pedido (s)")
+    parser.add_argument("--tuplas", action="store_true", help="usa estados em tuplas em vez do modo compacto")
+    parser.add_argument("--artefatos", action="store_true",
+                        help="carrega (ou gera) a tabela de sucessores gravada ao lado do mapa")
+    args = parser.parse_args(argv)
+
+    problem_model = ProblemModel.from_file(args.mapa) if args.mapa else ProblemModel()
+    with RouteService(problem_model, args.trabalhadores, not args.tuplas, args.algoritmo,
+                      args.tempo_limite, artefatos=args.artefatos and args.mapa is not None) as servico:
+        if args.porta is not None:
+            servir = servico.servir_tcp(args.host, args.porta)
+        elif args.unix:
+            servir = servico.servir_unix(args.unix)
+        else:
+            servir = servico.servir_stdio()
+        try:
+            asyncio.run(servir)
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,249 +1,1334 @@
-from collections import deque
-import heapq
-from Node import Node
-from problem_model import ProblemModel
-import itertools
-
-class SearchAlgorithms:
-    """
-    Implementa os algoritmos de busca para encontrar o caminho.
-    """
-    def __init__(self, problem_model: ProblemModel):
-        self.problem_model = problem_model
-
-    def _exibir_caminho(self, node):
-        """Reconstrói o caminho a partir do nó objetivo."""
-        caminho = []
-        while node is not None:
-            caminho.append(node.estado)
-            node = node.pai
-        caminho.reverse()
-        return caminho
-
-    def _exibir_caminho_bidirecional(self, encontro_estado, visitado1, visitado2):
-        """Reconstrói o caminho para a busca bidirecional."""
-        caminho1 = self._exibir_caminho(visitado1[encontro_estado])
-        caminho2 = self._exibir_caminho(visitado2[encontro_estado])
-        return caminho1 + list(reversed(caminho2[:-1]))
-
-    def amplitude(self, inicio, fim):
-        """Busca em Amplitude."""
-        if inicio == fim: return [inicio], 0
-        fila = deque([Node(None, inicio, 0)])
-        visitado = {inicio}
-        while fila:
-            atual = fila.popleft()
-            if atual.estado == fim:
-                return self._exibir_caminho(atual), atual.v1
-            for novo_estado, custo_acao, acao in self.problem_model.get_successors(atual.estado):
-                if novo_estado not in visitado:
-                    visitado.add(novo_estado)
-                    fila.append(Node(atual, novo_estado, atual.v1 + custo_acao))
-        return None, 0
-
-    def profundidade(self, inicio, fim):
-        """Busca em Profundidade."""
-        if inicio == fim: return [inicio], 0
-        pilha = deque([Node(None, inicio, 0)])
-        visitado = {inicio}
-        while pilha:
-            atual = pilha.pop()
-            if atual.estado == fim:
-                return self._exibir_caminho(atual), atual.v1
-            for novo_estado, custo_acao, acao in reversed(self.problem_model.get_successors(atual.estado)):
-                if novo_estado not in visitado:
-                    visitado.add(novo_estado)
-                    pilha.append(Node(atual, novo_estado, atual.v1 + custo_acao))
-        return None, 0
-
-    def prof_limitada(self, inicio, fim, limite):
-        """Busca em Profundidade Limitada."""
-        if inicio == fim: return [inicio], 0
-        pilha = deque([Node(None, inicio, 0)])
-        visitado = {inicio: 0}
-        while pilha:
-            atual = pilha.pop()
-            if atual.estado == fim:
-                return self._exibir_caminho(atual), atual.v1
-            if atual.v1 < limite:
-                for novo_estado, custo_acao, acao in reversed(self.problem_model.get_successors(atual.estado)):
-                    if novo_estado not in visitado or atual.v1 + 1 < visitado[novo_estado]:
-                        visitado[novo_estado] = atual.v1 + 1
-                        pilha.append(Node(atual, novo_estado, atual.v1 + 1))
-        return None, 0
-
-    def aprof_iterativo(self, inicio, fim, limite_max):
-        """Busca em Aprofundamento Iterativo."""
-        for limite in range(limite_max + 1):
-            caminho, custo = self.prof_limitada(inicio, fim, limite)
-            if caminho is not None:
-                return caminho, custo
-        return None, 0
-
-    def bidirecional(self, inicio, fim):
-        """Busca Bidirecional."""
-        if inicio == fim: return [inicio], 0
-        fila1, fila2 = deque([Node(None, inicio, 0)]), deque([Node(None, fim, 0)])
-        visitado1, visitado2 = {inicio: fila1[0]}, {fim: fila2[0]}
-        while fila1 and fila2:
-            # Expansão a partir do início
-            atual1 = fila1.popleft()
-            for novo_estado, custo_acao, _ in self.problem_model.get_successors(atual1.estado):
-                if novo_estado not in visitado1:
-                    filho = Node(atual1, novo_estado, atual1.v1 + custo_acao)
-                    visitado1[novo_estado] = filho
-                    fila1.append(filho)
-                    if novo_estado in visitado2:
-                        return self._exibir_caminho_bidirecional(novo_estado, visitado1, visitado2), filho.v1 + visitado2[novo_estado].v1
-            # Expansão a partir do fim
-            atual2 = fila2.popleft()
-            for novo_estado, custo_acao, _ in self.problem_model.get_successors(atual2.estado):
-                if novo_estado not in visitado2:
-                    filho = Node(atual2, novo_estado, atual2.v1 + custo_acao)
-                    visitado2[novo_estado] = filho
-                    fila2.append(filho)
-                    if novo_estado in visitado1:
-                        return self._exibir_caminho_bidirecional(novo_estado, visitado1, visitado2), filho.v1 + visitado1[novo_estado].v1
-        return None, 0
-
-    def custo_uniforme(self, inicio, fim):
-        """Busca de Custo Uniforme."""
-        if inicio == fim: return [inicio], 0
-        
-        contador = itertools.count() 
-        fila_prioridade = [(0, next(contador), Node(None, inicio, 0))]
-        custos = {inicio: 0}
-
-        while fila_prioridade:
-            custo_atual, _, atual = heapq.heappop(fila_prioridade)
-
-            if custo_atual > custos[atual.estado]:
-                continue
-            
-            if atual.estado == fim:
-                return self._exibir_caminho(atual), atual.v1
-
-            for novo_estado, custo_acao, acao in self.problem_model.get_successors(atual.estado):
-                novo_custo_g = atual.v1 + custo_acao
-                
-                if novo_estado not in custos or novo_custo_g < custos[novo_estado]:
-                    custos[novo_estado] = novo_custo_g
-                    heapq.heappush(fila_prioridade, (novo_custo_g, next(contador), Node(atual, novo_estado, novo_custo_g)))
-        
-        return None, 0
-
-    def greedy(self, inicio, fim):
-        """Busca Gulosa (Greedy Best-First Search)."""
-        if inicio == fim: return [inicio], 0
-        
-        contador = itertools.count()
-        heuristica_inicial = self.problem_model.heuristic(inicio, fim)
-        fila_prioridade = [(heuristica_inicial, next(contador), Node(None, inicio, 0))]
-        
-        visitado = {inicio} 
-
-        while fila_prioridade:
-            _, _, atual = heapq.heappop(fila_prioridade)
-
-            if atual.estado == fim:
-                return self._exibir_caminho(atual), atual.v1
-
-            for novo_estado, custo_acao, acao in self.problem_model.get_successors(atual.estado):
-                if novo_estado not in visitado:
-                    visitado.add(novo_estado)
-                    novo_custo_g = atual.v1 + custo_acao
-                    heuristica_filho = self.problem_model.heuristic(novo_estado, fim)
-                    
-                    novo_no = Node(atual, novo_estado, novo_custo_g)
-                    heapq.heappush(fila_prioridade, (heuristica_filho, next(contador), novo_no))
-        
-        return None, 0
-
-    def a_estrela(self, inicio, fim):
-        """Busca A* (A-Estrela)."""
-        if inicio == fim: return [inicio], 0
-        
-        contador = itertools.count()
-        
-        heuristica_inicial = self.problem_model.heuristic(inicio, fim)
-        g_inicial = 0
-        f_inicial = g_inicial + heuristica_inicial
-        
-        fila_prioridade = [(f_inicial, next(contador), Node(None, inicio, g_inicial))]
-        
-        custos_g = {inicio: g_inicial}
-
-        while fila_prioridade:
-            f_atual, _, atual = heapq.heappop(fila_prioridade)
-
-            if atual.v1 > custos_g[atual.estado]:
-                continue
-            
-            if atual.estado == fim:
-                return self._exibir_caminho(atual), atual.v1
-
-            for novo_estado, custo_acao, acao in self.problem_model.get_successors(atual.estado):
-                novo_custo_g = atual.v1 + custo_acao
-                
-                if novo_estado not in custos_g or novo_custo_g < custos_g[novo_estado]:
-                    custos_g[novo_estado] = novo_custo_g
-                    heuristica_filho = self.problem_model.heuristic(novo_estado, fim)
-                    novo_custo_f = novo_custo_g + heuristica_filho
-                    
-                    heapq.heappush(fila_prioridade, (novo_custo_f, next(contador), Node(atual, novo_estado, novo_custo_g)))
-        
-        return None, 0
-
-    def aia_estrela(self, inicio, fim):
-        """Busca A* por Aprofundamento Iterativo (AIA* / IDA*)."""
-        
-        def busca_dfs_limitada(no_atual, custo_g, limite_f):
-            """Função auxiliar recursiva (DFS) limitada pelo f(n)."""
-            
-            estado_atual = no_atual.estado
-            heuristica_atual = self.problem_model.heuristic(estado_atual, fim)
-            f_atual = custo_g + heuristica_atual
-            
-            if f_atual > limite_f:
-                return None, f_atual 
-
-            if estado_atual == fim:
-                return self._exibir_caminho(no_atual), custo_g
-
-            proximo_limite_min = float('inf')
-
-            for novo_estado, custo_acao, acao in self.problem_model.get_successors(estado_atual):
-                # Evitar loops (voltar para o pai imediato)
-                if no_atual.pai and no_atual.pai.estado == novo_estado:
-                     continue
-
-                novo_custo_g = custo_g + custo_acao
-                novo_no = Node(no_atual, novo_estado, novo_custo_g)
-                
-                # Chamada recursiva
-                caminho_encontrado, f_filho_ou_custo_final = busca_dfs_limitada(novo_no, novo_custo_g, limite_f)
-                
-                if caminho_encontrado:
-                    # Propaga o caminho e o custo final (f_filho_ou_custo_final) para cima.
-                    return caminho_encontrado, f_filho_ou_custo_final 
-                
-                # Armazena o menor f(n) que ultrapassou o limite atual
-                proximo_limite_min = min(proximo_limite_min, f_filho_ou_custo_final)
-                
-            return None, proximo_limite_min
-
-        # --- Loop principal do AIA* ---
-        limite_f_atual = self.problem_model.heuristic(inicio, fim)
-        no_inicial = Node(None, inicio, 0)
-        
-        while True:
-            # Executa a busca limitada
-            caminho, custo_ou_proximo_limite = busca_dfs_limitada(no_inicial, 0, limite_f_atual)
-            
-            if caminho:
-                return caminho, custo_ou_proximo_limite
-            
-            if custo_ou_proximo_limite == float('inf'):
-                return None, 0 # Falha
-                
-            limite_f_atual = custo_ou_proximo_limite
\ No newline at end of file
+from collections import deque, namedtuple
+import functools
+import heapq
+import time
+from Node import Node, SMANode
+from problem_model import DESLOCAMENTOS, ProblemModel
+from search_arena import SearchArena
+from search_stats import Instrumentation, SearchTimeout, StepRecorder
+import itertools
+
+# Nomes dos métodos de busca disponíveis em SearchAlgorithms, na ordem da interface
+ALGORITMOS = (
+    "amplitude", "profundidade", "prof_limitada", "aprof_iterativo", "bidirecional",
+    "custo_uniforme", "greedy", "a_estrela", "a_estrela_bidirecional", "aia_estrela", "jps", "sma_estrela"
+)
+# Métodos que recebem um limite de profundidade como terceiro argumento
+ALGORITMOS_COM_LIMITE = ("prof_limitada", "aprof_iterativo")
+# Métodos anytime: recebem um prazo e retornam um AnytimeResult em vez de (caminho, custo)
+ALGORITMOS_ANYTIME = ("ara_estrela",)
+# Número máximo de estados na tabela de transposição (e no cache de heurísticas) do AIA*
+LIMITE_TABELA_TRANSPOSICAO = 1_000_000
+# Número máximo de nós na memória do SMA* quando nenhum limite é informado
+LIMITE_NOS_SMA = 1_000_000
+# Memória aproximada de cada nó do SMA* (nó, entrada no dicionário de estados e nas filas),
+# usada para converter max_bytes em número de nós
+BYTES_POR_NO_SMA = 400
+_DBG = None
+_EV = None
+# Expansões entre verificações do prazo das buscas anytime
+INTERVALO_PRAZO = 64
+
+# Resultado de SearchAlgorithms.ara_estrela. O custo de `path` é no máximo `bound` vezes o ótimo
+# (1.0: ótimo provado; None sem caminho); `solutions` tem (tempo_s, custo, bound) de cada caminho
+# publicado e `timed_out` indica que o prazo interrompeu a busca
+AnytimeResult = namedtuple("AnytimeResult", ("path", "cost", "bound", "solutions", "expansions", "elapsed", "timed_out"))
+
+def _instrumentada(metodo):
+    """
+    Prepara a instrumentação de um método de busca: zera `stats`, mede o tempo e chama
+    `hooks.on_goal`. Sem stats nem hooks, ou numa busca aninhada (aprof_iterativo chama
+    prof_limitada), o método é chamado diretamente.
+    """
+    @functools.wraps(metodo)
+    def executar(self, inicio, fim, *args, **kwargs):
+        if (self.stats is None and self.hooks is None) or self._instrumento is not None:
+            return metodo(self, inicio, fim, *args, **kwargs)
+        decode = self.problem_model.decode_state if self.compact else None
+        self._instrumento = Instrumentation(self.stats, self.hooks, decode)
+        if self.stats is not None:
+            self.stats.reset()
+        tempo = time.perf_counter()
+        try:
+            # (caminho, custo) ou um resultado que começa por eles, como AnytimeResult
+            resultado = metodo(self, inicio, fim, *args, **kwargs)
+        finally:
+            self._instrumento = None
+            if self.stats is not None:
+                self.stats.elapsed = time.perf_counter() - tempo
+        caminho, custo = resultado[0], resultado[1]
+        if caminho is not None and self.hooks is not None:
+            self.hooks.on_goal(caminho[-1], custo)
+        return resultado
+    return executar
+
+def _executar(passos):
+    """Executa até o fim o gerador de uma busca e retorna o seu resultado (caminho, custo)."""
+    while True:
+        try:
+            next(passos)
+        except StopIteration as parada:
+            return parada.value
+
+class SearchAlgorithms:
+    """
+    Implementa os algoritmos de busca para encontrar o caminho.
+
+    Com `stats` (SearchStats) e/ou `hooks` (SearchHooks), cada busca preenche as
+    estatísticas da última execução e chama os ganchos a cada expansão e inserção.
+    """
+    def __init__(self, problem_model: ProblemModel, compact=False, stats=None, hooks=None):
+        self.problem_model = problem_model
+        # No modo compacto as buscas trabalham com estados codificados como inteiros
+        # (ver ProblemModel.encode_state) e a tabela de sucessores pré-calculada
+        self.compact = compact
+        self.stats = stats
+        self.hooks = hooks
+        self._instrumento = None
+        # Arena das buscas no modo compacto, reaproveitada entre execuções
+        self._arena = None
+
+    def _argumentos_extras(self, algoritmo, limite):
+        """Valida o nome do algoritmo e retorna os argumentos além de (inicio, fim)."""
+        if algoritmo not in ALGORITMOS:
+            raise ValueError(f"Algoritmo de busca desconhecido: {algoritmo}")
+        if algoritmo in ALGORITMOS_COM_LIMITE:
+            if limite is None:
+                raise ValueError(f"O algoritmo {algoritmo} exige um limite")
+            return (limite,)
+        return ()
+
+    def buscar(self, algoritmo, inicio, fim, limite=None):
+        """Executa o método de busca de nome `algoritmo` (um dos ALGORITMOS)."""
+        return getattr(self, algoritmo)(inicio, fim, *self._argumentos_extras(algoritmo, limite))
+
+    def passo_a_passo(self, algoritmo, inicio, fim, limite=None):
+        """
+        Prepara a busca `algoritmo` para ser executada passo a passo e retorna um SearchSteps,
+        que emite um ExpansionEvent por expansão. A busca só avança quando o próximo evento
+        é pedido e pode ser abandonada a qualquer momento com close().
+        """
+        extras = self._argumentos_extras(algoritmo, limite)
+        decode = self.problem_model.decode_state if self.compact else None
+        registro = StepRecorder(self.stats, self.hooks, decode)
+        passos = getattr(self, "_passos_" + algoritmo)(inicio, fim, *extras, registro)
+        return SearchSteps(passos, self.stats, self.hooks)
+
+    def _preparar(self, inicio, fim):
+        """Valida os estados de entrada e os converte para a representação interna da busca."""
+        self.problem_model.check_state(inicio)
+        self.problem_model.check_state(fim)
+        if not self.compact:
+            return inicio, fim
+        self.problem_model.build_successor_table()
+        return self.problem_model.encode_state(inicio), self.problem_model.encode_state(fim)
+
+    def _sucessores(self):
+        """Retorna a função geradora de sucessores adequada ao modo atual."""
+        if self.compact:
+            return self.problem_model.get_successors_compact
+        return self.problem_model.get_successors
+
+    def _antecessores(self):
+        """Retorna a função geradora de antecessores (sucessores reversos) adequada ao modo atual."""
+        if self.compact:
+            return self.problem_model.get_predecessors_compact
+        return self.problem_model.get_predecessors
+
+    def _heuristica(self):
+        """Retorna a função heurística adequada ao modo atual."""
+        if self.compact:
+            return self.problem_model.heuristic_compact
+        return self.problem_model.heuristic
+
+    def _com_arena(self, passos, inicio, fim, instrumento):
+        """
+        Executa o gerador `passos` de uma busca no modo compacto sobre a SearchArena da
+        instância. Uma busca passo a passo ainda em andamento fica com a arena; outra busca
+        iniciada nesse meio tempo usa uma arena nova.
+        """
+        tamanho = self.problem_model.grid_width * self.problem_model.grid_height * 4
+        arena, self._arena = self._arena, None
+        if arena is None or arena.size != tamanho:
+            arena = SearchArena(tamanho)
+        else:
+            arena.reset()
+        try:
+            return (yield from passos(inicio, fim, instrumento, arena))
+        finally:
+            self._arena = arena
+
+    def _exibir_caminho(self, node, pais=None):
+        """
+        Reconstrói o caminho a partir do nó objetivo. Com `pais` (SearchArena.parents),
+        `node` é o estado objetivo codificado e o caminho segue o array de pais.
+        """
+        caminho = []
+        if pais is not None:
+            while node != -1:
+                caminho.append(node)
+                node = pais[node]
+        else:
+            while node is not None:
+                caminho.append(node.estado)
+                node = node.pai
+        caminho.reverse()
+        if self.compact:
+            caminho = [self.problem_model.decode_state(estado) for estado in caminho]
+        return caminho
+
+    def _exibir_caminho_bidirecional(self, encontro_estado, visitado1, visitado2):
+        """Reconstrói o caminho para a busca bidirecional."""
+        caminho1 = self._exibir_caminho(visitado1[encontro_estado])
+        caminho2 = self._exibir_caminho(visitado2[encontro_estado])
+        return caminho1 + list(reversed(caminho2[:-1]))
+
+    @_instrumentada
+    def amplitude(self, inicio, fim):
+        """Busca em Amplitude."""
+        return _executar(self._passos_amplitude(inicio, fim, self._instrumento))
+
+    def _passos_amplitude(self, inicio, fim, instrumento):
+        """Gerador com os passos da Busca em Amplitude."""
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        if self.compact:
+            return (yield from self._com_arena(self._amplitude_arena, inicio, fim, instrumento))
+        sucessores = self._sucessores()
+        emitir = instrumento is not None and instrumento.steps
+        fila = deque([Node(None, inicio, 0)])
+        visitado = {inicio}
+        while fila:
+            atual = fila.popleft()
+            if atual.estado == fim:
+                return self._exibir_caminho(atual), atual.v1
+            if instrumento: instrumento.expand(atual.estado, atual.v1, len(fila), len(visitado))
+            for novo_estado, custo_acao, acao in sucessores(atual.estado):
+                if novo_estado not in visitado:
+                    visitado.add(novo_estado)
+                    fila.append(Node(atual, novo_estado, atual.v1 + custo_acao))
+                    if instrumento: instrumento.push(novo_estado, atual.v1 + custo_acao)
+            if emitir: yield instrumento.flush()
+        return None, 0
+
+    def _amplitude_arena(self, inicio, fim, instrumento, arena):
+        """Busca em Amplitude no modo compacto: a fila guarda só os estados e a arena, pais e custos."""
+        sucessores = self.problem_model.get_successors_compact
+        emitir = instrumento is not None and instrumento.steps
+        pais, custos, visitado, alcancados = arena.parents, arena.costs, arena.closed, arena.reached
+        arena.reach(inicio, -1, 0)
+        visitado[inicio] = 1
+        fila = deque([inicio])
+        while fila:
+            atual = fila.popleft()
+            custo_g = custos[atual]
+            if atual == fim:
+                return self._exibir_caminho(atual, pais), custo_g
+            if instrumento: instrumento.expand(atual, custo_g, len(fila), len(alcancados))
+            for novo_estado, custo_acao, acao in sucessores(atual):
+                if not visitado[novo_estado]:
+                    visitado[novo_estado] = 1
+                    pais[novo_estado] = atual
+                    custos[novo_estado] = custo_g + custo_acao
+                    alcancados.append(novo_estado)
+                    fila.append(novo_estado)
+                    if instrumento: instrumento.push(novo_estado, custo_g + custo_acao)
+            if emitir: yield instrumento.flush()
+        return None, 0
+
+    @_instrumentada
+    def profundidade(self, inicio, fim):
+        """Busca em Profundidade."""
+        return _executar(self._passos_profundidade(inicio, fim, self._instrumento))
+
+    def _passos_profundidade(self, inicio, fim, instrumento):
+        """Gerador com os passos da Busca em Profundidade."""
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        if self.compact:
+            return (yield from self._com_arena(self._profundidade_arena, inicio, fim, instrumento))
+        sucessores = self._sucessores()
+        emitir = instrumento is not None and instrumento.steps
+        pilha = deque([Node(None, inicio, 0)])
+        visitado = {inicio}
+        while pilha:
+            atual = pilha.pop()
+            if atual.estado == fim:
+                return self._exibir_caminho(atual), atual.v1
+            if instrumento: instrumento.expand(atual.estado, atual.v1, len(pilha), len(visitado))
+            for novo_estado, custo_acao, acao in reversed(sucessores(atual.estado)):
+                if novo_estado not in visitado:
+                    visitado.add(novo_estado)
+                    pilha.append(Node(atual, novo_estado, atual.v1 + custo_acao))
+                    if instrumento: instrumento.push(novo_estado, atual.v1 + custo_acao)
+            if emitir: yield instrumento.flush()
+        return None, 0
+
+    def _profundidade_arena(self, inicio, fim, instrumento, arena):
+        """Busca em Profundidade no modo compacto (ver _amplitude_arena)."""
+        sucessores = self.problem_model.get_successors_compact
+        emitir = instrumento is not None and instrumento.steps
+        pais, custos, visitado, alcancados = arena.parents, arena.costs, arena.closed, arena.reached
+        arena.reach(inicio, -1, 0)
+        visitado[inicio] = 1
+        pilha = [inicio]
+        while pilha:
+            atual = pilha.pop()
+            custo_g = custos[atual]
+            if atual == fim:
+                return self._exibir_caminho(atual, pais), custo_g
+            if instrumento: instrumento.expand(atual, custo_g, len(pilha), len(alcancados))
+            for novo_estado, custo_acao, acao in reversed(sucessores(atual)):
+                if not visitado[novo_estado]:
+                    visitado[novo_estado] = 1
+                    pais[novo_estado] = atual
+                    custos[novo_estado] = custo_g + custo_acao
+                    alcancados.append(novo_estado)
+                    pilha.append(novo_estado)
+                    if instrumento: instrumento.push(novo_estado, custo_g + custo_acao)
+            if emitir: yield instrumento.flush()
+        return None, 0
+
+    @_instrumentada
+    def prof_limitada(self, inicio, fim, limite):
+        """Busca em Profundidade Limitada."""
+        return _executar(self._passos_prof_limitada(inicio, fim, limite, self._instrumento))
+
+    def _passos_prof_limitada(self, inicio, fim, limite, instrumento):
+        """Gerador com os passos da Busca em Profundidade Limitada."""
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        sucessores = self._sucessores()
+        emitir = instrumento is not None and instrumento.steps
+        pilha = deque([Node(None, inicio, 0)])
+        visitado = {inicio: 0}
+        while pilha:
+            atual = pilha.pop()
+            if atual.estado == fim:
+                return self._exibir_caminho(atual), atual.v1
+            if atual.v1 < limite:
+                if instrumento: instrumento.expand(atual.estado, atual.v1, len(pilha), len(visitado))
+                for novo_estado, custo_acao, acao in reversed(sucessores(atual.estado)):
+                    if novo_estado not in visitado or atual.v1 + 1 < visitado[novo_estado]:
+                        visitado[novo_estado] = atual.v1 + 1
+                        pilha.append(Node(atual, novo_estado, atual.v1 + 1))
+                        if instrumento: instrumento.push(novo_estado, atual.v1 + 1)
+                if emitir: yield instrumento.flush()
+        return None, 0
+
+    @_instrumentada
+    def aprof_iterativo(self, inicio, fim, limite_max):
+        """Busca em Aprofundamento Iterativo."""
+        return _executar(self._passos_aprof_iterativo(inicio, fim, limite_max, self._instrumento))
+
+    def _passos_aprof_iterativo(self, inicio, fim, limite_max, instrumento):
+        """
+        Gerador com os passos da Busca em Aprofundamento Iterativo. Um objetivo inalcançável
+        é rejeitado antes da primeira iteração, em vez de em cada uma delas.
+        """
+        if inicio != fim:
+            self.problem_model.check_state(inicio)
+            self.problem_model.check_state(fim)
+            if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        for limite in range(limite_max + 1):
+            if instrumento: instrumento.iteration()
+            caminho, custo = yield from self._passos_prof_limitada(inicio, fim, limite, instrumento)
+            if caminho is not None:
+                return caminho, custo
+        return None, 0
+
+    @_instrumentada
+    def bidirecional(self, inicio, fim):
+        """Busca Bidirecional de custo (Dijkstra a partir do início e do objetivo)."""
+        return _executar(self._passos_bidirecional(inicio, fim, self._instrumento))
+
+    def _passos_bidirecional(self, inicio, fim, instrumento, usar_heuristica=False):
+        """
+        Gerador com os passos da Busca Bidirecional. O lado do início expande sucessores e o do
+        objetivo, antecessores (ProblemModel.get_predecessors). Cada estado alcançado pelos dois
+        lados pode melhorar o melhor encontro; a busca para quando a soma dos topos das filas
+        atinge o custo dele. Com `usar_heuristica`, as filas usam o potencial médio
+        p(n) = (h(n, fim) - h(inicio, n)) / 2, somado no lado do início e subtraído no do
+        objetivo, que mantém o mesmo critério de parada (A* bidirecional).
+        """
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        vizinhos = (self._sucessores(), self._antecessores())
+        heuristica = self._heuristica()
+        if usar_heuristica:
+            def potencial(estado):
+                return (heuristica(estado, fim) - heuristica(inicio, estado)) / 2
+            estimativas = (potencial, lambda estado: -potencial(estado))
+        else:
+            estimativas = (lambda estado: 0, lambda estado: 0)
+
+        emitir = instrumento is not None and instrumento.steps
+        contador = itertools.count()
+        raiz1, raiz2 = Node(None, inicio, 0), Node(None, fim, 0)
+        filas = ([(estimativas[0](inicio), next(contador), raiz1)], [(estimativas[1](fim), next(contador), raiz2)])
+        # Melhor nó conhecido de cada estado, em cada sentido
+        visitados = ({inicio: raiz1}, {fim: raiz2})
+        melhor_custo, encontro = float('inf'), None
+
+        while filas[0] and filas[1]:
+            # Nenhum caminho ainda não encontrado custa menos que a soma dos topos das filas
+            if filas[0][0][0] + filas[1][0][0] >= melhor_custo:
+                break
+            lado = 0 if len(filas[0]) <= len(filas[1]) else 1
+            fila, visitado, oposto = filas[lado], visitados[lado], visitados[1 - lado]
+            _, _, atual = heapq.heappop(fila)
+            if atual is not visitado[atual.estado]:
+                if instrumento: instrumento.stale()
+                continue
+
+            if instrumento:
+                instrumento.expand(atual.estado, atual.v1, len(filas[0]) + len(filas[1]),
+                                   len(visitados[0]) + len(visitados[1]))
+            for novo_estado, custo_acao, _ in vizinhos[lado](atual.estado):
+                novo_custo_g = atual.v1 + custo_acao
+                anterior = visitado.get(novo_estado)
+                if anterior is None or novo_custo_g < anterior.v1:
+                    filho = Node(atual, novo_estado, novo_custo_g)
+                    visitado[novo_estado] = filho
+                    heapq.heappush(fila, (novo_custo_g + estimativas[lado](novo_estado), next(contador), filho))
+                    if instrumento: instrumento.push(novo_estado, novo_custo_g)
+                    outro = oposto.get(novo_estado)
+                    if outro is not None and novo_custo_g + outro.v1 < melhor_custo:
+                        melhor_custo, encontro = novo_custo_g + outro.v1, novo_estado
+            if emitir: yield instrumento.flush()
+
+        if encontro is None:
+            return None, 0
+        return self._exibir_caminho_bidirecional(encontro, visitados[0], visitados[1]), melhor_custo
+
+    @_instrumentada
+    def custo_uniforme(self, inicio, fim):
+        """Busca de Custo Uniforme."""
+        return _executar(self._passos_custo_uniforme(inicio, fim, self._instrumento))
+
+    def _passos_custo_uniforme(self, inicio, fim, instrumento):
+        """Gerador com os passos da Busca de Custo Uniforme."""
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        if self.compact:
+            return (yield from self._com_arena(self._custo_uniforme_arena, inicio, fim, instrumento))
+        sucessores = self._sucessores()
+        
+        emitir = instrumento is not None and instrumento.steps
+        contador = itertools.count() 
+        fila_prioridade = [(0, next(contador), Node(None, inicio, 0))]
+        custos = {inicio: 0}
+
+        while fila_prioridade:
+            custo_atual, _, atual = heapq.heappop(fila_prioridade)
+
+            if custo_atual > custos[atual.estado]:
+                if instrumento: instrumento.stale()
+                continue
+            
+            if atual.estado == fim:
+                return self._exibir_caminho(atual), atual.v1
+
+            if instrumento: instrumento.expand(atual.estado, atual.v1, len(fila_prioridade), len(custos))
+            for novo_estado, custo_acao, acao in sucessores(atual.estado):
+                novo_custo_g = atual.v1 + custo_acao
+                
+                if novo_estado not in custos or novo_custo_g < custos[novo_estado]:
+                    custos[novo_estado] = novo_custo_g
+                    heapq.heappush(fila_prioridade, (novo_custo_g, next(contador), Node(atual, novo_estado, novo_custo_g)))
+                    if instrumento: instrumento.push(novo_estado, novo_custo_g)
+            if emitir: yield instrumento.flush()
+        
+        return None, 0
+
+    def _custo_uniforme_arena(self, inicio, fim, instrumento, arena):
+        """
+        Busca de Custo Uniforme no modo compacto: a fronteira é a fila de baldes da arena
+        (BucketFrontier), e a arena guarda pais e custos. Melhorar o custo de um estado o move
+        de balde, sem deixar entradas obsoletas.
+        """
+        sucessores = self.problem_model.get_successors_compact
+        emitir = instrumento is not None and instrumento.steps
+        pais, custos, alcancados = arena.parents, arena.costs, arena.reached
+        infinito = float('inf')
+        fronteira = arena.bucket_frontier(instrumento.stale if instrumento else None)
+        arena.reach(inicio, -1, 0)
+        fronteira.push(inicio, 0)
+        inserir, retirar = fronteira.push, fronteira.pop
+
+        while fronteira:
+            custo_atual, atual = retirar()
+            if atual == fim:
+                return self._exibir_caminho(atual, pais), custo_atual
+
+            if instrumento: instrumento.expand(atual, custo_atual, len(fronteira), len(alcancados))
+            for novo_estado, custo_acao, acao in sucessores(atual):
+                novo_custo_g = custo_atual + custo_acao
+                anterior = custos[novo_estado]
+                if novo_custo_g < anterior:
+                    if anterior == infinito:
+                        alcancados.append(novo_estado)
+                    custos[novo_estado] = novo_custo_g
+                    pais[novo_estado] = atual
+                    inserir(novo_estado, novo_custo_g)
+                    if instrumento: instrumento.push(novo_estado, novo_custo_g)
+            if emitir: yield instrumento.flush()
+
+        return None, 0
+
+    @_instrumentada
+    def greedy(self, inicio, fim):
+        """Busca Gulosa (Greedy Best-First Search)."""
+        return _executar(self._passos_greedy(inicio, fim, self._instrumento))
+
+    def _passos_greedy(self, inicio, fim, instrumento):
+        """Gerador com os passos da Busca Gulosa."""
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        if self.compact:
+            return (yield from self._com_arena(self._greedy_arena, inicio, fim, instrumento))
+        sucessores, heuristica = self._sucessores(), self._heuristica()
+        
+        emitir = instrumento is not None and instrumento.steps
+        contador = itertools.count()
+        heuristica_inicial = heuristica(inicio, fim)
+        fila_prioridade = [(heuristica_inicial, next(contador), Node(None, inicio, 0))]
+        
+        visitado = {inicio} 
+
+        while fila_prioridade:
+            _, _, atual = heapq.heappop(fila_prioridade)
+
+            if atual.estado == fim:
+                return self._exibir_caminho(atual), atual.v1
+
+            if instrumento: instrumento.expand(atual.estado, atual.v1, len(fila_prioridade), len(visitado))
+            for novo_estado, custo_acao, acao in sucessores(atual.estado):
+                if novo_estado not in visitado:
+                    visitado.add(novo_estado)
+                    novo_custo_g = atual.v1 + custo_acao
+                    heuristica_filho = heuristica(novo_estado, fim)
+                    
+                    novo_no = Node(atual, novo_estado, novo_custo_g)
+                    heapq.heappush(fila_prioridade, (heuristica_filho, next(contador), novo_no))
+                    if instrumento: instrumento.push(novo_estado, novo_custo_g)
+            if emitir: yield instrumento.flush()
+        
+        return None, 0
+
+    def _greedy_arena(self, inicio, fim, instrumento, arena):
+        """Busca Gulosa no modo compacto: fila de baldes por h(n) e pais e custos na arena."""
+        sucessores, heuristica = self.problem_model.get_successors_compact, self.problem_model.heuristic_compact
+        emitir = instrumento is not None and instrumento.steps
+        pais, custos, visitado, alcancados = arena.parents, arena.costs, arena.closed, arena.reached
+        fronteira = arena.bucket_frontier(instrumento.stale if instrumento else None)
+        arena.reach(inicio, -1, 0)
+        visitado[inicio] = 1
+        fronteira.push(inicio, heuristica(inicio, fim))
+        inserir, retirar = fronteira.push, fronteira.pop
+
+        while fronteira:
+            _, atual = retirar()
+            custo_g = custos[atual]
+            if atual == fim:
+                return self._exibir_caminho(atual, pais), custo_g
+
+            if instrumento: instrumento.expand(atual, custo_g, len(fronteira), len(alcancados))
+            for novo_estado, custo_acao, acao in sucessores(atual):
+                if not visitado[novo_estado]:
+                    visitado[novo_estado] = 1
+                    pais[novo_estado] = atual
+                    custos[novo_estado] = custo_g + custo_acao
+                    alcancados.append(novo_estado)
+                    inserir(novo_estado, heuristica(novo_estado, fim))
+                    if instrumento: instrumento.push(novo_estado, custo_g + custo_acao)
+            if emitir: yield instrumento.flush()
+
+        return None, 0
+
+    @_instrumentada
+    def a_estrela(self, inicio, fim):
+        """Busca A* (A-Estrela)."""
+        return _executar(self._passos_a_estrela(inicio, fim, self._instrumento))
+
+    def _passos_a_estrela(self, inicio, fim, instrumento):
+        """Gerador com os passos da Busca A*."""
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        if self.compact:
+            return (yield from self._com_arena(self._a_estrela_arena, inicio, fim, instrumento))
+        sucessores, heuristica = self._sucessores(), self._heuristica()
+        
+        emitir = instrumento is not None and instrumento.steps
+        contador = itertools.count()
+        
+        heuristica_inicial = heuristica(inicio, fim)
+        g_inicial = 0
+        f_inicial = g_inicial + heuristica_inicial
+        
+        fila_prioridade = [(f_inicial, next(contador), Node(None, inicio, g_inicial))]
+        
+        custos_g = {inicio: g_inicial}
+
+        while fila_prioridade:
+            f_atual, _, atual = heapq.heappop(fila_prioridade)
+
+            if atual.v1 > custos_g[atual.estado]:
+                if instrumento: instrumento.stale()
+                continue
+            
+            if atual.estado == fim:
+                return self._exibir_caminho(atual), atual.v1
+
+            if instrumento: instrumento.expand(atual.estado, atual.v1, len(fila_prioridade), len(custos_g))
+            for novo_estado, custo_acao, acao in sucessores(atual.estado):
+                novo_custo_g = atual.v1 + custo_acao
+                
+                if novo_estado not in custos_g or novo_custo_g < custos_g[novo_estado]:
+                    custos_g[novo_estado] = novo_custo_g
+                    heuristica_filho = heuristica(novo_estado, fim)
+                    novo_custo_f = novo_custo_g + heuristica_filho
+                    
+                    heapq.heappush(fila_prioridade, (novo_custo_f, next(contador), Node(atual, novo_estado, novo_custo_g)))
+                    if instrumento: instrumento.push(novo_estado, novo_custo_g)
+            if emitir: yield instrumento.flush()
+        
+        return None, 0
+
+    def _a_estrela_arena(self, inicio, fim, instrumento, arena):
+        """
+        Busca A* no modo compacto: fila de baldes por f(n) e pais e custos na arena. Com uma
+        heurística inconsistente, um estado já expandido pode voltar à fronteira.
+        """
+        sucessores, heuristica = self.problem_model.get_successors_compact, self.problem_model.heuristic_compact
+        emitir = instrumento is not None and instrumento.steps
+        pais, custos, alcancados = arena.parents, arena.costs, arena.reached
+        infinito = float('inf')
+        fronteira = arena.bucket_frontier(instrumento.stale if instrumento else None)
+        arena.reach(inicio, -1, 0)
+        fronteira.push(inicio, heuristica(inicio, fim))
+        inserir, retirar = fronteira.push, fronteira.pop
+
+        while fronteira:
+            _, atual = retirar()
+            custo_g = custos[atual]
+            if atual == fim:
+                return self._exibir_caminho(atual, pais), custo_g
+
+            if instrumento: instrumento.expand(atual, custo_g, len(fronteira), len(alcancados))
+            for novo_estado, custo_acao, acao in sucessores(atual):
+                novo_custo_g = custo_g + custo_acao
+                anterior = custos[novo_estado]
+                if novo_custo_g < anterior:
+                    if anterior == infinito:
+                        alcancados.append(novo_estado)
+                    custos[novo_estado] = novo_custo_g
+                    pais[novo_estado] = atual
+                    inserir(novo_estado, novo_custo_g + heuristica(novo_estado, fim))
+                    if instrumento: instrumento.push(novo_estado, novo_custo_g)
+            if emitir: yield instrumento.flush()
+
+        return None, 0
+
+    @_instrumentada
+    def ara_estrela(self, inicio, fim, epsilon=2.5, prazo=None, passo=0.5):
+        """
+        A* anytime com reparo (ARA*, Likhachev, Gordon e Thrun). Começa como uma A* ponderada,
+        com f = g + epsilon * h, e reduz epsilon em `passo` enquanto houver tempo, reaproveitando
+        a busca anterior: só os estados melhorados voltam à fila. Cada solução tem custo no máximo
+        `bound` vezes o ótimo. Quando o `prazo` (s) se esgota, ou um SearchControl em `hooks`
+        estoura o tempo limite, retorna o melhor caminho já publicado. Retorna um AnytimeResult.
+        """
+        return _executar(self._passos_ara_estrela(inicio, fim, epsilon, prazo, passo, self._instrumento))
+
+    def _passos_ara_estrela(self, inicio, fim, epsilon, prazo, passo, instrumento):
+        """Gerador com os passos do ARA*; cada rodada de epsilon conta como uma iteração nas estatísticas."""
+        if epsilon < 1 or passo <= 0:
+            raise ValueError("O ARA* exige epsilon >= 1 e passo > 0")
+        tempo = time.perf_counter()
+        limite = tempo + prazo if prazo is not None else None
+        if inicio == fim: return AnytimeResult([inicio], 0, 1.0, [(0.0, 0, 1.0)], 0, 0.0, False)
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim):
+            return AnytimeResult(None, 0, None, [], 0, time.perf_counter() - tempo, False)
+        sucessores, heuristica = self._sucessores(), self._heuristica()
+        emitir = instrumento is not None and instrumento.steps
+        infinito = float('inf')
+        contador = itertools.count()
+
+        custos_g = {inicio: 0}
+        pais = {inicio: (None, 0)}
+        heuristicas = {inicio: heuristica(inicio, fim)}
+        # Estados na fila -> contador da sua entrada válida (as demais são obsoletas)
+        abertos = {}
+        fechados = set()
+        # Estados fechados que tiveram o custo melhorado: voltam à fila na próxima rodada
+        inconsistentes = set()
+        fila = []
+        eps = epsilon
+        contagem = next(contador)
+        abertos[inicio] = contagem
+        fila.append((eps * heuristicas[inicio], contagem, inicio))
+
+        melhor = None
+        solucoes = []
+        expansoes = 0
+        esgotado = False
+        while True:
+            # Expande enquanto o objetivo não tiver g menor ou igual à menor chave da fila
+            try:
+                while fila:
+                    chave, contagem, atual = fila[0]
+                    if abertos.get(atual) != contagem:
+                        heapq.heappop(fila)
+                        if instrumento: instrumento.stale()
+                        continue
+                    if custos_g.get(fim, infinito) <= chave:
+                        break
+                    if limite is not None and expansoes % INTERVALO_PRAZO == 0 and time.perf_counter() > limite:
+                        esgotado = True
+                        break
+                    heapq.heappop(fila)
+                    del abertos[atual]
+                    fechados.add(atual)
+                    expansoes += 1
+                    custo_atual = custos_g[atual]
+                    if instrumento: instrumento.expand(atual, custo_atual, len(fila), len(custos_g))
+                    for novo_estado, custo_acao, acao in sucessores(atual):
+                        novo_custo_g = custo_atual + custo_acao
+                        if novo_custo_g < custos_g.get(novo_estado, infinito):
+                            custos_g[novo_estado] = novo_custo_g
+                            pais[novo_estado] = (atual, custo_acao)
+                            if novo_estado in fechados:
+                                inconsistentes.add(novo_estado)
+                            else:
+                                if novo_estado not in heuristicas:
+                                    heuristicas[novo_estado] = heuristica(novo_estado, fim)
+                                contagem = next(contador)
+                                abertos[novo_estado] = contagem
+                                heapq.heappush(fila, (novo_custo_g + eps * heuristicas[novo_estado], contagem, novo_estado))
+                            if instrumento: instrumento.push(novo_estado, novo_custo_g)
+                    if emitir: yield instrumento.flush()
+            except SearchTimeout:
+                esgotado = True
+            if esgotado or fim not in custos_g:
+                break
+
+            # Rodada concluída: publica o caminho com o limite de subotimalidade provado
+            menor_f = min((custos_g[estado] + heuristicas[estado] for estado in itertools.chain(abertos, inconsistentes)),
+                          default=infinito)
+            limitante = max(1.0, min(eps, custos_g[fim] / menor_f))
+            caminho, custo = self._caminho_ara(fim, pais)
+            if melhor is not None and melhor[1] < custo:
+                # O caminho anterior continua mais barato; menor_f também limita o ótimo para ele
+                caminho, custo, limitante = melhor[0], melhor[1], min(melhor[2], max(1.0, melhor[1] / menor_f))
+            if melhor is None or (custo, limitante) != melhor[1:]:
+                solucoes.append((time.perf_counter() - tempo, custo, limitante))
+            melhor = (caminho, custo, limitante)
+            if limitante <= 1.0 or (limite is not None and time.perf_counter() > limite):
+                esgotado = limitante > 1.0
+                break
+
+            # Próxima rodada: epsilon menor, inconsistentes de volta à fila e chaves recalculadas.
+            # Uma rodada com epsilon acima do limite já provado não o melhoraria
+            eps = max(1.0, min(eps, limitante) - passo)
+            fila = []
+            for estado in itertools.chain(abertos, inconsistentes):
+                contagem = next(contador)
+                abertos[estado] = contagem
+                fila.append((custos_g[estado] + eps * heuristicas[estado], contagem, estado))
+            heapq.heapify(fila)
+            inconsistentes = set()
+            fechados = set()
+            if instrumento: instrumento.iteration()
+
+        decorrido = time.perf_counter() - tempo
+        if melhor is None:
+            return AnytimeResult(None, 0, None, solucoes, expansoes, decorrido, esgotado)
+        return AnytimeResult(melhor[0], melhor[1], melhor[2], solucoes, expansoes, decorrido, esgotado)
+
+    def _caminho_ara(self, fim, pais):
+        """Reconstrói o caminho do ARA* e soma o custo das ações ao longo dele."""
+        caminho, custo = [], 0
+        estado = fim
+        while estado is not None:
+            caminho.append(estado)
+            estado, custo_acao = pais[estado]
+            custo += custo_acao
+        caminho.reverse()
+        if self.compact:
+            caminho = [self.problem_model.decode_state(estado) for estado in caminho]
+        return caminho, custo
+
+    @_instrumentada
+    def a_estrela_bidirecional(self, inicio, fim):
+        """Busca A* Bidirecional."""
+        return _executar(self._passos_a_estrela_bidirecional(inicio, fim, self._instrumento))
+
+    def _passos_a_estrela_bidirecional(self, inicio, fim, instrumento):
+        """Gerador com os passos da Busca A* Bidirecional (ver _passos_bidirecional)."""
+        return (yield from self._passos_bidirecional(inicio, fim, instrumento, True))
+
+    @_instrumentada
+    def aia_estrela(self, inicio, fim):
+        """Busca A* por Aprofundamento Iterativo (AIA* / IDA*)."""
+        return _executar(self._passos_aia_estrela(inicio, fim, self._instrumento))
+
+    def _passos_aia_estrela(self, inicio, fim, instrumento):
+        """
+        Gerador com os passos da Busca AIA*. A busca em profundidade limitada por f(n) usa
+        uma pilha explícita (sem limite de recursão) e, a cada iteração, uma tabela de
+        transposição com o menor g de cada estado: um estado alcançado de novo com g maior
+        ou igual não é reexplorado. Estados do caminho atual nunca são revisitados.
+        """
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        sucessores, heuristica = self._sucessores(), self._heuristica()
+        emitir = instrumento is not None and instrumento.steps
+        infinito = float('inf')
+        # Heurísticas já calculadas, reaproveitadas entre as iterações
+        estimativas = {}
+
+        limite_f = heuristica(inicio, fim)
+        while True:
+            if instrumento: instrumento.iteration()
+            melhor_g = {inicio: 0}
+            caminho, custos_g, no_caminho = [inicio], [0], {inicio}
+            filhos = sucessores(inicio)
+            if instrumento: instrumento.expand(inicio, 0, 0, 1)
+            if emitir: yield instrumento.flush([estado for estado, _, _ in filhos])
+            pilha = [iter(filhos)]
+            proximo_limite = infinito
+
+            while pilha:
+                proximo = next(pilha[-1], None)
+                if proximo is None:
+                    # Todos os filhos do estado no topo foram explorados: volta um nível
+                    pilha.pop()
+                    no_caminho.discard(caminho.pop())
+                    custos_g.pop()
+                    continue
+
+                novo_estado, custo_acao, _ = proximo
+                if novo_estado in no_caminho:
+                    continue
+                novo_custo_g = custos_g[-1] + custo_acao
+                anterior = melhor_g.get(novo_estado)
+                if anterior is not None and anterior <= novo_custo_g:
+                    continue
+
+                h = estimativas.get(novo_estado)
+                if h is None:
+                    h = heuristica(novo_estado, fim)
+                    if len(estimativas) < LIMITE_TABELA_TRANSPOSICAO:
+                        estimativas[novo_estado] = h
+                custo_f = novo_custo_g + h
+                if custo_f > limite_f:
+                    # Armazena o menor f(n) que ultrapassou o limite atual
+                    if custo_f < proximo_limite: proximo_limite = custo_f
+                    continue
+
+                # A tabela é limitada: cheia, só atualiza estados já presentes e resta a checagem de ciclos
+                if anterior is not None or len(melhor_g) < LIMITE_TABELA_TRANSPOSICAO:
+                    melhor_g[novo_estado] = novo_custo_g
+                if instrumento: instrumento.push(novo_estado, novo_custo_g)
+                caminho.append(novo_estado)
+                if novo_estado == fim:
+                    if self.compact:
+                        caminho = [self.problem_model.decode_state(estado) for estado in caminho]
+                    return caminho, novo_custo_g
+
+                custos_g.append(novo_custo_g)
+                no_caminho.add(novo_estado)
+                filhos = sucessores(novo_estado)
+                # A "fronteira" do AIA* é a pilha, ou seja, a profundidade atual
+                if instrumento: instrumento.expand(novo_estado, novo_custo_g, len(pilha), len(melhor_g))
+                if emitir: yield instrumento.flush([estado for estado, _, _ in filhos])
+                pilha.append(iter(filhos))
+
+            if proximo_limite == infinito:
+                return None, 0 # Falha
+            limite_f = proximo_limite
+
+    @_instrumentada
+    def sma_estrela(self, inicio, fim, max_nos=None, max_bytes=None):
+        """
+        Busca A* com memória limitada (SMA*, Russell). Mantém no máximo `max_nos` nós (ou cerca
+        de `max_bytes` bytes, ver BYTES_POR_NO_SMA; sem nenhum, LIMITE_NOS_SMA). Com a memória
+        cheia, esquece a pior folha e guarda o f dela no pai, que volta à fronteira e a regera se
+        ela voltar a ser a melhor opção. O caminho é ótimo sempre que algum caminho ótimo cabe
+        na memória (tem no máximo `max_nos` estados); os nós esquecidos vão para stats.nodes_pruned.
+        """
+        return _executar(self._passos_sma_estrela(inicio, fim, self._instrumento, max_nos, max_bytes))
+
+    def _passos_sma_estrela(self, inicio, fim, instrumento, max_nos=None, max_bytes=None):
+        """
+        Gerador com os passos da Busca SMA*. Cada estado tem no máximo um nó na memória: um novo
+        caminho pior que o do nó existente é descartado, e um melhor substitui o nó e a sua
+        subárvore. Esses ramos superados nunca são regerados, só os esquecidos por falta de
+        memória. A fronteira tem os nós não expandidos e os que têm filhos esquecidos; entre f
+        iguais, expande o nó mais profundo e esquece a folha mais rasa.
+        """
+        if max_bytes is not None:
+            por_bytes = max_bytes // BYTES_POR_NO_SMA
+            max_nos = por_bytes if max_nos is None else min(max_nos, por_bytes)
+        limite_nos = LIMITE_NOS_SMA if max_nos is None else max_nos
+        if limite_nos < 2:
+            raise ValueError("O SMA* exige memória para pelo menos 2 nós")
+        if inicio == fim: return [inicio], 0
+        inicio, fim = self._preparar(inicio, fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        sucessores, heuristica = self._sucessores(), self._heuristica()
+        emitir = instrumento is not None and instrumento.steps
+        infinito = float('inf')
+        ordem = itertools.count()
+
+        raiz = SMANode(None, inicio, 0, heuristica(inicio, fim), 0, next(ordem), -1)
+        nos = {inicio: raiz}
+        # Filas com remoção preguiçosa: fronteira (f, -profundidade, -ordem, nó) e folhas
+        # (-f, profundidade, ordem, nó). Uma entrada vale enquanto o nó estiver na memória,
+        # no mesmo papel e com o mesmo f
+        fronteira = [(raiz.f, 0, -raiz.ordem, raiz)]
+        folhas = []
+
+        def prioridade(no):
+            """f do nó na fronteira: o próprio f se não foi expandido, o menor f dos esquecidos se
+            tem filhos a regerar, ou None fora da fronteira."""
+            if no.filhos is None: return no.f
+            return min(no.esquecidos.values()) if no.esquecidos else None
+
+        def enfileirar(no):
+            """Insere o nó nas filas dos papéis que ele tem agora."""
+            f = prioridade(no)
+            if f is not None:
+                heapq.heappush(fronteira, (f, -no.profundidade, -no.ordem, no))
+            if not no.filhos and no.pai is not None:
+                heapq.heappush(folhas, (-no.f, no.profundidade, no.ordem, no))
+
+        def propagar(no):
+            """Eleva o f do nó (e dos ancestrais) ao menor f entre os filhos e os esquecidos."""
+            while no is not None and no.filhos is not None:
+                novo_f = min(no.esquecidos.values()) if no.esquecidos else infinito
+                for filho in no.filhos:
+                    if filho.f < novo_f: novo_f = filho.f
+                if novo_f <= no.f: return
+                no.f = novo_f
+                enfileirar(no)
+                no = no.pai
+
+        def supera(existente, pai, indice, custo_g, profundidade):
+            """
+            Verifica se o caminho pai + sucessor `indice` é melhor que o do nó existente: menor g,
+            depois menor profundidade, depois a sequência de índices de sucessor a partir da raiz.
+            A ordem é total, então dois ramos nunca se descartam mutuamente.
+            """
+            if custo_g != existente.v1: return custo_g < existente.v1
+            if profundidade != existente.profundidade: return profundidade < existente.profundidade
+            # Mesma profundidade: sobe pelos dois caminhos até o ancestral comum
+            outro, indice_outro = existente.pai, existente.indice
+            while pai is not outro:
+                pai, indice = pai.pai, pai.indice
+                outro, indice_outro = outro.pai, outro.indice
+            return indice < indice_outro
+
+        def remover_subarvore(no):
+            """Remove da memória um nó superado por um caminho melhor, com toda a sua subárvore."""
+            pilha = [no]
+            while pilha:
+                atual = pilha.pop()
+                del nos[atual.estado]
+                if atual.filhos: pilha.extend(atual.filhos)
+            pai = no.pai
+            pai.filhos.remove(no)
+            # Sem filhos nem esquecidos, o pai fica sem sucessores úteis: propagar leva o seu f a infinito
+            if not pai.filhos: enfileirar(pai)
+            propagar(pai)
+
+        while fronteira:
+            f_atual, _, _, atual = heapq.heappop(fronteira)
+            if nos.get(atual.estado) is not atual or prioridade(atual) != f_atual:
+                if instrumento: instrumento.stale()
+                continue
+            if f_atual == infinito:
+                break # Nenhum caminho cabe na memória
+
+            if atual.estado == fim:
+                return self._exibir_caminho(atual), atual.v1
+
+            if _DBG: _DBG(atual, nos)
+            if _EV: _EV("EXPANDE", atual.estado, atual.v1, atual.profundidade, atual.f, f_atual, dict(atual.esquecidos or {}))
+            if instrumento: instrumento.expand(atual.estado, atual.v1, len(fronteira), len(nos))
+            # Gera todos os sucessores na primeira expansão e só os esquecidos nas seguintes
+            if atual.filhos is None:
+                atual.filhos = []
+                regerar, f_esquecido = None, 0
+            else:
+                # O f guardado só sai depois de o filho ser regerado, para não elevar o f do pai antes
+                regerar = min(atual.esquecidos, key=atual.esquecidos.get)
+                f_esquecido = atual.esquecidos[regerar]
+            profundidade = atual.profundidade + 1
+            for indice, (novo_estado, custo_acao, acao) in enumerate(sucessores(atual.estado)):
+                if regerar is not None and indice != regerar:
+                    continue
+                novo_custo_g = atual.v1 + custo_acao
+                existente = nos.get(novo_estado)
+                if existente is not None:
+                    if not supera(existente, atual, indice, novo_custo_g, profundidade):
+                        if _EV: _EV("skip", novo_estado, novo_custo_g, profundidade, atual.estado, "por", existente.v1, existente.profundidade, existente.pai and existente.pai.estado)
+                        continue
+                    if _EV: _EV("substitui", novo_estado, existente.v1, existente.profundidade, existente.f, existente.esquecidos)
+                    remover_subarvore(existente)
+                if novo_estado != fim and profundidade >= limite_nos - 1:
+                    # Os filhos deste nó não caberiam na memória junto com o caminho até ele
+                    novo_f = infinito
+                else:
+                    novo_f = max(atual.f, f_esquecido, novo_custo_g + heuristica(novo_estado, fim))
+                filho = SMANode(atual, novo_estado, novo_custo_g, novo_f, profundidade, next(ordem), indice)
+                atual.filhos.append(filho)
+                nos[novo_estado] = filho
+                if _EV: _EV("cria", novo_estado, novo_custo_g, profundidade, novo_f, atual.estado, regerar)
+                enfileirar(filho)
+                if instrumento: instrumento.push(novo_estado, novo_custo_g)
+            if regerar is not None: del atual.esquecidos[regerar]
+            enfileirar(atual)
+            propagar(atual)
+
+            # Memória cheia: esquece as piores folhas, guardando o f de cada uma no pai
+            while len(nos) > limite_nos:
+                f_negativo, _, _, folha = heapq.heappop(folhas)
+                if nos.get(folha.estado) is not folha or folha.f != -f_negativo or folha.filhos:
+                    continue
+                pai = folha.pai
+                pai.filhos.remove(folha)
+                del nos[folha.estado]
+                if instrumento: instrumento.prune()
+                if _EV: _EV("esquece", folha.estado, folha.v1, folha.profundidade, folha.f, pai.estado, folha.esquecidos)
+                # Uma folha com f infinito não leva ao objetivo dentro da memória e não precisa ser regerada
+                if folha.f < infinito:
+                    if pai.esquecidos is None: pai.esquecidos = {}
+                    pai.esquecidos[folha.indice] = folha.f
+                enfileirar(pai)
+                propagar(pai)
+
+            # As entradas obsoletas também ocupam memória: as filas são refeitas quando elas dominam
+            if len(fronteira) > 2 * len(nos) + 64:
+                fronteira = [entrada for entrada in fronteira
+                             if nos.get(entrada[3].estado) is entrada[3] and prioridade(entrada[3]) == entrada[0]]
+                heapq.heapify(fronteira)
+            if len(folhas) > 2 * len(nos) + 64:
+                folhas = [entrada for entrada in folhas
+                          if nos.get(entrada[3].estado) is entrada[3] and entrada[3].f == -entrada[0] and not entrada[3].filhos]
+                heapq.heapify(folhas)
+            if emitir: yield instrumento.flush()
+
+        return None, 0
+
+    def _saltar(self, x, y, o, destino):
+        """
+        Avança em linha reta a partir de (x, y) na orientação `o` até um ponto de salto:
+        a célula objetivo, uma célula com vizinho lateral forçado, um beco com saída lateral
+        ou uma célula de onde a varredura perpendicular encontra um desses pontos.
+        Retorna (x, y, passos) do ponto de salto, ou None se a reta termina sem nenhum.
+        """
+        livre = self.problem_model.grid.is_free
+        dx, dy = DESLOCAMENTOS[o]
+        laterais = (DESLOCAMENTOS[(o + 1) % 4], DESLOCAMENTOS[(o - 1 + 4) % 4])
+        # Nas varreduras perpendiculares, as laterais são a direção do salto e a oposta
+        laterais_varredura = ((dx, dy), (-dx, -dy))
+        passos = 0
+        while True:
+            x, y = x + dx, y + dy
+            passos += 1
+            if not livre(x, y): return None
+            if (x, y) == destino or self._ponto_de_salto(x, y, dx, dy, laterais, livre):
+                return x, y, passos
+            for lx, ly in laterais:
+                # Varredura perpendicular: se a reta lateral leva a um ponto de salto, é preciso poder virar aqui
+                px, py = x + lx, y + ly
+                while livre(px, py):
+                    if (px, py) == destino or self._ponto_de_salto(px, py, lx, ly, laterais_varredura, livre, False):
+                        return x, y, passos
+                    px, py = px + lx, py + ly
+
+    def _ponto_de_salto(self, x, y, dx, dy, laterais, livre, considerar_beco=True):
+        """
+        Verifica se (x, y), alcançada andando em (dx, dy), exige considerar uma curva: há um
+        vizinho lateral forçado (a lateral acabou de se abrir) ou, com `considerar_beco`,
+        a frente está bloqueada e só resta sair pelos lados.
+        """
+        frente_livre = livre(x + dx, y + dy) or not considerar_beco
+        for lx, ly in laterais:
+            if livre(x + lx, y + ly):
+                if not frente_livre or not livre(x - dx + lx, y - dy + ly):
+                    return True
+        return False
+
+    @_instrumentada
+    def jps(self, inicio, fim):
+        """
+        Jump Point Search com orientação: A* em que o movimento para frente salta ao longo de
+        retas até o próximo ponto onde uma curva pode ser necessária. Curvas só são geradas
+        nos pontos de salto, o que evita expandir os estados simétricos de corredores longos.
+        """
+        return _executar(self._passos_jps(inicio, fim, self._instrumento))
+
+    def _passos_jps(self, inicio, fim, instrumento):
+        """Gerador com os passos da Jump Point Search."""
+        if inicio == fim: return [inicio], 0
+        self.problem_model.check_state(inicio)
+        self.problem_model.check_state(fim)
+        if not self.problem_model.is_reachable(inicio, fim): return None, 0
+        (x0, y0), o0 = inicio
+        (xf, yf), of = fim
+        destino = (xf, yf)
+        estado_inicial = (x0, y0, self.problem_model.orientation_index[o0])
+        estado_final = (xf, yf, self.problem_model.orientation_index[of])
+
+        emitir = instrumento is not None and instrumento.steps
+        if instrumento:
+            orientations = self.problem_model.orientations
+            instrumento.decode = lambda estado: ((estado[0], estado[1]), orientations[estado[2]])
+        contador = itertools.count()
+        fila_prioridade = [(abs(x0 - xf) + abs(y0 - yf), next(contador), Node(None, estado_inicial, 0))]
+        custos_g = {estado_inicial: 0}
+
+        while fila_prioridade:
+            _, _, atual = heapq.heappop(fila_prioridade)
+            if atual.v1 > custos_g[atual.estado]:
+                if instrumento: instrumento.stale()
+                continue
+            if atual.estado == estado_final:
+                return self._exibir_caminho_saltos(atual), atual.v1
+
+            if instrumento: instrumento.expand(atual.estado, atual.v1, len(fila_prioridade), len(custos_g))
+            x, y, o = atual.estado
+            vizinhos = [((x, y, (o + 1) % 4), 0.5), ((x, y, (o - 1 + 4) % 4), 0.5)]
+            salto = self._saltar(x, y, o, destino)
+            if salto is not None:
+                vizinhos.append(((salto[0], salto[1], o), float(salto[2])))
+
+            for novo_estado, custo_acao in vizinhos:
+                novo_custo_g = atual.v1 + custo_acao
+                if novo_estado not in custos_g or novo_custo_g < custos_g[novo_estado]:
+                    custos_g[novo_estado] = novo_custo_g
+                    novo_custo_f = novo_custo_g + abs(novo_estado[0] - xf) + abs(novo_estado[1] - yf)
+                    heapq.heappush(fila_prioridade, (novo_custo_f, next(contador), Node(atual, novo_estado, novo_custo_g)))
+                    if instrumento: instrumento.push(novo_estado, novo_custo_g)
+            if emitir: yield instrumento.flush()
+
+        return None, 0
+
+    def _exibir_caminho_saltos(self, node):
+        """Reconstrói o caminho do JPS, preenchendo as células intermediárias de cada salto."""
+        orientations = self.problem_model.orientations
+        pontos = []
+        while node is not None:
+            pontos.append(node.estado)
+            node = node.pai
+        pontos.reverse()
+        caminho = [((pontos[0][0], pontos[0][1]), orientations[pontos[0][2]])]
+        for (x1, y1, _), (x2, y2, o) in zip(pontos, pontos[1:]):
+            if (x1, y1) == (x2, y2):
+                # Curva no lugar
+                caminho.append(((x2, y2), orientations[o]))
+                continue
+            dx, dy = DESLOCAMENTOS[o]
+            while (x1, y1) != (x2, y2):
+                x1, y1 = x1 + dx, y1 + dy
+                caminho.append(((x1, y1), orientations[o]))
+        return caminho
+
+    def planejador_incremental(self, inicio, fim):
+        """Cria um planejador D* Lite que reaproveita a busca entre replanejamentos."""
+        return DStarLite(self.problem_model, inicio, fim)
+
+
+class SearchSteps:
+    """
+    Execução passo a passo de uma busca, criada por SearchAlgorithms.passo_a_passo.
+
+    Iterar sobre o objeto avança a busca uma expansão por vez. Ao final, `result` guarda o
+    mesmo (caminho, custo) que o método de busca retornaria. As estatísticas, se houver,
+    contam apenas o tempo gasto dentro dos passos.
+
+    Atributos:
+        result (tuple): (caminho, custo) quando a busca termina; None até lá
+        finished (bool): Indica se a busca terminou ou foi abandonada
+    """
+    def __init__(self, passos, stats=None, hooks=None):
+        self._passos = passos
+        self.stats = stats
+        self.hooks = hooks
+        self.result = None
+        self.finished = False
+        self._iniciada = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.finished:
+            raise StopIteration
+        if not self._iniciada:
+            self._iniciada = True
+            if self.stats is not None:
+                self.stats.reset()
+        tempo = time.perf_counter()
+        try:
+            return next(self._passos)
+        except StopIteration as parada:
+            self.finished = True
+            self.result = parada.value
+            caminho, custo = self.result
+            if caminho is not None and self.hooks is not None:
+                self.hooks.on_goal(caminho[-1], custo)
+            raise StopIteration
+        finally:
+            if self.stats is not None:
+                self.stats.elapsed += time.perf_counter() - tempo
+
+    def run(self):
+        """Executa o restante da busca e retorna (caminho, custo)."""
+        for _ in self:
+            pass
+        return self.result
+
+    def close(self):
+        """Abandona a busca sem executar o restante."""
+        self._passos.close()
+        self.finished = True
+
+
+class DStarLite:
+    """
+    Planejador incremental D* Lite (Koenig e Likhachev).
+
+    A busca é feita do objetivo para o início e mantém g/rhs entre chamadas, de modo que,
+    quando células mudam (ProblemModel.add_obstacles/remove_obstacles) ou o veículo anda,
+    apenas a parte afetada do grafo é reparada em vez de refazer a busca inteira.
+    """
+    def __init__(self, problem_model: ProblemModel, inicio, fim):
+        self.problem_model = problem_model
+        self.inicio = inicio
+        self.fim = fim
+        self.g = {}
+        self.rhs = {fim: 0}
+        self.km = 0
+        self.expansoes = 0
+        self._ultimo_inicio = inicio
+        self._fila = []
+        self._chaves = {}
+        self._contador = itertools.count()
+        self._inserir(fim, self._calcular_chave(fim))
+
+    def _calcular_chave(self, estado):
+        melhor = min(self.g.get(estado, float('inf')), self.rhs.get(estado, float('inf')))
+        return (melhor + self.problem_model.heuristic(self.inicio, estado) + self.km, melhor)
+
+    def _inserir(self, estado, chave):
+        self._chaves[estado] = chave
+        heapq.heappush(self._fila, (chave, next(self._contador), estado))
+
+    def _topo(self):
+        """Retorna a menor entrada válida da fila, descartando as obsoletas."""
+        while self._fila:
+            chave, _, estado = self._fila[0]
+            if self._chaves.get(estado) == chave:
+                return chave, estado
+            heapq.heappop(self._fila)
+        return (float('inf'), float('inf')), None
+
+    def _sucessores(self, estado):
+        """Sucessores de `estado`; um estado em célula bloqueada não tem saídas."""
+        (x, y), _ = estado
+        if not self.problem_model.is_valid_state(x, y):
+            return []
+        return self.problem_model.get_successors(estado)
+
+    def _atualizar_vertice(self, estado):
+        if estado != self.fim:
+            self.rhs[estado] = min((custo + self.g.get(sucessor, float('inf'))
+                                    for sucessor, custo, _ in self._sucessores(estado)), default=float('inf'))
+        self._chaves.pop(estado, None)
+        if self.g.get(estado, float('inf')) != self.rhs.get(estado, float('inf')):
+            self._inserir(estado, self._calcular_chave(estado))
+
+    def _calcular_caminho_minimo(self):
+        inf = float('inf')
+        while True:
+            chave_topo, estado = self._topo()
+            if estado is None: return
+            if chave_topo >= self._calcular_chave(self.inicio) and self.rhs.get(self.inicio, inf) == self.g.get(self.inicio, inf):
+                return
+            nova_chave = self._calcular_chave(estado)
+            if chave_topo < nova_chave:
+                self._inserir(estado, nova_chave)
+                continue
+            heapq.heappop(self._fila)
+            del self._chaves[estado]
+            self.expansoes += 1
+            if self.g.get(estado, inf) > self.rhs.get(estado, inf):
+                self.g[estado] = self.rhs[estado]
+                for anterior, _, _ in self.problem_model.get_predecessors(estado):
+                    self._atualizar_vertice(anterior)
+            else:
+                self.g[estado] = inf
+                self._atualizar_vertice(estado)
+                for anterior, _, _ in self.problem_model.get_predecessors(estado):
+                    self._atualizar_vertice(anterior)
+
+    def atualizar_celulas(self, celulas):
+        """
+        Informa células (x, y) que mudaram de estado (ocupada/livre) desde o último planejamento.
+        Atualiza os estados cujas ações de saída passam por essas células.
+        """
+        orientations = self.problem_model.orientations
+        self.km += self.problem_model.heuristic(self._ultimo_inicio, self.inicio)
+        self._ultimo_inicio = self.inicio
+        for x, y in celulas:
+            for o, orientation in enumerate(orientations):
+                # Os estados da própria célula e o vizinho de trás que se move para dentro dela
+                dx, dy = DESLOCAMENTOS[o]
+                self._atualizar_vertice(((x, y), orientation))
+                self._atualizar_vertice(((x - dx, y - dy), orientation))
+
+    def mover(self, novo_inicio):
+        """Atualiza a posição atual do veículo."""
+        self.inicio = novo_inicio
+
+    def planejar(self):
+        """Repara a busca, se necessário, e retorna o caminho (caminho, custo) a partir do início atual."""
+        inf = float('inf')
+        self.km += self.problem_model.heuristic(self._ultimo_inicio, self.inicio)
+        self._ultimo_inicio = self.inicio
+        # Sem caminho possível, não repara a busca; as atualizações pendentes continuam na fila
+        if not self.problem_model.is_reachable(self.inicio, self.fim):
+            return None, 0
+        self._calcular_caminho_minimo()
+
+        custo_total = self.g.get(self.inicio, inf)
+        if custo_total == inf:
+            return None, 0
+        caminho = [self.inicio]
+        atual = self.inicio
+        visitados = {atual}
+        while atual != self.fim:
+            melhor, melhor_custo = None, inf
+            for sucessor, custo, _ in self._sucessores(atual):
+                total = custo + self.g.get(sucessor, inf)
+                if total < melhor_custo:
+                    melhor, melhor_custo = sucessor, total
+            if melhor is None or melhor in visitados:
+                return None, 0
+            caminho.append(melhor)
+            visitados.add(melhor)
+            atual = melhor
+        return caminho, custo_total
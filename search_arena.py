@@ -0,0 +1,53 @@
+from array import array
+from frontier import BucketFrontier
+
+INFINITO = float('inf')
+
+
+class SearchArena:
+    """
+    Buffers pré-alocados das buscas no modo compacto, indexados pelo estado codificado
+    (ver ProblemModel.encode_state): pai, custo g e marca de fechado de cada estado.
+    Substituem os Nodes e os dicionários de visitados, ocupando 9 bytes por estado do mapa.
+
+    A arena é reaproveitada entre buscas: reset() limpa apenas os estados alcançados pela
+    busca anterior, sem percorrer os buffers inteiros.
+
+    Atributos:
+        size (int): Número de estados do mapa (largura * altura * 4)
+        parents (array): Estado pai de cada estado; -1 na raiz e nos estados não alcançados
+        costs (array): Custo g de cada estado (float32, exato para múltiplos de 0.5); inf se não alcançado
+        closed (bytearray): 1 nos estados fechados (ou já visitados, nas buscas sem custo)
+        reached (array): Estados alcançados desde o último reset()
+        frontier (BucketFrontier): Fronteira das buscas com prioridade, criada no primeiro uso
+    """
+    def __init__(self, size):
+        self.size = size
+        self.parents = array('i', [-1]) * size
+        self.costs = array('f', [INFINITO]) * size
+        self.closed = bytearray(size)
+        self.reached = array('i')
+        self.frontier = None
+
+    def reset(self):
+        """Volta os estados alcançados ao valor inicial."""
+        parents, costs, closed = self.parents, self.costs, self.closed
+        for state in self.reached:
+            parents[state] = -1
+            costs[state] = INFINITO
+            closed[state] = 0
+        del self.reached[:]
+
+    def bucket_frontier(self, on_stale=None):
+        """Retorna a BucketFrontier dos estados da arena, vazia."""
+        if self.frontier is None:
+            self.frontier = BucketFrontier(self.size)
+        self.frontier.reset(on_stale)
+        return self.frontier
+
+    def reach(self, state, parent, cost):
+        """Registra o pai e o custo g de um estado, contando-o como alcançado na primeira vez."""
+        if self.costs[state] == INFINITO:
+            self.reached.append(state)
+        self.parents[state] = parent
+        self.costs[state] = cost
@@ -0,0 +1,176 @@
+import threading
+import time
+from collections import namedtuple
+
+# Evento emitido a cada expansão pelas buscas passo a passo: estado expandido e seu custo,
+# estados inseridos na fronteira nessa expansão e tamanho da fronteira depois deles
+ExpansionEvent = namedtuple("ExpansionEvent", ("state", "cost", "pushed", "frontier"))
+
+
+class SearchStats:
+    """
+    Estatísticas de uma execução de busca, preenchidas por SearchAlgorithms quando
+    um objeto é passado em `stats`. São zeradas no início de cada busca.
+
+    Atributos:
+        nodes_generated (int): Nós inseridos na fronteira (sem contar o inicial)
+        nodes_expanded (int): Nós cujos sucessores foram gerados
+        stale_pops (int): Retiradas da fila de prioridade descartadas por estarem desatualizadas
+        max_frontier (int): Maior tamanho da fronteira observado nas expansões
+        max_visited (int): Maior número de estados guardados como visitados
+        iterations (int): Iterações de aprofundamento (aprof_iterativo e aia_estrela)
+        nodes_pruned (int): Nós esquecidos para respeitar o limite de memória (sma_estrela)
+        elapsed (float): Tempo total da busca em segundos
+    """
+    FIELDS = ("nodes_generated", "nodes_expanded", "stale_pops", "max_frontier",
+              "max_visited", "iterations", "nodes_pruned", "elapsed")
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self.nodes_generated = 0
+        self.nodes_expanded = 0
+        self.stale_pops = 0
+        self.max_frontier = 0
+        self.max_visited = 0
+        self.iterations = 0
+        self.nodes_pruned = 0
+        self.elapsed = 0.0
+
+    def as_dict(self):
+        return {campo: getattr(self, campo) for campo in self.FIELDS}
+
+    def __repr__(self):
+        return "SearchStats(" + ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.FIELDS) + ")"
+
+
+class SearchHooks:
+    """
+    Interface de ganchos chamados durante a busca. Sobrescreva apenas os métodos desejados;
+    os estados recebidos estão sempre no formato ((x, y), orientação).
+    """
+    def on_expand(self, state, cost):
+        """Chamado antes de gerar os sucessores de `state`, alcançado com custo `cost`."""
+
+    def on_push(self, state, cost):
+        """Chamado quando `state` é inserido na fronteira com custo acumulado `cost`."""
+
+    def on_goal(self, state, cost):
+        """Chamado uma vez quando a busca encontra o objetivo, com o custo do caminho."""
+
+
+class Instrumentation:
+    """
+    Liga uma busca em andamento às estatísticas e aos ganchos. SearchAlgorithms só cria
+    este objeto quando `stats` ou `hooks` foram informados; sem eles, as buscas apenas
+    testam uma variável local contra None.
+    """
+    # Indica se a busca deve emitir um ExpansionEvent por expansão (ver StepRecorder)
+    steps = False
+
+    def __init__(self, stats=None, hooks=None, decode=None):
+        self.stats = stats
+        self.hooks = hooks
+        self.decode = decode
+
+    def expand(self, state, cost, frontier, visited):
+        stats = self.stats
+        if stats is not None:
+            stats.nodes_expanded += 1
+            if frontier > stats.max_frontier: stats.max_frontier = frontier
+            if visited > stats.max_visited: stats.max_visited = visited
+        if self.hooks is not None:
+            self.hooks.on_expand(self.decode(state) if self.decode else state, cost)
+
+    def push(self, state, cost):
+        if self.stats is not None:
+            self.stats.nodes_generated += 1
+        if self.hooks is not None:
+            self.hooks.on_push(self.decode(state) if self.decode else state, cost)
+
+    def stale(self):
+        if self.stats is not None:
+            self.stats.stale_pops += 1
+
+    def iteration(self):
+        if self.stats is not None:
+            self.stats.iterations += 1
+
+    def prune(self):
+        if self.stats is not None:
+            self.stats.nodes_pruned += 1
+
+
+class StepRecorder(Instrumentation):
+    """Instrumentação das buscas passo a passo: junta cada expansão e suas inserções num ExpansionEvent."""
+    steps = True
+
+    def __init__(self, stats=None, hooks=None, decode=None):
+        super().__init__(stats, hooks, decode)
+        self._state = None
+        self._cost = 0
+        self._frontier = 0
+        self._pushed = []
+
+    def expand(self, state, cost, frontier, visited):
+        super().expand(state, cost, frontier, visited)
+        self._state, self._cost, self._frontier = state, cost, frontier
+        self._pushed = []
+
+    def push(self, state, cost):
+        super().push(state, cost)
+        self._pushed.append(state)
+
+    def flush(self, pushed=None):
+        """Monta o evento da última expansão; `pushed` substitui as inserções registradas."""
+        decode = self.decode or (lambda state: state)
+        inserted = self._pushed if pushed is None else pushed
+        return ExpansionEvent(decode(self._state), self._cost, [decode(state) for state in inserted],
+                              self._frontier + len(self._pushed))
+
+
+class SearchCancelled(Exception):
+    """Levantada dentro da busca quando ela é cancelada por SearchControl."""
+
+
+class SearchTimeout(SearchCancelled):
+    """Levantada quando a busca ultrapassa o tempo limite de SearchControl."""
+
+
+class SearchControl(SearchHooks):
+    """
+    Ganchos para interromper uma busca de outra thread: `cancel()` ou o tempo limite
+    fazem a próxima verificação levantar SearchCancelled (ou SearchTimeout) de dentro
+    da busca. A verificação é feita a cada `check_interval` expansões.
+    """
+    def __init__(self, timeout=None, check_interval=64):
+        self.timeout = timeout
+        self.check_interval = check_interval
+        self._cancelled = threading.Event()
+        self._deadline = None
+        self._expansions = 0
+
+    def start(self):
+        """Reinicia o controle para uma nova busca, contando o tempo limite a partir de agora."""
+        self._cancelled.clear()
+        self._expansions = 0
+        self._deadline = time.perf_counter() + self.timeout if self.timeout else None
+
+    def cancel(self):
+        self._cancelled.set()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def check(self):
+        if self._cancelled.is_set():
+            raise SearchCancelled("Busca cancelada")
+        if self._deadline is not None and time.perf_counter() > self._deadline:
+            raise SearchTimeout(f"Tempo limite de {self.timeout} s excedido")
+
+    def on_expand(self, state, cost):
+        self._expansions += 1
+        if self._expansions % self.check_interval == 0:
+            self.check()